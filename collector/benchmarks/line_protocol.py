@@ -0,0 +1,99 @@
+"""Measure line-protocol serialization speed and gzip savings on a scrape-sized batch.
+
+Builds a synthetic batch shaped like one slow scrape (per-peer geo points, the mempool
+fee histogram and the usual single-row measurements) and compares the previous
+``str.replace``-chain serializer with :meth:`Point.to_line`. No node or InfluxDB needed::
+
+    python benchmarks/line_protocol.py --rounds 200 --peers 125
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from collector.influx import Point, _encode_lines
+from collector.metrics import log_spaced_edges
+
+
+def _legacy_escape(value: str) -> str:
+    escaped = str(value).replace("\\", "\\\\")
+    for char in (",", " ", "="):
+        escaped = escaped.replace(char, f"\\{char}")
+    return escaped
+
+
+def _legacy_to_line(point: Point) -> str:
+    tags = "".join([f",{_legacy_escape(k)}={_legacy_escape(v)}" for k, v in point.tags.items()])
+    fields = ",".join([f"{_legacy_escape(k)}={v}" for k, v in point.fields.items()])
+    return f"{_legacy_escape(point.measurement)}{tags} {fields} {point.time}"
+
+
+def _batch(peers: int) -> List[Point]:
+    stamp = time.time_ns()
+    points: List[Point] = []
+    for index in range(peers):
+        points.append(
+            Point("peer_geo_coords", time=stamp)
+            .tag("network", "mainnet")
+            .tag("country", "Example Country")
+            .tag("city", f"City {index % 40}")
+            .tag("asn", f"AS{64500 + index % 60} Example Networks, Inc.")
+            .tag("direction", "inbound" if index % 3 else "outbound")
+            .field("peer_count", 1.0)
+            .field("latitude", 48.0 + index / 1000)
+            .field("longitude", 11.0 - index / 1000)
+        )
+    edges = log_spaced_edges(1, 1000, 10)
+    hist = Point("mempool_hist", time=stamp).tag("network", "mainnet")
+    for low, high in zip(edges, edges[1:], strict=False):
+        hist.field(f"{low:g}-{high:g}", float(int(high * 37) % 5000))
+    points.append(hist)
+    for name in ("blockchain", "mempool", "peers", "network", "collector_influx"):
+        point = Point(name, time=stamp).tag("network", "mainnet")
+        for key in range(8):
+            point.field(f"field_{key}", key * 1.25)
+        points.append(point)
+    return points
+
+
+def _time(fn: Callable[[], object], rounds: int) -> List[float]:
+    fn()
+    samples: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--peers", type=int, default=125)
+    args = parser.parse_args()
+
+    points = _batch(args.peers)
+    body = _encode_lines(points, "ns") or b""
+    cases: Dict[str, Callable[[], object]] = {
+        "legacy to_line": lambda: "\n".join([_legacy_to_line(point) for point in points]),
+        "to_line": lambda: _encode_lines(points, "ns"),
+    }
+    for level in (1, 6):
+        cases[f"gzip level {level}"] = lambda level=level: gzip.compress(body, level)
+
+    print(f"{len(points)} points, {len(body)} bytes of line protocol")
+    print(f"{'case':<18}{'p50 ms':>10}{'p95 ms':>10}{'bytes':>10}{'ratio':>8}")
+    for case, fn in cases.items():
+        samples = _time(fn, args.rounds)
+        output = fn()
+        size = len(output) if isinstance(output, bytes) else len(body)
+        p50, p95 = statistics.median(samples), statistics.quantiles(samples, n=20)[-1]
+        print(f"{case:<18}{p50:>10.3f}{p95:>10.3f}{size:>10}{len(body) / size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
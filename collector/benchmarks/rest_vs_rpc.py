@@ -0,0 +1,67 @@
+"""Compare JSON-RPC and REST latency for the read-only calls the collector issues.
+
+Reads the same environment variables as the collector (``BITCOIN_RPC_HOST``, cookie or
+user/password, ...) and needs a node started with ``-rest``::
+
+    python benchmarks/rest_vs_rpc.py --rounds 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from collector.bitcoin_rpc import REST_METHODS, BitcoinRPC
+from collector.config import load_config
+from collector.main import _build_rpc
+
+
+def _time(fn: Callable[[], object], rounds: int) -> List[float]:
+    fn()  # warm up the keep-alive connection
+    samples: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _cases(rpc: BitcoinRPC) -> Dict[str, Callable[[], object]]:
+    best = rpc.get_blockchain_info()["bestblockhash"]
+    return {
+        "getblockchaininfo": rpc.get_blockchain_info,
+        "getmempoolinfo": rpc.get_mempool_info,
+        "getrawmempool (streamed)": lambda: sum(1 for _ in rpc.iter_raw_mempool()),
+        "getblock (verbosity 1)": lambda: rpc.call("getblock", best, 1),
+        "getblock (raw)": lambda: rpc.get_block_raw(best),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    config = load_config()
+    transports = {"rpc": _build_rpc(config), "rest": _build_rpc(config)}
+    transports["rest"].rest_methods = set(REST_METHODS)
+
+    results: Dict[str, Dict[str, List[float]]] = {}
+    for name, rpc in transports.items():
+        for case, fn in _cases(rpc).items():
+            results.setdefault(case, {})[name] = _time(fn, args.rounds)
+
+    print(f"{'call':<26}{'rpc p50':>10}{'rest p50':>10}{'rpc p95':>10}{'rest p95':>10}")
+    for case, samples in results.items():
+        row = [statistics.median(samples["rpc"]), statistics.median(samples["rest"])]
+        row += [statistics.quantiles(samples[name], n=20)[-1] for name in ("rpc", "rest")]
+        print(f"{case:<26}" + "".join(f"{value:>10.2f}" for value in row))
+    disabled = sorted(REST_METHODS - transports["rest"].rest_methods)
+    if disabled:
+        print(f"REST unavailable, measured JSON-RPC instead for: {', '.join(disabled)}")
+
+
+if __name__ == "__main__":
+    main()
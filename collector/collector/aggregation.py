@@ -0,0 +1,174 @@
+"""Tumbling-window pre-aggregation of high-frequency series before they reach InfluxDB."""
+
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .influx import Point
+from .metrics import percentile
+
+# Samples kept per field and window for quantiles; exact up to this many samples.
+RESERVOIR_SIZE = 128
+
+# Series (measurement plus tag set) aggregated at once; later series pass through raw.
+MAX_SERIES = 10_000
+
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _FieldWindow:
+    """Running count/min/max/sum/last of one field, plus a reservoir for quantiles."""
+
+    __slots__ = ("count", "minimum", "maximum", "total", "last", "samples")
+
+    def __init__(self, reservoir: bool) -> None:
+        self.count = 0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.total = 0.0
+        self.last = 0.0
+        self.samples: Optional[array] = array("d") if reservoir else None
+
+    def add(self, value: float, rng: random.Random) -> None:
+        self.count += 1
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.total += value
+        self.last = value
+        samples = self.samples
+        if samples is None:
+            return
+        if len(samples) < RESERVOIR_SIZE:
+            samples.append(value)
+        else:
+            slot = rng.randrange(self.count)  # Algorithm R: keep each sample with equal odds
+            if slot < RESERVOIR_SIZE:
+                samples[slot] = value
+
+
+class _SeriesWindow:
+    __slots__ = ("start", "fields")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.fields: Dict[str, _FieldWindow] = {}
+
+
+class WindowAggregator:
+    """Reduce selected measurements to one point per series and tumbling window.
+
+    Points of the ``measurements`` listed are folded into windows of ``window`` seconds
+    aligned to the epoch, keyed by measurement and tag set. When a later window starts,
+    the finished one is emitted as a single point stamped at the window start, with
+    ``<field>_count``, ``_min``, ``_max``, ``_mean`` and ``_last`` fields and one
+    ``<field>_p<NN>`` field per requested quantile. Quantiles come from a fixed-size
+    reservoir, so memory per field is bounded whatever the sample rate.
+
+    Raw points of aggregated measurements are dropped unless listed in ``keep_raw``; all
+    other measurements pass through untouched. At most ``max_series`` series are tracked;
+    points of further series are passed through raw and counted as ``overflow``.
+
+    Windows close when a later :meth:`process` call passes their end, so the last one
+    stays open until the next scrape; :meth:`flush` emits it on shutdown.
+    """
+
+    def __init__(
+        self,
+        measurements: Iterable[str],
+        window: float = 60.0,
+        quantiles: Sequence[float] = (),
+        keep_raw: Iterable[str] = (),
+        max_series: int = MAX_SERIES,
+    ) -> None:
+        self.measurements = frozenset(measurements)
+        self.keep_raw = frozenset(keep_raw)
+        self.window_ns = int(window * 1_000_000_000)
+        self.quantiles = tuple(quantiles)
+        self.max_series = max_series
+        self._series: Dict[SeriesKey, _SeriesWindow] = {}
+        self._random = random.Random()
+        self.aggregated = 0
+        self.windows = 0
+        self.overflow = 0
+
+    def process(self, points: Iterable[Point], timestamp: int) -> List[Point]:
+        """Fold ``points`` into their windows and return what should be written now.
+
+        That is the pass-through points plus every window that ``timestamp`` has closed.
+        Points without a time of their own count as taken at ``timestamp``.
+        """
+
+        output: List[Point] = []
+        for point in points:
+            if point.measurement not in self.measurements or not point.fields:
+                output.append(point)
+                continue
+            stamp = timestamp if point.time is None else point.time
+            if not self._add(point, stamp - stamp % self.window_ns, output):
+                self.overflow += 1
+                output.append(point)
+                continue
+            self.aggregated += 1
+            if point.measurement in self.keep_raw:
+                output.append(point)
+        output.extend(self._close(timestamp - timestamp % self.window_ns))
+        return output
+
+    def flush(self) -> List[Point]:
+        """Emit every open window, complete or not; used on shutdown."""
+
+        return self._close(None)
+
+    def status(self) -> Dict[str, float]:
+        return {
+            "series": float(len(self._series)),
+            "aggregated": float(self.aggregated),
+            "windows": float(self.windows),
+            "overflow": float(self.overflow),
+        }
+
+    def _add(self, point: Point, start: int, output: List[Point]) -> bool:
+        key: SeriesKey = (point.measurement, tuple(sorted(point.tags.items())))
+        series = self._series.get(key)
+        if series is not None and series.start != start:
+            # A sample for another window: close the open one first. Late samples for an
+            # already emitted window start a fresh window rather than being lost.
+            output.append(self._emit(key, series))
+            series = None
+        if series is None:
+            if len(self._series) >= self.max_series:
+                return False
+            series = self._series[key] = _SeriesWindow(start)
+        for name, value in point.fields.items():
+            window = series.fields.get(name)
+            if window is None:
+                window = series.fields[name] = _FieldWindow(bool(self.quantiles))
+            window.add(float(value), self._random)
+        return True
+
+    def _close(self, current: Optional[int]) -> List[Point]:
+        keys = [
+            key
+            for key, series in self._series.items()
+            if current is None or series.start < current
+        ]
+        return [self._emit(key, self._series[key]) for key in keys]
+
+    def _emit(self, key: SeriesKey, series: _SeriesWindow) -> Point:
+        del self._series[key]
+        self.windows += 1
+        measurement, tags = key
+        point = Point(measurement, dict(tags), time=series.start)
+        for name, window in series.fields.items():
+            point.field(f"{name}_count", float(window.count))
+            point.field(f"{name}_min", window.minimum)
+            point.field(f"{name}_max", window.maximum)
+            point.field(f"{name}_mean", window.total / window.count)
+            point.field(f"{name}_last", window.last)
+            if window.samples is not None:
+                for quantile in self.quantiles:
+                    label = f"{name}_p{round(quantile * 100)}"
+                    point.field(label, percentile(window.samples, quantile))
+        return point
@@ -2,13 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
 import json
+import logging
+import re
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-import requests
 from requests.auth import HTTPBasicAuth
 
+from .http_pool import ConnectionPool
+from .rpc_stats import RPCStats, method_count, method_label
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .rpc_cache import RPCCache
+
+LOGGER = logging.getLogger(__name__)
+
 
 @dataclass
 class RPCError(Exception):
@@ -19,8 +43,34 @@ class RPCError(Exception):
         return f"RPC error {self.code}: {self.message}"
 
 
+RPCRequest = Tuple[str, Sequence[Any]]
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Read-only calls that bitcoind's unauthenticated ``-rest`` interface can answer.
+REST_METHODS = frozenset({"getblockchaininfo", "getmempoolinfo", "getrawmempool", "getblock"})
+
+
+class MempoolEntry(NamedTuple):
+    """Fields of one verbose ``getrawmempool`` entry used for fee statistics."""
+
+    txid: str
+    fee: int
+    vsize: int
+    time: int
+
+
+class _RESTUnavailable(Exception):
+    """The node answered a REST request as if ``-rest`` were disabled."""
+
+
 class BitcoinRPC:
-    """Lightweight JSON-RPC client with cookie or user/password auth."""
+    """Lightweight JSON-RPC client with cookie or user/password auth.
+
+    Calls listed in ``rest_methods`` are served from bitcoind's ``/rest`` endpoints instead,
+    which skip authentication and the JSON-RPC envelope. If the node turns out not to run
+    with ``-rest``, the method falls back to JSON-RPC for the rest of the process lifetime.
+    """
 
     def __init__(
         self,
@@ -29,28 +79,396 @@ class BitcoinRPC:
         password: str = "",
         cookie: Optional[tuple[str, str]] = None,
         timeout: int = 10,
+        pool: Optional[ConnectionPool] = None,
+        cache: Optional["RPCCache"] = None,
+        stats: Optional[RPCStats] = None,
+        rest_methods: Iterable[str] = (),
     ) -> None:
         self.url = url
+        self.rest_url = f"{url.rstrip('/')}/rest/"
+        self.rest_methods = set(rest_methods) & REST_METHODS
         self.timeout = timeout
+        self.pool = pool or ConnectionPool()
+        self.cache = cache
+        self.stats = stats or RPCStats()
         if cookie:
             username, password = cookie
         self.auth = HTTPBasicAuth(username, password) if username or password else None
+        self._credentials = (username, password) if username or password else None
 
     def call(self, method: str, *params: Any) -> Any:
-        payload = {"jsonrpc": "2.0", "id": "btc-monitor", "method": method, "params": list(params)}
-        response = requests.post(
-            self.url,
-            data=json.dumps(payload),
-            headers={"Content-Type": "application/json"},
-            auth=self.auth,
-            timeout=self.timeout,
+        path = self._rest_path(method, params)
+        if path is not None:
+            try:
+                result = self._rest_get(method, path)
+            except _RESTUnavailable:
+                self._disable_rest(method)
+            else:
+                if isinstance(result, RPCError):
+                    raise result
+                return result
+        return _single_result(self._post(_request(method, params)))
+
+    def batch(self, calls: Sequence[RPCRequest]) -> List[Any]:
+        """Submit several calls as one JSON-RPC array request.
+
+        Results are returned in request order. Entries that failed on the node are returned
+        as :class:`RPCError` instances instead of being raised, so one unsupported call does
+        not discard the rest of the batch. Transport failures still raise.
+        """
+
+        if not calls:
+            return []
+        payload = [_request(method, params, index) for index, (method, params) in enumerate(calls)]
+        return _batch_results(self._post(payload), len(calls))
+
+    async def acall(self, method: str, *params: Any) -> Any:
+        # Same path as a batch of one: cached, and split between REST and JSON-RPC.
+        (result,) = await self.abatch([(method, params)])
+        if isinstance(result, RPCError):
+            raise result
+        return result
+
+    async def abatch(self, calls: Sequence[RPCRequest]) -> List[Any]:
+        """Coroutine variant of :meth:`batch` running on the collector's event loop.
+
+        When a :class:`~collector.rpc_cache.RPCCache` is attached, fresh answers are served
+        from it and concurrent identical calls share one request.
+        """
+
+        if not calls:
+            return []
+        if self.cache is not None:
+            return await self.cache.fetch(calls, self._abatch)
+        return await self._abatch(calls)
+
+    async def _abatch(self, calls: Sequence[RPCRequest]) -> List[Any]:
+        paths = [self._rest_path(method, params) for method, params in calls]
+        if all(path is None for path in paths):
+            return await self._abatch_rpc(calls)
+        rpc_indexes = [index for index, path in enumerate(paths) if path is None]
+        rest = [(index, path) for index, path in enumerate(paths) if path is not None]
+        # REST calls are independent GETs; issue them alongside the JSON-RPC batch.
+        rpc_results, *rest_results = await asyncio.gather(
+            self._abatch_rpc([calls[index] for index in rpc_indexes]),
+            *(self._arest_get(calls[index][0], path) for index, path in rest),
+            return_exceptions=True,
         )
-        response.raise_for_status()
-        data: Dict[str, Any] = response.json()
-        if data.get("error"):
-            error = data["error"]
-            raise RPCError(code=error.get("code", -1), message=error.get("message", "Unknown"))
-        return data.get("result")
+        if isinstance(rpc_results, BaseException):
+            raise rpc_results
+        results: List[Any] = [None] * len(calls)
+        for index, result in zip(rpc_indexes, rpc_results, strict=True):
+            results[index] = result
+        fallback: List[int] = []
+        for (index, _), result in zip(rest, rest_results, strict=True):
+            if isinstance(result, _RESTUnavailable):
+                self._disable_rest(calls[index][0])
+                fallback.append(index)
+            elif isinstance(result, BaseException) and not isinstance(result, RPCError):
+                raise result
+            else:
+                results[index] = result
+        if fallback:
+            retried = await self._abatch_rpc([calls[index] for index in fallback])
+            for index, result in zip(fallback, retried, strict=True):
+                results[index] = result
+        return results
+
+    async def _abatch_rpc(self, calls: Sequence[RPCRequest]) -> List[Any]:
+        if not calls:
+            return []
+        payload = [_request(method, params, index) for index, (method, params) in enumerate(calls)]
+        return _batch_results(await self._apost(payload), len(calls))
+
+    def iter_raw_mempool(self) -> Iterator[MempoolEntry]:
+        """Yield verbose mempool entries while the response is still being received.
+
+        Only one entry is decoded at a time, so memory use stays flat no matter how large
+        the node's mempool grows.
+        """
+
+        if "getrawmempool" in self.rest_methods:
+            try:
+                yield from self._iter_mempool_stream(rest=True)
+                return
+            except _RESTUnavailable:
+                self._disable_rest("getrawmempool")
+        yield from self._iter_mempool_stream(rest=False)
+
+    def _iter_mempool_stream(self, rest: bool) -> Iterator[MempoolEntry]:
+        decoder = MempoolStreamDecoder(envelope=not rest)
+        label = "rest:getrawmempool" if rest else "getrawmempool"
+        started = time.perf_counter()
+        try:
+            if rest:
+                response = self.pool.get(
+                    f"{self.rest_url}mempool/contents.json", timeout=self.timeout, stream=True
+                )
+            else:
+                response = self.pool.post(
+                    self.url,
+                    data=json.dumps(_request("getrawmempool", [True])),
+                    headers={"Content-Type": "application/json"},
+                    auth=self.auth,
+                    timeout=self.timeout,
+                    stream=True,
+                )
+            try:
+                if rest and response.status_code >= 400:
+                    error = _check_rest_status(response.status_code, response.content)
+                    if error is not None:
+                        raise error
+                response.raise_for_status()
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    yield from decoder.feed(chunk)
+                decoder.close()
+            finally:
+                response.close()
+        except _RESTUnavailable:
+            raise
+        except Exception as exc:
+            self._observe_stream_failure(label, started, decoder, exc)
+            raise
+        self._observe_stream(label, started, decoder)
+
+    async def aiter_raw_mempool(self) -> AsyncIterator[MempoolEntry]:
+        """Coroutine variant of :meth:`iter_raw_mempool`."""
+
+        if "getrawmempool" in self.rest_methods:
+            try:
+                async for entry in self._aiter_mempool_stream(rest=True):
+                    yield entry
+                return
+            except _RESTUnavailable:
+                self._disable_rest("getrawmempool")
+        async for entry in self._aiter_mempool_stream(rest=False):
+            yield entry
+
+    async def _aiter_mempool_stream(self, rest: bool) -> AsyncIterator[MempoolEntry]:
+        decoder = MempoolStreamDecoder(envelope=not rest)
+        label = "rest:getrawmempool" if rest else "getrawmempool"
+        started = time.perf_counter()
+        if rest:
+            request = self.pool.astream(
+                "GET", f"{self.rest_url}mempool/contents.json", timeout=self.timeout
+            )
+        else:
+            request = self.pool.astream(
+                "POST",
+                self.url,
+                data=json.dumps(_request("getrawmempool", [True])),
+                headers={"Content-Type": "application/json"},
+                auth=self._credentials,
+                timeout=self.timeout,
+            )
+        try:
+            async with request as response:
+                if rest and response.status >= 400:
+                    error = _check_rest_status(response.status, await response.read())
+                    if error is not None:
+                        raise error
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    for entry in decoder.feed(chunk):
+                        yield entry
+                decoder.close()
+        except _RESTUnavailable:
+            raise
+        except Exception as exc:
+            self._observe_stream_failure(label, started, decoder, exc)
+            raise
+        self._observe_stream(label, started, decoder)
+
+    def get_block_raw(self, block_hash: str) -> bytes:
+        """Return a serialized block, as binary REST data when ``getblock`` uses REST."""
+
+        if "getblock" in self.rest_methods:
+            try:
+                return self._rest_get_bytes(f"block/{block_hash}.bin")
+            except _RESTUnavailable:
+                self._disable_rest("getblock")
+        return bytes.fromhex(self.call("getblock", block_hash, 0))
+
+    async def aget_block_raw(self, block_hash: str) -> bytes:
+        """Coroutine variant of :meth:`get_block_raw`."""
+
+        if "getblock" in self.rest_methods:
+            try:
+                return await self._arest_get_bytes(f"block/{block_hash}.bin")
+            except _RESTUnavailable:
+                self._disable_rest("getblock")
+        return bytes.fromhex(await self.acall("getblock", block_hash, 0))
+
+    # REST transport -------------------------------------------------------
+
+    def _rest_path(self, method: str, params: Sequence[Any]) -> Optional[str]:
+        if method not in self.rest_methods:
+            return None
+        return _rest_path(method, params)
+
+    def _disable_rest(self, method: str) -> None:
+        if method in self.rest_methods:
+            LOGGER.warning(
+                "REST interface unavailable; falling back to JSON-RPC",
+                extra={"method": method, "url": self.rest_url},
+            )
+            self.rest_methods.discard(method)
+
+    def _rest_get(self, method: str, path: str) -> Any:
+        label = f"rest:{method}"
+        started = time.perf_counter()
+        try:
+            response = self.pool.get(f"{self.rest_url}{path}", timeout=self.timeout)
+            body = response.content
+            error = _check_rest_status(response.status_code, body)
+        except _RESTUnavailable:
+            raise
+        except Exception as exc:
+            self.stats.observe_failure(label, time.perf_counter() - started, exc)
+            raise
+        return self._decode_rest(label, body, error, started)
+
+    async def _arest_get(self, method: str, path: str) -> Any:
+        label = f"rest:{method}"
+        started = time.perf_counter()
+        try:
+            response = await self.pool.arequest(
+                "GET", f"{self.rest_url}{path}", timeout=self.timeout
+            )
+            error = _check_rest_status(response.status, response.body)
+        except _RESTUnavailable:
+            raise
+        except Exception as exc:
+            self.stats.observe_failure(label, time.perf_counter() - started, exc)
+            raise
+        return self._decode_rest(label, response.body, error, started)
+
+    def _rest_get_bytes(self, path: str) -> bytes:
+        started = time.perf_counter()
+        response = self.pool.get(f"{self.rest_url}{path}", timeout=self.timeout)
+        error = _check_rest_status(response.status_code, response.content)
+        return self._observe_rest_bytes(response.content, error, started)
+
+    async def _arest_get_bytes(self, path: str) -> bytes:
+        started = time.perf_counter()
+        response = await self.pool.arequest("GET", f"{self.rest_url}{path}", timeout=self.timeout)
+        error = _check_rest_status(response.status, response.body)
+        return self._observe_rest_bytes(response.body, error, started)
+
+    def _observe_rest_bytes(self, body: bytes, error: Optional[RPCError], started: float) -> bytes:
+        self.stats.observe(
+            "rest:getblock",
+            time.perf_counter() - started,
+            size=len(body),
+            rpc_errors=int(error is not None),
+        )
+        if error is not None:
+            raise error
+        return body
+
+    def _decode_rest(
+        self, label: str, body: bytes, error: Optional[RPCError], started: float
+    ) -> Any:
+        received = time.perf_counter()
+        if error is not None:
+            self.stats.observe(label, received - started, size=len(body), rpc_errors=1)
+            return error
+        try:
+            result = json.loads(body)
+        except ValueError as exc:
+            self.stats.observe_failure(label, received - started, exc)
+            raise
+        self.stats.observe(
+            label, received - started, size=len(body), decode=time.perf_counter() - received
+        )
+        return result
+
+    def _post(self, payload: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            response = self.pool.post(
+                self.url,
+                data=json.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                auth=self.auth,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            body = response.content
+        except Exception as exc:
+            self.stats.observe_failure(
+                method_label(payload),
+                time.perf_counter() - started,
+                exc,
+                methods=method_count(payload),
+            )
+            raise
+        return self._decode(payload, body, started)
+
+    async def _apost(self, payload: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            response = await self.pool.arequest(
+                "POST",
+                self.url,
+                data=json.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                auth=self._credentials,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except Exception as exc:
+            self.stats.observe_failure(
+                method_label(payload),
+                time.perf_counter() - started,
+                exc,
+                methods=method_count(payload),
+            )
+            raise
+        return self._decode(payload, response.body, started)
+
+    def _decode(self, payload: Any, body: bytes, started: float) -> Any:
+        received = time.perf_counter()
+        method = method_label(payload)
+        methods = method_count(payload)
+        try:
+            result = json.loads(body)
+        except ValueError as exc:
+            self.stats.observe_failure(method, received - started, exc, methods=methods)
+            raise
+        self.stats.observe(
+            method,
+            received - started,
+            size=len(body),
+            decode=time.perf_counter() - received,
+            rpc_errors=_count_errors(result),
+            methods=methods,
+        )
+        return result
+
+    def _observe_stream(
+        self, label: str, started: float, decoder: "MempoolStreamDecoder"
+    ) -> None:
+        self.stats.observe(
+            label,
+            time.perf_counter() - started - decoder.decode_time,
+            size=decoder.bytes_received,
+            decode=decoder.decode_time,
+        )
+
+    def _observe_stream_failure(
+        self, label: str, started: float, decoder: "MempoolStreamDecoder", exc: Exception
+    ) -> None:
+        if isinstance(exc, RPCError):
+            self.stats.observe(
+                label,
+                time.perf_counter() - started - decoder.decode_time,
+                size=decoder.bytes_received,
+                decode=decoder.decode_time,
+                rpc_errors=1,
+            )
+        else:
+            self.stats.observe_failure(label, time.perf_counter() - started, exc)
 
     # Convenience wrappers -------------------------------------------------
 
@@ -74,3 +492,204 @@ class BitcoinRPC:
 
     def estimatesmartfee(self, blocks: int) -> Dict[str, Any]:
         return self.call("estimatesmartfee", blocks)
+
+    async def aget_blockchain_info(self) -> Dict[str, Any]:
+        return await self.acall("getblockchaininfo")
+
+    async def aget_mempool_info(self) -> Dict[str, Any]:
+        return await self.acall("getmempoolinfo")
+
+    async def aget_peer_info(self) -> list[Dict[str, Any]]:
+        return await self.acall("getpeerinfo")
+
+    async def aget_raw_mempool(self, verbose: bool = True) -> Dict[str, Any]:
+        return await self.acall("getrawmempool", verbose)
+
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class MempoolStreamDecoder:
+    """Incremental decoder for a verbose ``getrawmempool`` JSON-RPC response.
+
+    Chunks are fed as they arrive. The top-level envelope is walked by hand and each
+    ``"txid": {...}`` member of ``result`` is decoded on its own, turned into a
+    :class:`MempoolEntry`, and dropped from the buffer. With ``envelope=False`` the input is
+    the bare txid map served by ``/rest/mempool/contents.json``.
+    """
+
+    def __init__(self, envelope: bool = True) -> None:
+        self._envelope = envelope
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._error: Any = None
+        self.bytes_received = 0
+        self.decode_time = 0.0
+
+    def feed(self, chunk: bytes) -> List[MempoolEntry]:
+        started = time.perf_counter()
+        self.bytes_received += len(chunk)
+        self._buffer += self._text.decode(chunk)
+        entries: List[MempoolEntry] = []
+        pos = 0
+        while True:
+            step = self._step(pos, entries)
+            if step is None:
+                break
+            pos = step
+        self._buffer = self._buffer[pos:]
+        self.decode_time += time.perf_counter() - started
+        return entries
+
+    def close(self) -> None:
+        """Validate that the full envelope was received and surface RPC errors."""
+
+        if self._error:
+            raise _rpc_error(self._error)
+        if self._state != "done":
+            raise ValueError("Truncated getrawmempool response")
+
+    def _step(self, pos: int, entries: List[MempoolEntry]) -> Optional[int]:
+        buffer = self._buffer
+        pos = _SEPARATORS.match(buffer, pos).end()  # type: ignore[union-attr]
+        if pos >= len(buffer) or self._state == "done":
+            return None
+        char = buffer[pos]
+        if self._state == "start":
+            if char != "{":
+                raise ValueError("Expected a JSON-RPC response object")
+            self._state = "key" if self._envelope else "entry"
+            return pos + 1
+        if self._state in ("key", "entry"):
+            if char == "}":
+                self._state = "key" if self._state == "entry" and self._envelope else "done"
+                return pos + 1
+            decoded = self._decode(pos)
+            if decoded is None:
+                return None
+            key, end = decoded
+            end = _SEPARATORS.match(buffer, end).end()  # type: ignore[union-attr]
+            if end >= len(buffer):
+                return None
+            if buffer[end] != ":":
+                raise ValueError("Expected ':' in getrawmempool response")
+            value_pos = _SEPARATORS.match(buffer, end + 1).end()  # type: ignore[union-attr]
+            if self._state == "entry":
+                decoded = self._decode(value_pos)
+                if decoded is None:
+                    return None
+                value, value_end = decoded
+                entries.append(_mempool_entry(key, value))
+                return value_end
+            if key == "result" and buffer.startswith("{", value_pos):
+                self._state = "entry"
+                return value_pos + 1
+            decoded = self._decode(value_pos)
+            if decoded is None:
+                return None
+            value, value_end = decoded
+            if key == "error":
+                self._error = value
+            return value_end
+        return None
+
+    def _decode(self, pos: int) -> Optional[Tuple[Any, int]]:
+        # A value ending exactly at the buffer edge may be a number cut mid-way, so wait
+        # for more data; the closing brace always follows a complete value.
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            return None
+        if end >= len(self._buffer):
+            return None
+        return value, end
+
+
+def _mempool_entry(txid: str, entry: Dict[str, Any]) -> MempoolEntry:
+    fees = entry.get("fees") or {}
+    fee = fees.get("base", entry.get("fee", 0)) or 0
+    return MempoolEntry(
+        txid=txid,
+        fee=round(fee * 100_000_000),
+        vsize=int(entry.get("vsize") or 0),
+        time=int(entry.get("time") or 0),
+    )
+
+
+def _rest_path(method: str, params: Sequence[Any]) -> Optional[str]:
+    """Map a JSON-RPC call onto its REST resource, or ``None`` if REST cannot serve it."""
+
+    if method == "getblockchaininfo" and not params:
+        return "chaininfo.json"
+    if method == "getmempoolinfo" and not params:
+        return "mempool/info.json"
+    if method == "getrawmempool" and len(params) <= 1:
+        verbose = bool(params[0]) if params else False
+        return "mempool/contents.json" if verbose else "mempool/contents.json?verbose=false"
+    if method == "getblock" and 1 <= len(params) <= 2:
+        verbosity = params[1] if len(params) > 1 else 1
+        if verbosity == 1:
+            return f"block/notxdetails/{params[0]}.json"
+        if verbosity == 2:
+            return f"block/{params[0]}.json"
+    return None
+
+
+def _check_rest_status(status: int, body: bytes) -> Optional[RPCError]:
+    """Classify a REST reply: ``None`` on success, an error for node-side failures.
+
+    bitcoind answers unknown paths, including every ``/rest`` path when ``-rest`` is off,
+    with an empty 404, while REST handlers always explain their errors in the body.
+    """
+
+    if status < 400:
+        return None
+    if status in (403, 404) and not body.strip():
+        raise _RESTUnavailable()
+    return RPCError(code=status, message=body.decode("utf-8", "replace").strip())
+
+
+def _request(method: str, params: Sequence[Any], request_id: Any = "btc-monitor") -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": list(params)}
+
+
+def _single_result(data: Dict[str, Any]) -> Any:
+    if data.get("error"):
+        raise _rpc_error(data["error"])
+    return data.get("result")
+
+
+def _batch_results(data: Any, expected: int) -> List[Any]:
+    if isinstance(data, dict):
+        # Nodes reject malformed batches with a single error object.
+        raise _rpc_error(data.get("error") or {})
+    return _order_batch_results(data, expected)
+
+
+def _count_errors(data: Any) -> int:
+    if isinstance(data, list):
+        return sum(1 for entry in data if isinstance(entry, dict) and entry.get("error"))
+    return 1 if isinstance(data, dict) and data.get("error") else 0
+
+
+def _rpc_error(error: Dict[str, Any]) -> RPCError:
+    return RPCError(code=error.get("code", -1), message=error.get("message", "Unknown"))
+
+
+def _order_batch_results(entries: List[Dict[str, Any]], expected: int) -> List[Any]:
+    # Bitcoin Core answers in order, but the spec allows any order, so match on ``id``.
+    results: List[Any] = [
+        RPCError(code=-32603, message="Missing response in batch") for _ in range(expected)
+    ]
+    for entry in entries:
+        index = entry.get("id")
+        if not isinstance(index, int) or not 0 <= index < expected:
+            continue
+        if entry.get("error"):
+            results[index] = _rpc_error(entry["error"])
+        else:
+            results[index] = entry.get("result")
+    return results
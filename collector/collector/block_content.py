@@ -0,0 +1,109 @@
+"""Transaction-level block analysis, run in worker processes off the ZMQ path."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Sequence
+
+from .block_decoder import HEADER_SIZE, read_varint, scan_transaction
+
+SCRIPT_TYPES: Sequence[str] = (
+    "p2pk",
+    "p2pkh",
+    "p2sh",
+    "p2wpkh",
+    "p2wsh",
+    "p2tr",
+    "p2a",
+    "multisig",
+    "op_return",
+    "other",
+)
+
+# Layout of the array returned by :func:`analyze_block`.
+COUNTERS: Sequence[str] = (
+    "tx_count",
+    "segwit_txs",
+    "inputs",
+    "outputs",
+    "size",
+    "witness_bytes",
+    "op_return_bytes",
+    *(f"outputs_{script_type}" for script_type in SCRIPT_TYPES),
+)
+
+_INDEX = {name: index for index, name in enumerate(COUNTERS)}
+_TYPE_INDEX = {script_type: _INDEX[f"outputs_{script_type}"] for script_type in SCRIPT_TYPES}
+
+
+def analyze_block(raw: bytes) -> array:
+    """Count inputs, outputs, script types and witness bytes of a serialized block.
+
+    Runs in a worker process, so the result is a flat ``array('q')`` laid out as
+    :data:`COUNTERS`, which pickles to a few hundred bytes.
+    """
+
+    view = memoryview(raw)
+    counts = array("q", bytes(8 * len(COUNTERS)))
+    inputs, outputs = _INDEX["inputs"], _INDEX["outputs"]
+    op_return_bytes = _INDEX["op_return_bytes"]
+
+    def count_input(script: memoryview) -> None:
+        counts[inputs] += 1
+
+    def count_output(script: memoryview) -> None:
+        kind = script_type(script)
+        counts[outputs] += 1
+        counts[_TYPE_INDEX[kind]] += 1
+        if kind == "op_return":
+            counts[op_return_bytes] += len(script)
+
+    try:
+        tx_count, pos = read_varint(view, HEADER_SIZE)
+        counts[_INDEX["tx_count"]] = tx_count
+        for _ in range(tx_count):
+            pos, witness_bytes = scan_transaction(view, pos, count_input, count_output)
+            if witness_bytes:
+                counts[_INDEX["segwit_txs"]] += 1
+                counts[_INDEX["witness_bytes"]] += witness_bytes
+    except IndexError as exc:
+        raise ValueError("Truncated block") from exc
+    counts[_INDEX["size"]] = pos
+    return counts
+
+
+def content_fields(counts: Sequence[int]) -> Dict[str, float]:
+    """Turn an :func:`analyze_block` array into ``block_content`` fields with shares."""
+
+    fields = {name: float(value) for name, value in zip(COUNTERS, counts, strict=True)}
+    size = fields["size"] or 1.0
+    outputs = fields["outputs"] or 1.0
+    fields["witness_share"] = fields["witness_bytes"] / size
+    for script_type in SCRIPT_TYPES:
+        fields[f"share_{script_type}"] = fields[f"outputs_{script_type}"] / outputs
+    return fields
+
+
+def script_type(script: memoryview | bytes) -> str:
+    """Classify an output script by its standard template."""
+
+    size = len(script)
+    if size == 25 and script[:3] == b"\x76\xa9\x14" and script[23:] == b"\x88\xac":
+        return "p2pkh"
+    if size == 23 and script[:2] == b"\xa9\x14" and script[22] == 0x87:
+        return "p2sh"
+    if size == 22 and script[:2] == b"\x00\x14":
+        return "p2wpkh"
+    if size == 34 and script[:2] == b"\x00\x20":
+        return "p2wsh"
+    if size == 34 and script[:2] == b"\x51\x20":
+        return "p2tr"
+    if size == 4 and script == b"\x51\x02\x4e\x73":
+        return "p2a"
+    if size and script[0] == 0x6A:
+        return "op_return"
+    if size in (35, 67) and script[0] == size - 2 and script[-1] == 0xAC:
+        return "p2pk"  # compressed or uncompressed key push, then OP_CHECKSIG
+    if size and script[-1] == 0xAE:
+        return "multisig"
+    return "other"
@@ -0,0 +1,228 @@
+"""Zero-copy decoder for serialized Bitcoin blocks and transactions."""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+HEADER_SIZE = 80
+WITNESS_SCALE_FACTOR = 4
+
+_HEADER = struct.Struct("<i32s32sIII")
+
+# Called by :func:`scan_transaction` with a view of each input or output script.
+ScriptVisitor = Callable[[memoryview], object]
+
+
+class BlockSummary(NamedTuple):
+    """Header fields and size statistics of one block."""
+
+    hash: str
+    prev_hash: str
+    version: int
+    time: int
+    bits: int
+    nonce: int
+    height: Optional[int]
+    tx_count: int
+    size: int
+    stripped_size: int
+    weight: int
+
+
+class TxSummary(NamedTuple):
+    """Size statistics of one transaction as defined by BIP141."""
+
+    size: int
+    stripped_size: int
+    weight: int
+    vsize: int
+
+
+def read_varint(view: memoryview, pos: int) -> Tuple[int, int]:
+    """Decode a CompactSize integer at ``pos`` and return it with the following offset."""
+
+    first = view[pos]
+    if first < 0xFD:
+        return first, pos + 1
+    if first == 0xFD:
+        return view[pos + 1] | view[pos + 2] << 8, pos + 3
+    width = 4 if first == 0xFE else 8
+    return int.from_bytes(view[pos + 1 : pos + 1 + width], "little"), pos + 1 + width
+
+
+def scan_transaction(
+    view: memoryview,
+    pos: int,
+    on_input: Optional[ScriptVisitor] = None,
+    on_output: Optional[ScriptVisitor] = None,
+) -> Tuple[int, int]:
+    """Walk one serialized transaction without copying it.
+
+    Returns the offset just past the transaction and the number of bytes that belong to
+    the segwit marker, flag and witness stacks (zero for legacy transactions). The
+    optional visitors receive each scriptSig and scriptPubKey as a view into ``view``.
+    """
+
+    start = pos
+    pos += 4  # version
+    witness_bytes = 0
+    segwit = view[pos] == 0 and view[pos + 1] != 0
+    if segwit:
+        pos += 2
+    inputs, pos = read_varint(view, pos)
+    for _ in range(inputs):
+        script_len, pos = read_varint(view, pos + 36)  # previous outpoint
+        if on_input is not None:
+            on_input(view[pos : pos + script_len])
+        pos += script_len + 4  # scriptSig and sequence
+    outputs, pos = read_varint(view, pos)
+    for _ in range(outputs):
+        script_len, pos = read_varint(view, pos + 8)  # amount
+        if on_output is not None:
+            on_output(view[pos : pos + script_len])
+        pos += script_len
+    if segwit:
+        witness_start = pos
+        for _ in range(inputs):
+            items, pos = read_varint(view, pos)
+            for _ in range(items):
+                item_len, pos = read_varint(view, pos)
+                pos += item_len
+        witness_bytes = pos - witness_start + 2
+    pos += 4  # locktime
+    if pos > len(view):
+        raise ValueError(f"Transaction at offset {start} runs past the end of the buffer")
+    return pos, witness_bytes
+
+
+def txid_of(view: memoryview, start: int, end: int, witness_bytes: int) -> bytes:
+    """Hash the non-witness serialization of the transaction spanning ``start:end``.
+
+    Returns the txid in display byte order, as used by RPC and ZMQ ``sequence`` messages.
+    Segwit transactions are hashed piecewise around the marker, flag and witness stacks
+    instead of being re-serialized.
+    """
+
+    digest = hashlib.sha256()
+    if witness_bytes:
+        witness_start = end - 4 - (witness_bytes - 2)
+        digest.update(view[start : start + 4])
+        digest.update(view[start + 6 : witness_start])
+        digest.update(view[end - 4 : end])
+    else:
+        digest.update(view[start:end])
+    return hashlib.sha256(digest.digest()).digest()[::-1]
+
+
+def decode_txid(raw: bytes | memoryview) -> bytes:
+    """Return the txid of a serialized transaction such as the body of a ZMQ ``rawtx``."""
+
+    view = memoryview(raw)
+    try:
+        end, witness_bytes = scan_transaction(view, 0)
+    except IndexError as exc:
+        raise ValueError("Truncated transaction") from exc
+    return txid_of(view, 0, end, witness_bytes)
+
+
+def block_txids(raw: bytes | memoryview) -> List[bytes]:
+    """Return the txids of every transaction in a serialized block, coinbase first."""
+
+    view = memoryview(raw)
+    txids: List[bytes] = []
+    try:
+        tx_count, pos = read_varint(view, HEADER_SIZE)
+        for _ in range(tx_count):
+            end, witness_bytes = scan_transaction(view, pos)
+            txids.append(txid_of(view, pos, end, witness_bytes))
+            pos = end
+    except IndexError as exc:
+        raise ValueError("Truncated block") from exc
+    return txids
+
+
+def decode_transaction(raw: bytes | memoryview) -> TxSummary:
+    """Return size, stripped size, weight and vsize of a serialized transaction."""
+
+    view = memoryview(raw)
+    try:
+        end, witness_bytes = scan_transaction(view, 0)
+    except IndexError as exc:
+        raise ValueError("Truncated transaction") from exc
+    stripped = end - witness_bytes
+    weight = stripped * (WITNESS_SCALE_FACTOR - 1) + end
+    return TxSummary(end, stripped, weight, -(-weight // WITNESS_SCALE_FACTOR))
+
+
+def header_hash(raw: bytes | memoryview) -> str:
+    """Return the display-order hash of the block whose serialization starts at ``raw``."""
+
+    view = memoryview(raw)
+    if len(view) < HEADER_SIZE:
+        raise ValueError("Block is shorter than its header")
+    return hashlib.sha256(hashlib.sha256(view[:HEADER_SIZE]).digest()).digest()[::-1].hex()
+
+
+def header_time(raw: bytes | memoryview) -> int:
+    """Return the ``time`` field of the block header at the start of ``raw``."""
+
+    view = memoryview(raw)
+    if len(view) < HEADER_SIZE:
+        raise ValueError("Block is shorter than its header")
+    return _HEADER.unpack_from(view)[3]
+
+
+def decode_block(raw: bytes | memoryview) -> BlockSummary:
+    """Parse a serialized block such as the body of a ZMQ ``rawblock`` message.
+
+    The block is walked through a :class:`memoryview`, so the multi-megabyte payload is
+    never copied; only the 80-byte header is hashed.
+    """
+
+    view = memoryview(raw)
+    if len(view) < HEADER_SIZE + 1:
+        raise ValueError("Block is shorter than its header")
+    version, prev_hash, _merkle, block_time, bits, nonce = _HEADER.unpack_from(view)
+    try:
+        tx_count, pos = read_varint(view, HEADER_SIZE)
+        height = _coinbase_height(view, pos) if tx_count and version >= 2 else None
+        witness_bytes = 0
+        for _ in range(tx_count):
+            pos, tx_witness = scan_transaction(view, pos)
+            witness_bytes += tx_witness
+    except IndexError as exc:
+        raise ValueError("Truncated block") from exc
+    stripped = pos - witness_bytes
+    return BlockSummary(
+        hash=header_hash(view),
+        prev_hash=prev_hash[::-1].hex(),
+        version=version,
+        time=block_time,
+        bits=bits,
+        nonce=nonce,
+        height=height,
+        tx_count=tx_count,
+        size=pos,
+        stripped_size=stripped,
+        weight=stripped * (WITNESS_SCALE_FACTOR - 1) + pos,
+    )
+
+
+def _coinbase_height(view: memoryview, pos: int) -> Optional[int]:
+    """Read the BIP34 height pushed at the start of the coinbase scriptSig."""
+
+    pos += 4  # version
+    if view[pos] == 0 and view[pos + 1] != 0:
+        pos += 2
+    _, pos = read_varint(view, pos)
+    script_len, pos = read_varint(view, pos + 36)
+    if not script_len:
+        return None
+    push = view[pos]
+    if 0x51 <= push <= 0x60:  # OP_1 .. OP_16
+        return push - 0x50
+    if not 1 <= push <= 8 or push >= script_len:
+        return None
+    return int.from_bytes(view[pos + 1 : pos + 1 + push], "little")
@@ -0,0 +1,159 @@
+"""Bound the number of distinct tag values, and so series, that high-churn points create."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+from .influx import Point
+
+OTHER = "other"
+
+# Fields summed when folded points are merged; every other field is dropped from them.
+ADDITIVE_FIELDS: Tuple[str, ...] = ("peer_count",)
+
+
+class HyperLogLog:
+    """Distinct-value estimate in ``2 ** precision`` one-byte registers.
+
+    The default precision of 12 uses 4 KiB and has a standard error of about 1.6 %.
+    Small counts fall back to linear counting, which is close to exact.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        width = 64 - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self) -> float:
+        registers = self._registers
+        size = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0**-rank for rank in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+        return estimate
+
+
+class _TagBudget:
+    """Admitted values of one measurement's tag, least recently seen first."""
+
+    __slots__ = ("tag", "limit", "sketch", "admitted", "folded")
+
+    def __init__(self, tag: str, limit: int) -> None:
+        self.tag = tag
+        self.limit = limit
+        self.sketch = HyperLogLog()
+        self.admitted: OrderedDict[str, float] = OrderedDict()
+        self.folded = 0
+
+    def admit(self, value: str, now: float, ttl: float) -> bool:
+        self.sketch.add(value)
+        admitted = self.admitted
+        if value in admitted:
+            admitted[value] = now
+            admitted.move_to_end(value)
+            return True
+        while admitted and next(iter(admitted.values())) < now - ttl:
+            admitted.popitem(last=False)
+        if len(admitted) < self.limit:
+            admitted[value] = now
+            return True
+        self.folded += 1
+        return False
+
+
+class CardinalityGovernor:
+    """Fold the long tail of high-cardinality tags into an ``other`` bucket.
+
+    ``budgets`` maps ``"measurement.tag"`` to the number of distinct values that tag may
+    carry at once. Values keep their slot while they keep appearing; a slot is freed once
+    its value has not been seen for ``ttl`` seconds. Within each batch, points with the
+    largest :data:`ADDITIVE_FIELDS` totals are admitted first, so a full budget holds the
+    top values rather than the earliest ones. A value that finds no free slot is rewritten
+    to ``other``. Folded points that end up with identical tags are merged by summing
+    their additive fields; non-additive fields (such as coordinates) are dropped from them.
+
+    Each budget also feeds a :class:`HyperLogLog` of every value seen, which estimates
+    the series cardinality the tag would have produced without the governor.
+
+    It rewrites points before any output sees them, so InfluxDB and the Prometheus
+    exporter share the same folded series.
+    """
+
+    def __init__(
+        self,
+        budgets: Mapping[str, int],
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._budgets: Dict[str, List[_TagBudget]] = {}
+        for key, limit in budgets.items():
+            measurement, tag = key.split(".", 1)
+            self._budgets.setdefault(measurement, []).append(_TagBudget(tag, limit))
+
+    def apply(self, points: Iterable[Point]) -> List[Point]:
+        output: List[Point] = []
+        governed: List[Point] = []
+        for point in points:
+            (governed if point.measurement in self._budgets else output).append(point)
+        if not governed:
+            return output
+        now = self._clock()
+        governed.sort(key=_weight, reverse=True)
+        merged: Dict[Tuple[str, Tuple[Tuple[str, str], ...], int | None], Point] = {}
+        for point in governed:
+            folded = False
+            for budget in self._budgets[point.measurement]:
+                value = point.tags.get(budget.tag)
+                if value is None or value == OTHER:
+                    continue
+                if not budget.admit(value, now, self.ttl):
+                    point.tags[budget.tag] = OTHER
+                    folded = True
+            if not folded:
+                output.append(point)
+                continue
+            key = (point.measurement, tuple(sorted(point.tags.items())), point.time)
+            bucket = merged.get(key)
+            if bucket is None:
+                bucket = merged[key] = Point(point.measurement, point.tags, time=point.time)
+            for name in ADDITIVE_FIELDS:
+                if name in point.fields:
+                    bucket.field(name, bucket.fields.get(name, 0.0) + point.fields[name])
+        output.extend(merged.values())
+        return output
+
+    def status(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """Budget usage keyed by ``(measurement, tag)``."""
+
+        return {
+            (measurement, budget.tag): {
+                "distinct": budget.sketch.count(),
+                "admitted": float(len(budget.admitted)),
+                "budget": float(budget.limit),
+                "folded": float(budget.folded),
+            }
+            for measurement, budgets in self._budgets.items()
+            for budget in budgets
+        }
+
+
+def _weight(point: Point) -> float:
+    return sum(float(point.fields.get(name, 0.0)) for name in ADDITIVE_FIELDS)
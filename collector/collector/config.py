@@ -4,10 +4,68 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Annotated, Dict, List, Literal, Optional
 
-from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+HistSource = Literal["none", "core_rawmempool", "mempool_api", "zmq_mirror"]
+RestMethod = Literal["getblockchaininfo", "getmempoolinfo", "getrawmempool", "getblock"]
+
+
+class NodeConfig(BaseModel):
+    """One entry of ``BITCOIN_NODES``; unset fields inherit the top-level settings."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    bitcoin_rpc_host: Optional[str] = None
+    bitcoin_rpc_port: Optional[int] = None
+    bitcoin_rpc_user: Optional[str] = None
+    bitcoin_rpc_password: Optional[str] = None
+    bitcoin_rpc_cookie_path: Optional[str] = None
+    bitcoin_rpc_pool_size: Optional[int] = None
+    bitcoin_rest_methods: Optional[List[RestMethod]] = None
+    bitcoin_network: Optional[str] = None
+    bitcoin_datadir: Optional[str] = None
+    bitcoin_chainstate_dir: Optional[str] = None
+    bitcoin_zmq_rawblock: Optional[str] = None
+    bitcoin_zmq_rawtx: Optional[str] = None
+    bitcoin_zmq_sequence: Optional[str] = None
+    enable_zmq: Optional[bool] = None
+    fulcrum_stats_url: Optional[str] = None
+    mempool_hist_source: Optional[HistSource] = None
+    mempool_api_base: Optional[str] = None
+
+    @field_validator("name")
+    @classmethod
+    def non_blank_name(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("BITCOIN_NODES entries need a non-empty name")
+        return value
+
+
+class InfluxDestination(BaseModel):
+    """One entry of ``INFLUX_DESTINATIONS``; unset fields inherit the top-level settings."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    influx_url: Optional[str] = None
+    influx_org: Optional[str] = None
+    influx_bucket: Optional[str] = None
+    influx_token: Optional[str] = None
+    influx_tls_verify: Optional[bool] = None
+    influx_gzip: Optional[bool] = None
+
+    @field_validator("name")
+    @classmethod
+    def non_blank_name(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("INFLUX_DESTINATIONS entries need a non-empty name")
+        return value
 
 
 class CollectorConfig(BaseSettings):
@@ -24,25 +82,67 @@ class CollectorConfig(BaseSettings):
     bitcoin_rpc_user: str = ""
     bitcoin_rpc_password: str = ""
     bitcoin_rpc_cookie_path: Optional[str] = "~/.bitcoin/.cookie"
+    bitcoin_rpc_pool_size: int = 4
+    bitcoin_rpc_cache_ttl: float = 2.0
+    bitcoin_rest_methods: Annotated[List[RestMethod], NoDecode] = []
     bitcoin_network: str = "mainnet"
     bitcoin_datadir: Optional[str] = "~/.bitcoin"
     bitcoin_chainstate_dir: Optional[str] = "~/.bitcoin/chainstate"
 
     bitcoin_zmq_rawblock: str = "tcp://127.0.0.1:28332"
     bitcoin_zmq_rawtx: str = "tcp://127.0.0.1:28333"
+    bitcoin_zmq_sequence: str = "tcp://127.0.0.1:28334"
+
+    bitcoin_nodes: List[NodeConfig] = []
 
     fulcrum_stats_url: str = ""
 
+    enable_influx: bool = True
+    influx_destinations: List[InfluxDestination] = []
     influx_url: str = "http://influxdb:8086"
     influx_org: str = "bitcoin"
     influx_bucket: str = "btc_metrics"
     influx_token: str = ""
     influx_tls_verify: bool = True
+    influx_precision: Literal["s", "ms", "us", "ns"] = "s"
+    influx_gzip: bool = True
+    influx_batch_size: int = 5000
+    influx_flush_interval: float = 1.0
+    influx_queue_size: int = 100_000
+    influx_spool_dir: str = ""
+    influx_spool_max_bytes: int = 256 * 1024 * 1024
+    influx_spool_segment_bytes: int = 8 * 1024 * 1024
+    influx_spool_replay_rate: int = 1024 * 1024
+
+    aggregate_measurements: Annotated[List[str], NoDecode] = []
+    aggregate_window: float = 60.0
+    aggregate_quantiles: Annotated[List[float], NoDecode] = []
+    aggregate_keep_raw: Annotated[List[str], NoDecode] = []
+    aggregate_max_series: int = 10_000
+
+    cardinality_budgets: Annotated[Dict[str, int], NoDecode] = {}
+    cardinality_ttl: float = 3600.0
+
+    enable_prometheus: bool = False
+    prometheus_host: str = "0.0.0.0"
+    prometheus_port: int = 9332
+    prometheus_stale_after: float = 300.0
+
+    http_pool_size: int = 2
+    http_idle_timeout: float = 60.0
 
     scrape_interval_fast: int = 5
     scrape_interval_slow: int = 30
+    scrape_interval_heartbeat: int = 60
+    enable_event_scrape: bool = False
 
     enable_block_intervals: bool = True
+    enable_tx_rate: bool = True
+    enable_block_latency: bool = True
+    enable_tx_confirmation: bool = False
+    enable_block_content: bool = False
+    block_content_workers: int = 1
+    tx_confirmation_max_entries: int = 400_000
     enable_softfork_signal: bool = True
     enable_peer_quality: bool = True
     enable_process_metrics: bool = True
@@ -50,9 +150,16 @@ class CollectorConfig(BaseSettings):
     enable_peer_churn: bool = True
     enable_asn_stats: bool = True
     enable_zmq: bool = False
+    zmq_listener_mode: Literal["thread", "asyncio"] = "thread"
+    zmq_rcvhwm: int = 1000
+    zmq_rcvbuf: int = 0
+    zmq_queue_size: int = 10_000
 
-    mempool_hist_source: Literal["none", "core_rawmempool", "mempool_api"] = "none"
+    mempool_hist_source: HistSource = "none"
     mempool_api_base: str = "http://127.0.0.1:3006"
+    mempool_hist_min_feerate: float = 1.0
+    mempool_hist_max_feerate: float = 1000.0
+    mempool_hist_buckets_per_decade: int = 5
 
     geoip_account_id: str = ""
     geoip_license_key: str = ""
@@ -77,10 +184,88 @@ class CollectorConfig(BaseSettings):
             return None
         return os.path.expanduser(value_str)
 
+    @field_validator("bitcoin_rest_methods", mode="before")
+    @classmethod
+    def split_rest_methods(cls, value: object) -> object:
+        """Accept a comma-separated list such as ``getblockchaininfo,getmempoolinfo``."""
+
+        if isinstance(value, str):
+            return [item.strip().lower() for item in value.split(",") if item.strip()]
+        return value
+
+    @field_validator(
+        "aggregate_measurements", "aggregate_quantiles", "aggregate_keep_raw", mode="before"
+    )
+    @classmethod
+    def split_aggregation_lists(cls, value: object) -> object:
+        """Accept comma-separated lists such as ``tx_rate,block_latency`` or ``0.5,0.9``."""
+
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    @field_validator("aggregate_quantiles")
+    @classmethod
+    def valid_aggregate_quantiles(cls, value: List[float]) -> List[float]:
+        if any(not 0 < quantile < 1 for quantile in value):
+            raise ValueError("AGGREGATE_QUANTILES must lie strictly between 0 and 1")
+        return value
+
+    @field_validator("aggregate_window")
+    @classmethod
+    def positive_aggregate_window(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("AGGREGATE_WINDOW must be positive")
+        return value
+
+    @field_validator("aggregate_max_series")
+    @classmethod
+    def positive_aggregate_max_series(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("AGGREGATE_MAX_SERIES must be positive")
+        return value
+
+    @field_validator("cardinality_budgets", mode="before")
+    @classmethod
+    def parse_cardinality_budgets(cls, value: object) -> object:
+        """Accept ``measurement.tag=limit`` pairs such as ``peer_geo_coords.ip=256``."""
+
+        if not isinstance(value, str):
+            return value
+        budgets: Dict[str, str] = {}
+        for item in value.split(","):
+            if not item.strip():
+                continue
+            key, separator, limit = item.partition("=")
+            if not separator:
+                raise ValueError(
+                    f"CARDINALITY_BUDGETS entry {item.strip()!r} must be measurement.tag=limit"
+                )
+            budgets[key.strip()] = limit.strip()
+        return budgets
+
+    @field_validator("cardinality_budgets")
+    @classmethod
+    def valid_cardinality_budgets(cls, value: Dict[str, int]) -> Dict[str, int]:
+        for key, limit in value.items():
+            measurement, _, tag = key.partition(".")
+            if not measurement or not tag:
+                raise ValueError(f"CARDINALITY_BUDGETS key {key!r} must look like measurement.tag")
+            if limit <= 0:
+                raise ValueError(f"CARDINALITY_BUDGETS limit for {key} must be positive")
+        return value
+
+    @field_validator("cardinality_ttl")
+    @classmethod
+    def positive_cardinality_ttl(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("CARDINALITY_TTL must be positive")
+        return value
+
     @field_validator("mempool_hist_source", mode="before")
     @classmethod
     def validate_hist_source(cls, value: str | None) -> str:
-        allowed = {"none", "core_rawmempool", "mempool_api"}
+        allowed = {"none", "core_rawmempool", "mempool_api", "zmq_mirror"}
         if isinstance(value, str):
             value_str = value.strip().lower() or "none"
         else:
@@ -117,13 +302,178 @@ class CollectorConfig(BaseSettings):
 
         return value
 
-    @field_validator("scrape_interval_fast", "scrape_interval_slow")
+    @field_validator("scrape_interval_fast", "scrape_interval_slow", "scrape_interval_heartbeat")
     @classmethod
     def positive_intervals(cls, value: int) -> int:
         if value <= 0:
             raise ValueError("Scrape intervals must be positive")
         return value
 
+    @field_validator("influx_batch_size", "influx_queue_size")
+    @classmethod
+    def positive_influx_queue(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("INFLUX_BATCH_SIZE and INFLUX_QUEUE_SIZE must be positive")
+        return value
+
+    @field_validator("influx_flush_interval")
+    @classmethod
+    def positive_flush_interval(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("INFLUX_FLUSH_INTERVAL must be positive")
+        return value
+
+    @field_validator(
+        "influx_spool_max_bytes", "influx_spool_segment_bytes", "influx_spool_replay_rate"
+    )
+    @classmethod
+    def positive_spool_sizes(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError(
+                "INFLUX_SPOOL_MAX_BYTES, INFLUX_SPOOL_SEGMENT_BYTES and "
+                "INFLUX_SPOOL_REPLAY_RATE must be positive"
+            )
+        return value
+
+    @field_validator("prometheus_port")
+    @classmethod
+    def valid_prometheus_port(cls, value: int) -> int:
+        if not 0 < value < 65536:
+            raise ValueError("PROMETHEUS_PORT must be between 1 and 65535")
+        return value
+
+    @field_validator("prometheus_stale_after")
+    @classmethod
+    def positive_prometheus_stale_after(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("PROMETHEUS_STALE_AFTER must be positive")
+        return value
+
+    @field_validator("block_content_workers")
+    @classmethod
+    def positive_block_content_workers(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("BLOCK_CONTENT_WORKERS must be positive")
+        return value
+
+    @field_validator("bitcoin_rpc_pool_size", "http_pool_size")
+    @classmethod
+    def positive_pool_sizes(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("HTTP pool sizes must be positive")
+        return value
+
+    @field_validator("zmq_rcvhwm", "zmq_rcvbuf")
+    @classmethod
+    def non_negative_zmq_buffers(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("ZMQ_RCVHWM and ZMQ_RCVBUF must not be negative")
+        return value
+
+    @field_validator("zmq_queue_size")
+    @classmethod
+    def positive_zmq_queue_size(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("ZMQ_QUEUE_SIZE must be positive")
+        return value
+
+    @field_validator("tx_confirmation_max_entries")
+    @classmethod
+    def positive_confirmation_entries(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("TX_CONFIRMATION_MAX_ENTRIES must be positive")
+        return value
+
+    @field_validator("bitcoin_nodes")
+    @classmethod
+    def unique_node_names(cls, value: List[NodeConfig]) -> List[NodeConfig]:
+        names = [node.name for node in value]
+        if len(set(names)) != len(names):
+            raise ValueError("BITCOIN_NODES names must be unique")
+        return value
+
+    @field_validator("influx_destinations")
+    @classmethod
+    def unique_destination_names(cls, value: List[InfluxDestination]) -> List[InfluxDestination]:
+        names = [destination.name for destination in value]
+        if len(set(names)) != len(names):
+            raise ValueError("INFLUX_DESTINATIONS names must be unique")
+        return value
+
+    @model_validator(mode="after")
+    def validate_hist_edges(self) -> "CollectorConfig":
+        if not 0 < self.mempool_hist_min_feerate < self.mempool_hist_max_feerate:
+            raise ValueError(
+                "MEMPOOL_HIST_MIN_FEERATE must be positive and below MEMPOOL_HIST_MAX_FEERATE"
+            )
+        if self.mempool_hist_buckets_per_decade <= 0:
+            raise ValueError("MEMPOOL_HIST_BUCKETS_PER_DECADE must be positive")
+        return self
+
+    @model_validator(mode="after")
+    def mirror_requires_zmq(self) -> "CollectorConfig":
+        if self.mempool_hist_source == "zmq_mirror" and not self.enable_zmq:
+            raise ValueError("MEMPOOL_HIST_SOURCE=zmq_mirror requires ENABLE_ZMQ=1")
+        return self
+
+    @model_validator(mode="after")
+    def keep_raw_is_aggregated(self) -> "CollectorConfig":
+        extra = set(self.aggregate_keep_raw) - set(self.aggregate_measurements)
+        if extra:
+            raise ValueError(
+                "AGGREGATE_KEEP_RAW may only list AGGREGATE_MEASUREMENTS entries; "
+                f"not aggregated: {', '.join(sorted(extra))}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def requires_an_output(self) -> "CollectorConfig":
+        if not self.enable_influx and not self.enable_prometheus:
+            raise ValueError("Enable at least one of ENABLE_INFLUX and ENABLE_PROMETHEUS")
+        return self
+
+    @model_validator(mode="after")
+    def event_scrape_requires_zmq(self) -> "CollectorConfig":
+        if self.enable_event_scrape and not self.enable_zmq:
+            raise ValueError("ENABLE_EVENT_SCRAPE=1 requires ENABLE_ZMQ=1")
+        return self
+
+    def node_configs(self) -> Dict[str, "CollectorConfig"]:
+        """Return one fully resolved configuration per monitored node, keyed by name.
+
+        Without ``BITCOIN_NODES`` the top-level settings describe a single node named after
+        ``BITCOIN_NETWORK``.
+        """
+
+        if not self.bitcoin_nodes:
+            return {self.bitcoin_network: self}
+        base = self.model_dump(exclude={"bitcoin_nodes"})
+        configs: Dict[str, CollectorConfig] = {}
+        for node in self.bitcoin_nodes:
+            overrides = node.model_dump(exclude={"name"}, exclude_none=True)
+            configs[node.name] = CollectorConfig(
+                **{**base, **overrides, "bitcoin_nodes": []}
+            )
+        return configs
+
+    def destination_configs(self) -> Dict[str, "CollectorConfig"]:
+        """Return one fully resolved configuration per InfluxDB destination, keyed by name.
+
+        Without ``INFLUX_DESTINATIONS`` the top-level ``INFLUX_*`` settings describe a single
+        destination named ``default``.
+        """
+
+        if not self.influx_destinations:
+            return {"default": self}
+        base = self.model_dump(exclude={"influx_destinations"})
+        configs: Dict[str, CollectorConfig] = {}
+        for destination in self.influx_destinations:
+            overrides = destination.model_dump(exclude={"name"}, exclude_none=True)
+            configs[destination.name] = CollectorConfig(
+                **{**base, **overrides, "influx_destinations": []}
+            )
+        return configs
+
     @property
     def cookie_path(self) -> Optional[Path]:
         if not self.bitcoin_rpc_cookie_path:
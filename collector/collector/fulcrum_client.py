@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-import requests
+from .http_pool import ConnectionPool
 
 
 class FulcrumClient:
-    def __init__(self, url: str, timeout: int = 5) -> None:
+    def __init__(
+        self, url: str, timeout: int = 5, pool: Optional[ConnectionPool] = None
+    ) -> None:
         self.url = url
         self.timeout = timeout
+        self.pool = pool or ConnectionPool()
 
     def fetch(self) -> Dict[str, Any]:
-        response = requests.get(self.url, timeout=self.timeout)
+        response = self.pool.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def afetch(self) -> Dict[str, Any]:
+        response = await self.pool.arequest("GET", self.url, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
@@ -0,0 +1,336 @@
+"""Shared keep-alive HTTP connection pool."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Endpoint:
+    pool_size: int
+    session: requests.Session | None = None
+    last_used: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    retired_connections: int = 0
+    reconnects: int = 0
+    idle_evictions: int = 0
+    async_session: aiohttp.ClientSession | None = None
+    async_loop: asyncio.AbstractEventLoop | None = None
+    async_last_used: float = field(default_factory=time.monotonic)
+    async_connections: int = 0
+
+
+@dataclass
+class HTTPResult:
+    """Fully read response returned by :meth:`ConnectionPool.arequest`."""
+
+    status: int
+    body: bytes
+    request_info: aiohttp.RequestInfo
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                self.request_info,
+                (),
+                status=self.status,
+                message=self.body.decode("utf-8", errors="replace")[:200],
+            )
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ConnectionPool:
+    """Keep-alive ``requests`` sessions shared by the collector's HTTP clients.
+
+    One session is kept per endpoint (scheme, host and port) so each client reuses its own
+    sockets instead of paying a TCP/TLS handshake per call. Sessions left idle for longer
+    than ``idle_timeout`` seconds are closed before their next use, and a connection error
+    on a previously used session (for example after bitcoind restarts) drops the stale
+    sockets and retries the request once on a fresh connection.
+
+    The same endpoints are also served to coroutines through :meth:`arequest`, backed by
+    one ``aiohttp`` session per endpoint with the same pool size and keep-alive timeout.
+    Idle ``aiohttp`` sessions are evicted and counted the same way, and a session left
+    behind by a finished event loop is closed before it is replaced.
+    """
+
+    def __init__(self, pool_size: int = 2, idle_timeout: float = 60.0) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url: str, pool_size: int) -> None:
+        """Override the number of pooled connections kept for ``url``'s endpoint."""
+
+        with self._lock:
+            key = _endpoint_key(url)
+            if key in self._endpoints:
+                self._endpoints[key].pool_size = pool_size
+            else:
+                self._endpoints[key] = _Endpoint(pool_size)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        key = _endpoint_key(url)
+        session, reused = self._checkout(key)
+        try:
+            return session.request(method, url, **kwargs)
+        except requests.ConnectionError:
+            if not reused:
+                raise
+            LOGGER.debug("Pooled connection failed; reconnecting", extra={"endpoint": key})
+            session = self._reset(key, session)
+            return session.request(method, url, **kwargs)
+
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: bytes | str | None = None,
+        params: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        auth: Optional[tuple[str, str]] = None,
+        timeout: float = 10,
+        verify: bool = True,
+    ) -> HTTPResult:
+        """Issue a request on the running event loop and read the full response body."""
+
+        async with self.astream(
+            method,
+            url,
+            data=data,
+            params=params,
+            headers=headers,
+            auth=auth,
+            timeout=timeout,
+            verify=verify,
+        ) as response:
+            body = await response.read()
+            return HTTPResult(response.status, body, response.request_info)
+
+    @contextlib.asynccontextmanager
+    async def astream(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: bytes | str | None = None,
+        params: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        auth: Optional[tuple[str, str]] = None,
+        timeout: float = 10,
+        verify: bool = True,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Open a request and yield the response before its body has been read."""
+
+        key = _endpoint_key(url)
+        session, reused = await self._acheckout(key)
+        kwargs: Dict[str, Any] = {
+            "data": data,
+            "params": params,
+            "headers": headers,
+            "auth": aiohttp.BasicAuth(*auth) if auth else None,
+            "timeout": aiohttp.ClientTimeout(total=timeout),
+            "ssl": None if verify else False,
+        }
+        try:
+            response = await session.request(method, url, **kwargs)
+        except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError):
+            if not reused:
+                raise
+            LOGGER.debug("Pooled connection failed; reconnecting", extra={"endpoint": key})
+            session = await self._areset(key, session)
+            response = await session.request(method, url, **kwargs)
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return request and connection counters per endpoint.
+
+        ``reused`` counts requests served on an already open socket; once keep-alive is
+        working it should track ``requests`` while ``connections`` stays flat.
+        """
+
+        with self._lock:
+            snapshot: Dict[str, Dict[str, float]] = {}
+            for key, endpoint in self._endpoints.items():
+                connections = (
+                    endpoint.retired_connections
+                    + endpoint.async_connections
+                    + _opened_connections(endpoint.session)
+                )
+                snapshot[key] = {
+                    "requests": float(endpoint.requests),
+                    "connections": float(connections),
+                    "reused": float(max(endpoint.requests - connections, 0)),
+                    "reconnects": float(endpoint.reconnects),
+                    "idle_evictions": float(endpoint.idle_evictions),
+                }
+            return snapshot
+
+    def close(self) -> None:
+        with self._lock:
+            for endpoint in self._endpoints.values():
+                self._retire(endpoint)
+
+    async def aclose(self) -> None:
+        for endpoint in list(self._endpoints.values()):
+            session, endpoint.async_session = endpoint.async_session, None
+            if session is not None:
+                await _close_session(session, endpoint.async_loop)
+
+    def _checkout(self, key: str) -> tuple[requests.Session, bool]:
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _Endpoint(self.pool_size)
+            now = time.monotonic()
+            if endpoint.session is not None and now - endpoint.last_used > self.idle_timeout:
+                endpoint.idle_evictions += 1
+                self._retire(endpoint)
+            reused = endpoint.session is not None
+            if endpoint.session is None:
+                endpoint.session = _new_session(endpoint.pool_size)
+            endpoint.last_used = now
+            endpoint.requests += 1
+            return endpoint.session, reused
+
+    def _reset(self, key: str, stale: requests.Session) -> requests.Session:
+        with self._lock:
+            endpoint = self._endpoints[key]
+            if endpoint.session is stale:
+                endpoint.reconnects += 1
+                self._retire(endpoint)
+                endpoint.session = _new_session(endpoint.pool_size)
+            assert endpoint.session is not None
+            return endpoint.session
+
+    async def _acheckout(self, key: str) -> tuple[aiohttp.ClientSession, bool]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _Endpoint(self.pool_size)
+            now = time.monotonic()
+            stale: tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop | None] | None = None
+            if endpoint.async_session is not None:
+                # Sessions are bound to the loop that created them.
+                if endpoint.async_loop is not loop:
+                    stale = (endpoint.async_session, endpoint.async_loop)
+                elif now - endpoint.async_last_used > self.idle_timeout:
+                    endpoint.idle_evictions += 1
+                    stale = (endpoint.async_session, loop)
+                if stale is not None:
+                    endpoint.async_session = None
+            reused = endpoint.async_session is not None
+            if endpoint.async_session is None:
+                endpoint.async_session = self._new_async_session(endpoint)
+                endpoint.async_loop = loop
+            endpoint.async_last_used = now
+            endpoint.requests += 1
+            session = endpoint.async_session
+        if stale is not None:
+            await _close_session(*stale)
+        return session, reused
+
+    async def _areset(
+        self, key: str, stale: aiohttp.ClientSession
+    ) -> aiohttp.ClientSession:
+        endpoint = self._endpoints[key]
+        if endpoint.async_session is stale:
+            endpoint.reconnects += 1
+            endpoint.async_session = self._new_async_session(endpoint)
+            await stale.close()
+        assert endpoint.async_session is not None
+        return endpoint.async_session
+
+    def _new_async_session(self, endpoint: _Endpoint) -> aiohttp.ClientSession:
+        async def _on_connection_created(
+            session: aiohttp.ClientSession, context: SimpleNamespace, params: object
+        ) -> None:
+            endpoint.async_connections += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(_on_connection_created)
+        connector = aiohttp.TCPConnector(
+            limit=endpoint.pool_size, keepalive_timeout=self.idle_timeout
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+
+    @staticmethod
+    def _retire(endpoint: _Endpoint) -> None:
+        if endpoint.session is None:
+            return
+        endpoint.retired_connections += _opened_connections(endpoint.session)
+        endpoint.session.close()
+        endpoint.session = None
+
+
+async def _close_session(
+    session: aiohttp.ClientSession, owner: asyncio.AbstractEventLoop | None
+) -> None:
+    """Close ``session`` on ``owner`` if that loop still runs elsewhere, else right here.
+
+    Once ``owner`` has been closed aiohttp can no longer close its sockets, but closing the
+    session still releases the connector.
+    """
+
+    if owner is not None and owner.is_running() and owner is not asyncio.get_running_loop():
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), owner))
+        return
+    await session.close()
+
+
+def _new_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _opened_connections(session: requests.Session | None) -> int:
+    if session is None:
+        return 0
+    total = 0
+    # The same adapter is mounted for both schemes; count each one once.
+    for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            total += int(getattr(pool, "num_connections", 0))
+    return total
+
+
+def _endpoint_key(url: str) -> str:
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return f"{parts.scheme}://{parts.hostname}:{port}"
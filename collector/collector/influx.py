@@ -2,25 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Iterable
+from functools import lru_cache
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
-import requests
+import aiohttp
 from requests import RequestException, Response
 
+from .http_pool import ConnectionPool
+from .spool import WriteSpool
+
 LOGGER = logging.getLogger(__name__)
 
+# Nanoseconds per unit of each InfluxDB write precision.
+PRECISIONS: Dict[str, int] = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+# Distinct series (measurement plus tag set) whose escaped prefix is kept between scrapes.
+SERIES_CACHE_SIZE = 4096
+
 
 class InfluxWriteError(RuntimeError):
-    """Raised when points cannot be written to InfluxDB."""
+    """Raised when points cannot be written to InfluxDB.
+
+    ``status`` is the HTTP status InfluxDB answered with, or ``None`` when no response
+    arrived (connection errors and timeouts).
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the same body may succeed later: no response, 429 or a server error.
 
+        Any other 4xx means InfluxDB rejected the body itself (bad line protocol, a
+        field type conflict, a missing bucket), so sending it again cannot help.
+        """
 
-@dataclass
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+@dataclass(slots=True)
 class Point:
     measurement: str
     tags: Dict[str, str] = field(default_factory=dict)
     fields: Dict[str, float] = field(default_factory=dict)
+    time: Optional[int] = None  # nanoseconds since the epoch; None lets InfluxDB stamp it
 
     def tag(self, key: str, value: str) -> "Point":
         self.tags[key] = value
@@ -30,36 +63,56 @@ class Point:
         self.fields[key] = value
         return self
 
-    def to_line(self) -> str:
-        measurement = _escape_measurement(self.measurement)
-        tags = "".join(
-            [f",{_escape_tag_key(k)}={_escape_tag_value(v)}" for k, v in self.tags.items()]
+    def to_line(self, precision: str = "s") -> str:
+        series = _series_key(self.measurement, tuple(self.tags.items()))
+        fields = ",".join(
+            [f"{_field_key(k)}={_format_value(v)}" for k, v in self.fields.items()]
         )
-        fields = ",".join([f"{_escape_field_key(k)}={v}" for k, v in self.fields.items()])
-        return f"{measurement}{tags} {fields}"
+        if self.time is None:
+            return f"{series} {fields}"
+        return f"{series} {fields} {self.time // PRECISIONS[precision]}"
+
+
+# Commas, spaces and equals signs are escaped in measurements, tag keys, tag values and
+# field keys alike, in a single pass per string.
+_ESCAPES = str.maketrans({"\\": "\\\\", ",": "\\,", " ": "\\ ", "=": "\\="})
+
 
+def _escape(value: str) -> str:
+    return str(value).translate(_ESCAPES)
 
-def _escape_measurement(value: str) -> str:
-    return _escape_component(str(value), characters=(",", " ", "="))
 
+@lru_cache(maxsize=SERIES_CACHE_SIZE)
+def _series_key(measurement: str, tags: Tuple[Tuple[str, str], ...]) -> str:
+    """Escaped ``measurement,tag=value,...`` prefix, shared by every line of one series."""
 
-def _escape_tag_key(value: str) -> str:
-    return _escape_component(str(value), characters=(",", " ", "="))
+    return _escape(measurement) + "".join([f",{_escape(k)}={_escape(v)}" for k, v in tags])
 
 
-def _escape_tag_value(value: str) -> str:
-    return _escape_component(str(value), characters=(",", " ", "="))
+@lru_cache(maxsize=SERIES_CACHE_SIZE)
+def _field_key(key: str) -> str:
+    return _escape(key)
 
 
-def _escape_field_key(value: str) -> str:
-    return _escape_component(str(value), characters=(",", " ", "="))
+def _format_value(value: float) -> str:
+    """Render a field value with its line-protocol type: float, ``i`` integer or boolean.
 
+    Builders pass floats for almost everything, so that case is checked first. ``bool`` is
+    a subclass of ``int`` and has to be told apart before integers.
+    """
 
-def _escape_component(value: str, characters: tuple[str, ...]) -> str:
-    escaped = value.replace("\\", "\\\\")
-    for char in characters:
-        escaped = escaped.replace(char, f"\\{char}")
-    return escaped
+    if type(value) is float:
+        return repr(value)
+    if value is True or value is False:
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return f"{value}i"
+    return repr(float(value))
+
+
+def _encode_lines(points: Iterable[Point], precision: str = "s") -> bytes | None:
+    lines = "\n".join([point.to_line(precision) for point in points if point.fields])
+    return lines.encode("utf-8") if lines else None
 
 
 class InfluxWriter:
@@ -70,39 +123,370 @@ class InfluxWriter:
         org: str,
         bucket: str,
         verify_tls: bool = True,
+        pool: Optional[ConnectionPool] = None,
+        precision: str = "s",
+        compress: bool = True,
     ) -> None:
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported InfluxDB precision {precision!r}")
         self.url = url.rstrip("/")
+        self.pool = pool or ConnectionPool()
         self.token = token
         self.org = org
         self.bucket = bucket
         self.verify_tls = verify_tls
+        self.precision = precision
+        self.compress = compress
 
     def write_points(self, points: Iterable[Point]) -> None:
-        lines = "\n".join(point.to_line() for point in points if point.fields)
-        if not lines:
+        body = _encode_lines(points, self.precision)
+        if body is None:
             return
-        headers = {"Content-Type": "text/plain"}
-        if self.token:
-            headers["Authorization"] = f"Token {self.token}"
         try:
-            response: Response = requests.post(
+            response: Response = self.pool.post(
                 f"{self.url}/api/v2/write",
-                params={"org": self.org, "bucket": self.bucket, "precision": "s"},
-                data=lines.encode("utf-8"),
-                headers=headers,
+                params=self._params(),
+                data=self._payload(body),
+                headers=self._headers(),
                 timeout=10,
                 verify=self.verify_tls,
             )
             response.raise_for_status()
         except RequestException as exc:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
             LOGGER.error(
                 "Influx write failed",
                 extra={
-                    "status_code": getattr(getattr(exc, "response", None), "status_code", None),
+                    "status_code": status,
                     "response_body": getattr(getattr(exc, "response", None), "text", None),
                 },
             )
-            raise InfluxWriteError("Failed to write points to InfluxDB") from exc
+            raise InfluxWriteError("Failed to write points to InfluxDB", status) from exc
+
+    async def awrite_points(self, points: Iterable[Point]) -> None:
+        """Coroutine variant of :meth:`write_points` running on the event loop."""
+
+        body = _encode_lines(points, self.precision)
+        if body is not None:
+            await self.awrite_lines(body)
+
+    async def awrite_lines(self, body: bytes) -> None:
+        """Write an already encoded line-protocol ``body`` in this writer's precision."""
+
+        try:
+            response = await self.pool.arequest(
+                "POST",
+                f"{self.url}/api/v2/write",
+                params=self._params(),
+                data=self._payload(body),
+                headers=self._headers(),
+                timeout=10,
+                verify=self.verify_tls,
+            )
+            response.raise_for_status()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            status = getattr(exc, "status", None)
+            LOGGER.error(
+                "Influx write failed",
+                extra={
+                    "status_code": status,
+                    "response_body": getattr(exc, "message", None),
+                },
+            )
+            raise InfluxWriteError("Failed to write points to InfluxDB", status) from exc
+
+    def _params(self) -> Dict[str, str]:
+        return {"org": self.org, "bucket": self.bucket, "precision": self.precision}
+
+    def _payload(self, body: bytes) -> bytes:
+        # Level 1 already shrinks repetitive line protocol several times over at a fraction
+        # of the CPU cost of the default level 9.
+        return gzip.compress(body, compresslevel=1, mtime=0) if self.compress else body
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "text/plain"}
+        if self.compress:
+            headers["Content-Encoding"] = "gzip"
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+        return headers
 
     def close(self) -> None:  # pragma: no cover
         return
+
+
+def _retryable(exc: Exception) -> bool:
+    return not isinstance(exc, InfluxWriteError) or exc.retryable
+
+
+class Destination:
+    """One InfluxDB endpoint fed by :class:`BatchWriter`, with its own queue and retry state.
+
+    Encoded batches wait in a queue bounded at ``max_points``; bodies that do not fit are
+    dropped and counted. :meth:`run` sends them in order, retrying each a few times
+    before giving it up, so a slow or unreachable endpoint only ever backs up its own queue.
+
+    With a ``spool``, bodies that exhaust their retries are appended to disk instead of
+    dropped, and :meth:`run` also replays the spool at up to ``replay_rate`` bytes per
+    second. Replay pauses while live writes are failing or live bodies are waiting, so
+    the backlog never delays current data.
+
+    Only outages are retried and spooled. A body InfluxDB rejects outright (a 4xx other
+    than 429) is dropped at once and counted as ``failed``; a spooled one is skipped.
+    """
+
+    def __init__(
+        self,
+        writer: InfluxWriter,
+        name: str = "default",
+        max_points: int = 100_000,
+        attempts: int = 3,
+        backoff: float = 1.0,
+        spool: Optional[WriteSpool] = None,
+        replay_rate: float = 1024 * 1024,
+        idle: float = 1.0,
+    ) -> None:
+        self.writer = writer
+        self.name = name
+        self.max_points = max_points
+        self.attempts = attempts
+        self.backoff = backoff
+        self.spool = spool
+        self.replay_rate = replay_rate
+        self.idle = idle
+        self._queue: Deque[Tuple[bytes, int]] = deque()
+        self._queued_points = 0
+        self._ready = asyncio.Event()
+        self._healthy = asyncio.Event()
+        self._healthy.set()
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.spooled = 0
+        self.batches = 0
+
+    def put(self, body: bytes, count: int) -> None:
+        """Queue an encoded ``body`` holding ``count`` points."""
+
+        if self._queued_points + count > self.max_points:
+            self.dropped += count
+            return
+        self._queue.append((body, count))
+        self._queued_points += count
+        self._ready.set()
+
+    async def run(self) -> None:
+        if self.spool is None:
+            await self._send_loop()
+        else:
+            await asyncio.gather(self._send_loop(), self._replay_loop(self.spool))
+
+    async def flush(self) -> None:
+        while self._queue:
+            await self._send_next()
+
+    def status(self) -> Dict[str, float]:
+        status = {
+            "queue_depth": float(self._queued_points),
+            "dropped": float(self.dropped),
+            "written": float(self.written),
+            "failed": float(self.failed),
+            "batches": float(self.batches),
+        }
+        if self.spool is not None:
+            status["spooled_points"] = float(self.spooled)
+            status.update({f"spool_{key}": value for key, value in self.spool.status().items()})
+        return status
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._ready.wait()
+            await self._send_next()
+
+    async def _replay_loop(self, spool: WriteSpool) -> None:
+        while True:
+            await self._healthy.wait()
+            if self._queue:
+                await asyncio.sleep(self.idle)
+                continue
+            body = await asyncio.to_thread(spool.peek)
+            if body is None:
+                await asyncio.sleep(self.idle)
+                continue
+            try:
+                await self.writer.awrite_lines(body)
+            except Exception as exc:  # noqa: BLE001
+                if not _retryable(exc):
+                    LOGGER.error(
+                        "Skipping spooled batch rejected by %s (HTTP %s)",
+                        self.name,
+                        getattr(exc, "status", None),
+                    )
+                    await asyncio.to_thread(spool.ack, body)
+                    continue
+                LOGGER.warning("Spool replay to %s failed; retrying later: %s", self.name, exc)
+                await asyncio.sleep(self.backoff * 2 ** self.attempts)
+                continue
+            await asyncio.to_thread(spool.ack, body)
+            await asyncio.sleep(len(body) / self.replay_rate)
+
+    async def _send_next(self) -> None:
+        # The body stays queued until it is settled, so a shutdown that cancels the send
+        # still finds it for the final flush.
+        body, count = self._queue[0]
+        await self._send(body, count)
+        self._queue.popleft()
+        self._queued_points -= count
+        if not self._queue:
+            self._ready.clear()
+
+    async def _send(self, body: bytes, count: int) -> None:
+        for attempt in range(1, self.attempts + 1):
+            try:
+                await self.writer.awrite_lines(body)
+            except Exception as exc:  # noqa: BLE001
+                if not _retryable(exc):
+                    self.failed += count
+                    LOGGER.error(
+                        "Dropping %d points rejected by %s (HTTP %s)",
+                        count,
+                        self.name,
+                        getattr(exc, "status", None),
+                    )
+                    return
+                if attempt == self.attempts:
+                    self._healthy.clear()
+                    await self._give_up(body, count, exc)
+                    return
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            else:
+                self._healthy.set()
+                self.written += count
+                self.batches += 1
+                return
+
+    async def _give_up(self, body: bytes, count: int, exc: Exception) -> None:
+        if self.spool is not None:
+            try:
+                await asyncio.to_thread(self.spool.append, body)
+            except OSError as spool_exc:
+                LOGGER.error("Could not spool %d points for %s: %s", count, self.name, spool_exc)
+            else:
+                self.spooled += count
+                LOGGER.warning(
+                    "Spooled %d points for %s after failed writes: %s", count, self.name, exc
+                )
+                return
+        self.failed += count
+        LOGGER.error("Dropping %d points for %s after failed writes: %s", count, self.name, exc)
+
+
+class BatchWriter:
+    """Queue points in memory and write them to one or more InfluxDB destinations.
+
+    ``submit`` never waits on the network: it stamps points that carry no timestamp yet
+    and appends them to a queue bounded at ``max_points``, dropping (and counting) what
+    does not fit. :meth:`run` takes a batch as soon as ``batch_size`` points are queued or
+    the oldest queued point has waited ``linger`` seconds, encodes it once and hands the
+    same bytes to every :class:`Destination`, each of which sends on its own. Because points
+    keep their collection timestamp, late and retried writes still land at the right time.
+
+    Destinations share one encoding, so they must use the same precision.
+    """
+
+    def __init__(
+        self,
+        destinations: Sequence[Destination],
+        batch_size: int = 5_000,
+        linger: float = 1.0,
+        max_points: int = 100_000,
+    ) -> None:
+        if not destinations:
+            raise ValueError("BatchWriter needs at least one destination")
+        if len({destination.writer.precision for destination in destinations}) > 1:
+            raise ValueError("All InfluxDB destinations must use the same precision")
+        self.destinations = list(destinations)
+        self.precision = self.destinations[0].writer.precision
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_points = max_points
+        self._queue: Deque[Point] = deque()
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self.dropped = 0
+
+    def submit(self, points: Iterable[Point], timestamp: Optional[int] = None) -> None:
+        """Queue ``points``, stamping unstamped ones with ``timestamp`` (default: now)."""
+
+        stamp = time.time_ns() if timestamp is None else timestamp
+        for point in points:
+            if not point.fields:
+                continue
+            if len(self._queue) >= self.max_points:
+                self.dropped += 1
+                continue
+            if point.time is None:
+                point.time = stamp
+            self._queue.append(point)
+        if self._queue:
+            self._ready.set()
+        if len(self._queue) >= self.batch_size:
+            self._full.set()
+
+    async def run(self) -> None:
+        await asyncio.gather(
+            self._batch_loop(), *(destination.run() for destination in self.destinations)
+        )
+
+    async def flush(self) -> None:
+        """Encode everything queued so far and wait until every destination has sent it."""
+
+        while self._queue:
+            self._dispatch()
+        await asyncio.gather(*(destination.flush() for destination in self.destinations))
+
+    async def aclose(self, task: Optional[asyncio.Task[None]] = None) -> None:
+        """Stop the background ``task`` (if any) and flush what is still queued."""
+
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    def status(self) -> Dict[str, Dict[str, float]]:
+        """Health counters per destination name.
+
+        Points still waiting to be batched count towards every destination's
+        ``queue_depth``, and points dropped before batching towards every ``dropped``.
+        """
+
+        statuses: Dict[str, Dict[str, float]] = {}
+        for destination in self.destinations:
+            status = destination.status()
+            status["queue_depth"] += len(self._queue)
+            status["dropped"] += self.dropped
+            statuses[destination.name] = status
+        return statuses
+
+    async def _batch_loop(self) -> None:
+        while True:
+            await self._ready.wait()
+            if len(self._queue) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.linger)
+                except asyncio.TimeoutError:
+                    pass
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        count = min(len(self._queue), self.batch_size)
+        batch: List[Point] = [self._queue.popleft() for _ in range(count)]
+        if not self._queue:
+            self._ready.clear()
+        if len(self._queue) < self.batch_size:
+            self._full.clear()
+        body = _encode_lines(batch, self.precision)
+        if body is None:
+            return
+        for destination in self.destinations:
+            destination.put(body, count)
@@ -5,36 +5,74 @@ from __future__ import annotations
 import argparse
 import asyncio
 import logging
+import multiprocessing
+import threading
 import time
-from typing import Dict, List, Optional
+from array import array
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Coroutine, List, Optional
 
-import requests
-from requests import RequestException
+import aiohttp
 from tenacity import RetryError, retry, stop_after_attempt, wait_exponential
 
+from .aggregation import WindowAggregator
 from .autodetect import find_cookie, format_cookie_auth
-from .bitcoin_rpc import BitcoinRPC
+from .bitcoin_rpc import BitcoinRPC, RPCError, RPCRequest
+from .block_content import analyze_block
+from .block_decoder import decode_block, header_hash, header_time
+from .cardinality import CardinalityGovernor
 from .config import CollectorConfig, load_config
 from .fulcrum_client import FulcrumClient
 from .geoip import GeoIPResolver
-from .influx import InfluxWriter, Point
+from .http_pool import ConnectionPool
+from .influx import BatchWriter, Destination, InfluxWriter, Point
+from .mempool_mirror import MempoolMirror
 from .metrics import (
+    BlockIntervalTracker,
+    BlockLatencyTracker,
     FeeBucket,
+    FeeHistogram,
     ReorgTracker,
     bucket_mempool_histogram,
+    create_aggregation_points,
+    create_block_content_points,
+    create_block_latency_points,
+    create_block_points,
     create_blockchain_points,
+    create_cardinality_points,
+    create_http_pool_points,
+    create_influx_writer_points,
+    create_mempool_hist_points,
+    create_mempool_mirror_points,
     create_mempool_points,
     create_peer_geo_points,
     create_peer_points,
+    create_prometheus_points,
+    create_rpc_cache_points,
+    create_rpc_points,
+    create_tx_confirmation_points,
+    create_tx_rate_points,
+    log_spaced_edges,
     peers_metrics,
 )
 from .process_metrics import collect_disk_usage, collect_process_metrics
-from .zmq_listener import ZMQListener
+from .prometheus import MetricRegistry, PrometheusExporter
+from .rpc_cache import RPCCache
+from .spool import WriteSpool, adopt_segments
+from .tx_confirmation import ConfirmationTracker
+from .tx_rate import TxRateEngine
+from .zmq_listener import AsyncZMQListener, ZMQListener
 
 LOGGER = logging.getLogger(__name__)
 
+HIST_BATCH_SIZE = 8192
 
-def _build_rpc(config: CollectorConfig) -> BitcoinRPC:
+# Blocks queued for content analysis beyond one per worker; further blocks are dropped.
+BLOCK_CONTENT_BACKLOG = 2
+
+
+def _build_rpc(config: CollectorConfig, pool: Optional[ConnectionPool] = None) -> BitcoinRPC:
     cookie = None
     if not config.bitcoin_rpc_user and not config.bitcoin_rpc_password:
         # Prefer an explicit cookie path override before inspecting the datadir.
@@ -45,15 +83,21 @@ def _build_rpc(config: CollectorConfig) -> BitcoinRPC:
             if cookie_path:
                 cookie = format_cookie_auth(cookie_path)
     url = f"http://{config.bitcoin_rpc_host}:{config.bitcoin_rpc_port}"
+    if pool is not None:
+        pool.configure(url, config.bitcoin_rpc_pool_size)
+    cache = RPCCache(config.bitcoin_rpc_cache_ttl) if config.bitcoin_rpc_cache_ttl > 0 else None
     return BitcoinRPC(
         url=url,
         username=config.bitcoin_rpc_user,
         password=config.bitcoin_rpc_password,
         cookie=cookie,
+        pool=pool,
+        cache=cache,
+        rest_methods=config.bitcoin_rest_methods,
     )
 
 
-def _build_influx(config: CollectorConfig) -> InfluxWriter:
+def _build_influx(config: CollectorConfig, pool: Optional[ConnectionPool] = None) -> InfluxWriter:
     token = config.influx_token or _read_token_file()
     return InfluxWriter(
         url=config.influx_url,
@@ -61,9 +105,67 @@ def _build_influx(config: CollectorConfig) -> InfluxWriter:
         org=config.influx_org,
         bucket=config.influx_bucket,
         verify_tls=config.influx_tls_verify,
+        pool=pool,
+        precision=config.influx_precision,
+        compress=config.influx_gzip,
     )
 
 
+def _unwrap(result: Any) -> Any:
+    """Raise a batch entry that failed on the node, otherwise return it."""
+
+    if isinstance(result, RPCError):
+        raise result
+    return result
+
+
+def _fee_rate(result: Any) -> float:
+    """Convert an ``estimatesmartfee`` batch entry from BTC/kvB to sat/vB."""
+
+    if not isinstance(result, dict):
+        return 0.0
+    fee = result.get("feerate")
+    try:
+        return float(fee * 1e8 / 1000) if fee else 0.0
+    except TypeError:
+        return 0.0
+
+
+def _build_destinations(
+    config: CollectorConfig, pool: Optional[ConnectionPool] = None
+) -> List[Destination]:
+    """Build one :class:`Destination` per resolved InfluxDB destination.
+
+    Each destination spools to its own subdirectory of ``INFLUX_SPOOL_DIR``. Segments left at
+    the top of the directory by older releases are handed to the ``default`` destination,
+    or to the first one when ``INFLUX_DESTINATIONS`` names no ``default``.
+    """
+
+    destinations: List[Destination] = []
+    configs = config.destination_configs()
+    if config.enable_influx and config.influx_spool_dir:
+        heir = "default" if "default" in configs else next(iter(configs))
+        adopt_segments(config.influx_spool_dir, Path(config.influx_spool_dir) / heir)
+    for name, destination_config in configs.items():
+        spool = None
+        if config.enable_influx and config.influx_spool_dir:
+            spool = WriteSpool(
+                Path(config.influx_spool_dir) / name,
+                max_bytes=config.influx_spool_max_bytes,
+                segment_bytes=config.influx_spool_segment_bytes,
+            )
+        destinations.append(
+            Destination(
+                _build_influx(destination_config, pool),
+                name=name,
+                max_points=config.influx_queue_size,
+                spool=spool,
+                replay_rate=config.influx_spool_replay_rate,
+            )
+        )
+    return destinations
+
+
 def _read_token_file() -> str:
     try:
         with open("/var/lib/influxdb2/.influxdbv2/token", "r", encoding="utf-8") as handle:
@@ -72,64 +174,200 @@ def _read_token_file() -> str:
         return ""
 
 
-class CollectorService:
-    def __init__(self, config: CollectorConfig) -> None:
+class NodeCollector:
+    """Scrapes one bitcoind instance and tags every point it produces with the node name.
+
+    Clients that only talk to this node (RPC, ZMQ, Fulcrum, the mempool mirror) live here;
+    the HTTP pool, GeoIP databases and the block analysis ``executor`` are owned by
+    :class:`CollectorService` and shared.
+    Points derived from ZMQ events are handed to ``publish`` as soon as they are built
+    instead of waiting for the next scrape, and every new block is announced to
+    ``on_block`` with its hash. Both may be called from a ZMQ listener thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: CollectorConfig,
+        http: ConnectionPool,
+        geoip: GeoIPResolver,
+        publish: Optional[Callable[[List[Point]], None]] = None,
+        on_block: Optional[Callable[[NodeCollector, str], None]] = None,
+        executor: Optional[Executor] = None,
+        analysis_slots: Optional[threading.BoundedSemaphore] = None,
+        tag_node: bool = True,
+    ) -> None:
+        self.name = name
+        self.tag_node = tag_node
         self.config = config
-        self.rpc = _build_rpc(config)
-        self.influx = _build_influx(config)
+        self.http = http
+        self.geoip = geoip
+        self.publish = publish
+        self.on_block = on_block
+        self.executor = executor
+        self.analysis_slots = analysis_slots
+        self.block_content_dropped = 0
+        self.rpc = _build_rpc(config, http)
+        self._rpc_stats_reported = False
         self.reorg_tracker = ReorgTracker()
-        self.zmq_listener: Optional[ZMQListener]
+        self.hist_edges = log_spaced_edges(
+            config.mempool_hist_min_feerate,
+            config.mempool_hist_max_feerate,
+            config.mempool_hist_buckets_per_decade,
+        )
+        self.mempool_mirror: Optional[MempoolMirror] = None
+        if config.mempool_hist_source == "zmq_mirror":
+            self.mempool_mirror = MempoolMirror(self.hist_edges)
+        self.block_intervals: Optional[BlockIntervalTracker] = None
+        if config.enable_zmq and config.enable_block_intervals:
+            self.block_intervals = BlockIntervalTracker()
+        self.tx_rates: Optional[TxRateEngine] = None
+        if config.enable_zmq and config.enable_tx_rate:
+            self.tx_rates = TxRateEngine()
+        self.confirmations: Optional[ConfirmationTracker] = None
+        if config.enable_zmq and config.enable_tx_confirmation:
+            self.confirmations = ConfirmationTracker(config.tx_confirmation_max_entries)
+        self.block_latency: Optional[BlockLatencyTracker] = None
+        if config.enable_zmq and config.enable_block_latency:
+            self.block_latency = BlockLatencyTracker()
+        self.zmq_listener: Optional[ZMQListener | AsyncZMQListener]
         if config.enable_zmq:
-            self.zmq_listener = ZMQListener(
-                {
-                    "rawblock": config.bitcoin_zmq_rawblock,
-                    "rawtx": config.bitcoin_zmq_rawtx,
-                }
-            )
+            endpoints = {
+                "rawblock": config.bitcoin_zmq_rawblock,
+                "rawtx": config.bitcoin_zmq_rawtx,
+            }
+            if self.mempool_mirror is not None:
+                endpoints["sequence"] = config.bitcoin_zmq_sequence
+            buffers = {
+                "rcvhwm": config.zmq_rcvhwm,
+                "rcvbuf": config.zmq_rcvbuf,
+                "queue_size": config.zmq_queue_size,
+            }
+            if config.zmq_listener_mode == "asyncio":
+                # Block decoding takes milliseconds; keep it off the event loop.
+                self.zmq_listener = AsyncZMQListener(
+                    endpoints,
+                    callback=self._on_zmq_message,
+                    blocking_topics={"rawblock"},
+                    **buffers,
+                )
+            else:
+                self.zmq_listener = ZMQListener(
+                    endpoints, callback=self._on_zmq_message, **buffers
+                )
         else:
             self.zmq_listener = None
-        self.geoip = GeoIPResolver()
         self.fulcrum: Optional[FulcrumClient]
         if config.fulcrum_stats_url.strip():
-            self.fulcrum = FulcrumClient(config.fulcrum_stats_url)
+            self.fulcrum = FulcrumClient(config.fulcrum_stats_url, pool=http)
         else:
             self.fulcrum = None
 
-    async def start(self) -> None:
+    def start(self) -> None:
         if self.zmq_listener:
-            LOGGER.info("Starting ZMQ listener")
+            LOGGER.info("Starting ZMQ listener", extra={"node": self.name})
             self.zmq_listener.start()
         else:
-            LOGGER.info("ZMQ listener disabled; skipping subscription")
-        fast_task = asyncio.create_task(self._fast_loop())
-        slow_task = asyncio.create_task(self._slow_loop())
-        await asyncio.gather(fast_task, slow_task)
-
-    async def _fast_loop(self) -> None:
-        while True:
-            start = time.time()
-            try:
-                await asyncio.to_thread(self.collect_fast)
-            except Exception as exc:  # noqa: BLE001
-                LOGGER.exception("Fast loop error: %s", exc)
-            elapsed = time.time() - start
-            await asyncio.sleep(max(0, self.config.scrape_interval_fast - elapsed))
+            LOGGER.info("ZMQ listener disabled; skipping subscription", extra={"node": self.name})
+
+    def _on_zmq_message(self, topic: str, body: memoryview) -> None:
+        if topic == "sequence" and self.mempool_mirror is not None:
+            self.mempool_mirror.handle_notification(body)
+        elif topic == "rawtx":
+            if self.tx_rates is not None:
+                self.tx_rates.record(body)
+            if self.confirmations is not None:
+                self.confirmations.record(body)
+        elif topic == "rawblock":
+            if self.on_block is not None or self.block_latency is not None:
+                try:
+                    block_hash = header_hash(body)
+                except ValueError as exc:
+                    LOGGER.warning("Ignoring rawblock: %s", exc, extra={"node": self.name})
+                    return
+                if self.block_latency is not None:
+                    self.block_latency.record_arrival(block_hash, header_time(body))
+                if self.on_block is not None:
+                    self.on_block(self, block_hash)
+            if self.block_intervals is not None:
+                self._on_rawblock(body)
+            if self.confirmations is not None:
+                self._on_confirmations(body)
+            if self.executor is not None:
+                self._submit_block_content(body)
+
+    def _on_rawblock(self, body: memoryview) -> None:
+        assert self.block_intervals is not None
+        arrival = time.time()
+        try:
+            block = decode_block(body)
+        except ValueError as exc:
+            LOGGER.warning("Could not decode rawblock: %s", exc, extra={"node": self.name})
+            return
+        timings = self.block_intervals.update(block, arrival)
+        if self.publish is not None:
+            self.publish(self._tag(create_block_points(self.config, block, timings)))
+
+    def _submit_block_content(self, body: memoryview) -> None:
+        assert self.executor is not None
+        # Every queued analysis holds a copy of its block, so bound how many are in flight.
+        if self.analysis_slots is not None and not self.analysis_slots.acquire(blocking=False):
+            self.block_content_dropped += 1
+            LOGGER.debug("Block content analysis busy; dropping block", extra={"node": self.name})
+            return
+        try:
+            # The view dies with this callback; the worker needs its own copy anyway.
+            future = self.executor.submit(analyze_block, bytes(body))
+        except BaseException:
+            if self.analysis_slots is not None:
+                self.analysis_slots.release()
+            raise
+        future.add_done_callback(self._on_block_content)
+
+    def _on_block_content(self, future: Future[array]) -> None:
+        if self.analysis_slots is not None:
+            self.analysis_slots.release()
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            LOGGER.warning("Block content analysis failed: %s", exc, extra={"node": self.name})
+            return
+        if self.publish is not None:
+            points = create_block_content_points(
+                self.config, future.result(), self.block_content_dropped
+            )
+            self.publish(self._tag(points))
 
-    async def _slow_loop(self) -> None:
-        while True:
-            start = time.time()
-            try:
-                await asyncio.to_thread(self.collect_slow)
-            except Exception as exc:  # noqa: BLE001
-                LOGGER.exception("Slow loop error: %s", exc)
-            elapsed = time.time() - start
-            await asyncio.sleep(max(0, self.config.scrape_interval_slow - elapsed))
+    def _on_confirmations(self, body: memoryview) -> None:
+        assert self.confirmations is not None
+        mirror = self.mempool_mirror
+        bands = self.confirmations.confirm(body, mirror.fee_rates if mirror else None)
+        if not bands or self.publish is None:
+            return
+        bands["all"].update(self.confirmations.status())
+        self.publish(self._tag(create_tx_confirmation_points(self.config, bands)))
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def collect_fast(self) -> None:
-        LOGGER.debug("Collecting fast metrics")
-        blockchain_info = self.rpc.get_blockchain_info()
+    async def collect_fast(self) -> List[Point]:
+        LOGGER.debug("Collecting fast metrics", extra={"node": self.name})
+        # The batch and the histogram source are independent, so await them together.
+        batch, hist_points = await asyncio.gather(
+            self.rpc.abatch(
+                [
+                    ("getblockchaininfo", []),
+                    ("getmempoolinfo", []),
+                    ("estimatesmartfee", [3]),
+                    ("estimatesmartfee", [6]),
+                ]
+            ),
+            self._collect_mempool_histogram(),
+        )
+        blockchain_result, mempool_result, fee_fast, fee_slow = batch
+        blockchain_info = _unwrap(blockchain_result)
         reorg_depth = self.reorg_tracker.update(blockchain_info.get("blocks", 0))
+        if self.block_latency is not None:
+            self.block_latency.observe_tip(blockchain_info.get("bestblockhash"))
         points: List[Point] = []
         zmq_status = self.zmq_listener.status() if self.zmq_listener else {}
         points.extend(
@@ -141,130 +379,409 @@ class CollectorService:
             )
         )
 
-        mempool_info = self.rpc.get_mempool_info()
+        mempool_info = _unwrap(mempool_result)
         fee_estimates = {
-            "fast": self._estimate_fee(3),
-            "slow": self._estimate_fee(6),
+            "fast": _fee_rate(fee_fast),
+            "slow": _fee_rate(fee_slow),
         }
         points.extend(create_mempool_points(self.config, mempool_info, fee_estimates))
-
-        hist_points = self._collect_mempool_histogram()
         points.extend(hist_points)
-
-        self.influx.write_points(points)
+        if self.tx_rates is not None:
+            points.extend(create_tx_rate_points(self.config, self.tx_rates.snapshot()))
+        if self.block_latency is not None:
+            summary = self.block_latency.summary()
+            points.extend(create_block_latency_points(self.config, summary))
+        return self._tag(points)
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def collect_slow(self) -> None:
-        LOGGER.debug("Collecting slow metrics")
+    async def collect_slow(self) -> List[Point]:
+        LOGGER.debug("Collecting slow metrics", extra={"node": self.name})
+        self._rpc_stats_reported = False
         points: List[Point] = []
+        calls: List[RPCRequest] = []
         if self.config.enable_peer_quality:
-            peers = self.rpc.get_peer_info()
+            calls.append(("getpeerinfo", []))
+        batch, disk_points, fulcrum_points = await asyncio.gather(
+            self.rpc.abatch(calls),
+            asyncio.to_thread(self._collect_disk_points),
+            self._collect_fulcrum(),
+        )
+        results = dict(zip((method for method, _ in calls), batch, strict=True))
+
+        if "getpeerinfo" in results:
+            peers = _unwrap(results["getpeerinfo"])
             summary = peers_metrics(peers)
             points.extend(create_peer_points(self.config, summary))
             if self.config.enable_asn_stats:
                 points.extend(create_peer_geo_points(self.config, peers, self.geoip))
 
-        if self.config.enable_process_metrics:
-            proc = collect_process_metrics()
-            if proc is None:
-                LOGGER.debug("Skipping process metrics; process not found")
-            else:
-                points.append(
-                    Point("process")
-                    .tag("name", "bitcoind")
-                    .field("cpu_percent", proc["cpu_percent"])
-                    .field("memory_rss_mb", proc["memory_rss_mb"])
-                    .field("open_files", proc["open_files"])
-                )
-
-        if self.config.enable_disk_io:
-            if self.config.bitcoin_chainstate_dir:
-                disk = collect_disk_usage(self.config.bitcoin_chainstate_dir)
-                if disk is None:
-                    LOGGER.debug(
-                        "Skipping filesystem metrics; chainstate path unavailable",
-                        extra={"path": self.config.bitcoin_chainstate_dir},
-                    )
-                else:
-                    points.append(
-                        Point("filesystem")
-                        .tag("path", self.config.bitcoin_chainstate_dir)
-                        .field("chainstate_gb", disk["used_gb"])
-                        .field("free_percent", disk["free_percent"])
-                    )
-            else:
-                LOGGER.debug("Disk utilisation disabled; no chainstate path configured")
+        points.extend(disk_points)
+        points.extend(fulcrum_points)
+        if self.rpc.cache is not None:
+            points.extend(create_rpc_cache_points(self.rpc.cache.status()))
+        points.extend(create_rpc_points(self.rpc.stats.snapshot()))
+        self._rpc_stats_reported = True
+        return self._tag(points)
+
+    def rpc_stats_submitted(self) -> None:
+        """Reset RPC stats once this scrape's ``collector_rpc`` points were submitted.
+
+        A scrape that failed before reporting them leaves them for the next snapshot.
+        """
+
+        if self._rpc_stats_reported:
+            self.rpc.stats.reset()
+            self._rpc_stats_reported = False
+
+    def _tag(self, points: List[Point]) -> List[Point]:
+        if not self.tag_node:
+            return points
+        for point in points:
+            point.tag("node", self.name)
+        return points
 
-        if self.fulcrum:
-            try:
-                fulcrum = self.fulcrum.fetch()
-                height = fulcrum.get("tip_height")
-                if height is None:
-                    height = fulcrum.get("daemon_height", 0)
-                clients = fulcrum.get("clients", 0)
-                if isinstance(clients, dict):
-                    clients = sum(
-                        value for value in clients.values() if isinstance(value, (int, float))
-                    )
-                try:
-                    point = (
-                        Point("fulcrum")
-                        .field("tip_height", float(height))
-                        .field("clients", float(clients))
-                    )
-                except (TypeError, ValueError):
-                    LOGGER.debug("Fulcrum stats malformed; skipping point")
-                else:
-                    points.append(point)
-            except RequestException:
-                LOGGER.debug("Fulcrum stats unavailable")
-
-        self.influx.write_points(points)
-
-    def _estimate_fee(self, blocks: int) -> float:
+    def _collect_disk_points(self) -> List[Point]:
+        if not self.config.enable_disk_io:
+            return []
+        if not self.config.bitcoin_chainstate_dir:
+            LOGGER.debug("Disk utilisation disabled; no chainstate path configured")
+            return []
+        disk = collect_disk_usage(self.config.bitcoin_chainstate_dir)
+        if disk is None:
+            LOGGER.debug(
+                "Skipping filesystem metrics; chainstate path unavailable",
+                extra={"path": self.config.bitcoin_chainstate_dir},
+            )
+            return []
+        return [
+            Point("filesystem")
+            .tag("path", self.config.bitcoin_chainstate_dir)
+            .field("chainstate_gb", disk["used_gb"])
+            .field("free_percent", disk["free_percent"])
+        ]
+
+    async def _collect_fulcrum(self) -> List[Point]:
+        if not self.fulcrum:
+            return []
         try:
-            result = self.rpc.estimatesmartfee(blocks)
-            fee = result.get("feerate")
-            return float(fee * 1e8 / 1000) if fee else 0.0
-        except Exception:  # noqa: BLE001
-            return 0.0
+            fulcrum = await self.fulcrum.afetch()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            LOGGER.debug("Fulcrum stats unavailable")
+            return []
+        height = fulcrum.get("tip_height")
+        if height is None:
+            height = fulcrum.get("daemon_height", 0)
+        clients = fulcrum.get("clients", 0)
+        if isinstance(clients, dict):
+            clients = sum(value for value in clients.values() if isinstance(value, (int, float)))
+        try:
+            point = (
+                Point("fulcrum")
+                .field("tip_height", float(height))
+                .field("clients", float(clients))
+            )
+        except (TypeError, ValueError):
+            LOGGER.debug("Fulcrum stats malformed; skipping point")
+            return []
+        return [point]
 
-    def _collect_mempool_histogram(self) -> List[Point]:
+    async def _collect_mempool_histogram(self) -> List[Point]:
         if self.config.mempool_hist_source == "none":
             return []
         hist: List[FeeBucket]
-        if self.config.mempool_hist_source == "core_rawmempool":
-            raw = self.rpc.get_raw_mempool(True)
-            buckets: Dict[str, int] = {}
-            for tx in raw.values():
-                fee = tx.get("fees", {}).get("base", 0)
-                vsize = tx.get("vsize", 1) or 1
-                rate = (fee * 1e8) / vsize
-                bucket_key = f"{int(rate // 5) * 5}-{int(rate // 5) * 5 + 5}"
-                buckets[bucket_key] = buckets.get(bucket_key, 0) + 1
-            hist = bucket_mempool_histogram(buckets)
+        points: List[Point] = []
+        if self.mempool_mirror is not None:
+            await self.mempool_mirror.refresh(self.rpc)
+            hist = self.mempool_mirror.histogram()
+            points = create_mempool_mirror_points(self.config, self.mempool_mirror.status())
+        elif self.config.mempool_hist_source == "core_rawmempool":
+            histogram = FeeHistogram(self.hist_edges)
+            fees: array[int] = array("q")
+            vsizes: array[int] = array("q")
+            async for tx in self.rpc.aiter_raw_mempool():
+                fees.append(tx.fee)
+                vsizes.append(tx.vsize)
+                if len(fees) >= HIST_BATCH_SIZE:
+                    histogram.add_batch(fees, vsizes)
+                    del fees[:], vsizes[:]
+            histogram.add_batch(fees, vsizes)
+            hist = bucket_mempool_histogram(histogram)
         else:
             url = f"{self.config.mempool_api_base}/api/v1/fees/recommended"
             try:
-                response = requests.get(url, timeout=5)
+                response = await self.http.arequest("GET", url, timeout=5)
                 response.raise_for_status()
                 data = response.json()
                 hist = bucket_mempool_histogram(
                     {k: int(v) for k, v in data.items() if isinstance(v, (int, float))}
                 )
-            except requests.RequestException:
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
                 hist = []
-        points = []
-        for entry in hist:
-            point = Point("mempool_hist").tag("network", self.config.bitcoin_network)
-            points.append(point.field(entry["bucket"], entry["count"]))
+        points.extend(create_mempool_hist_points(self.config, hist))
         return points
 
+    async def aclose(self) -> None:
+        if isinstance(self.zmq_listener, AsyncZMQListener):
+            await self.zmq_listener.aclose()
+
     def close(self) -> None:
         if self.zmq_listener:
             self.zmq_listener.stop()
-        self.influx.close()
+
+
+class CollectorService:
+    """Runs the fast and slow scrape loops over every configured node.
+
+    Nodes are scraped concurrently; a failing node is logged and skipped without holding
+    back the others. Points are stamped with the scrape's start time and handed to a
+    :class:`BatchWriter`, so a slow or unreachable InfluxDB never delays a scrape. With
+    ``ENABLE_PROMETHEUS`` they also refresh a :class:`MetricRegistry` served on
+    ``/metrics``.
+    """
+
+    def __init__(self, config: CollectorConfig) -> None:
+        self.config = config
+        self.http = ConnectionPool(
+            pool_size=config.http_pool_size,
+            idle_timeout=config.http_idle_timeout,
+        )
+        self.writer = BatchWriter(
+            _build_destinations(config, self.http),
+            batch_size=config.influx_batch_size,
+            linger=config.influx_flush_interval,
+            max_points=config.influx_queue_size,
+        )
+        self._writer_task: Optional[asyncio.Task[None]] = None
+        self.governor: Optional[CardinalityGovernor] = None
+        if config.cardinality_budgets:
+            self.governor = CardinalityGovernor(
+                config.cardinality_budgets, ttl=config.cardinality_ttl
+            )
+        self.aggregator: Optional[WindowAggregator] = None
+        if config.enable_influx and config.aggregate_measurements:
+            self.aggregator = WindowAggregator(
+                config.aggregate_measurements,
+                window=config.aggregate_window,
+                quantiles=config.aggregate_quantiles,
+                keep_raw=config.aggregate_keep_raw,
+                max_series=config.aggregate_max_series,
+            )
+        self.registry: Optional[MetricRegistry] = None
+        self.exporter: Optional[PrometheusExporter] = None
+        if config.enable_prometheus:
+            self.registry = MetricRegistry(stale_after=config.prometheus_stale_after)
+            self.exporter = PrometheusExporter(
+                self.registry, config.prometheus_host, config.prometheus_port
+            )
+        self.geoip = GeoIPResolver()
+        self.executor: Optional[ProcessPoolExecutor] = None
+        if config.enable_zmq and config.enable_block_content:
+            # Spawned rather than forked: the parent runs ZMQ and asyncio threads.
+            self.executor = ProcessPoolExecutor(
+                max_workers=config.block_content_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._new_block = asyncio.Event()
+        on_block = self.notify_block if config.enable_event_scrape else None
+        # Shared by all nodes, like the pool it guards.
+        analysis_slots = (
+            threading.BoundedSemaphore(config.block_content_workers + BLOCK_CONTENT_BACKLOG)
+            if self.executor is not None
+            else None
+        )
+        self.nodes = [
+            NodeCollector(
+                name,
+                node_config,
+                self.http,
+                self.geoip,
+                publish=self.publish,
+                on_block=on_block,
+                executor=self.executor,
+                analysis_slots=analysis_slots,
+                # A single node keeps the untagged series written before BITCOIN_NODES existed.
+                tag_node=bool(config.bitcoin_nodes),
+            )
+            for name, node_config in config.node_configs().items()
+        ]
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        for node in self.nodes:
+            node.start()
+        if self.exporter is not None:
+            await self.exporter.start()
+        tasks = [asyncio.create_task(self._fast_loop()), asyncio.create_task(self._slow_loop())]
+        if self.config.enable_influx:
+            self._writer_task = asyncio.create_task(self.writer.run())
+            tasks.append(self._writer_task)
+        await asyncio.gather(*tasks)
+
+    async def _fast_loop(self) -> None:
+        while True:
+            start = time.time()
+            self._new_block.clear()
+            try:
+                await self.collect_fast()
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.exception("Fast loop error: %s", exc)
+            if self.config.enable_event_scrape:
+                await self._wait_for_block(start)
+            else:
+                elapsed = time.time() - start
+                await asyncio.sleep(max(0, self.config.scrape_interval_fast - elapsed))
+
+    async def _wait_for_block(self, start: float) -> None:
+        """Sleep until a node announces a block or the heartbeat interval has passed.
+
+        Blocks that arrive less than ``scrape_interval_fast`` after the previous scrape
+        started are coalesced into one scrape at the end of that interval, so catching up
+        on many blocks never polls bitcoind faster than the fixed-interval mode would.
+        """
+
+        elapsed = time.time() - start
+        try:
+            await asyncio.wait_for(
+                self._new_block.wait(),
+                timeout=max(0, self.config.scrape_interval_heartbeat - elapsed),
+            )
+        except asyncio.TimeoutError:
+            return
+        elapsed = time.time() - start
+        await asyncio.sleep(max(0, self.config.scrape_interval_fast - elapsed))
+
+    async def _slow_loop(self) -> None:
+        while True:
+            start = time.time()
+            try:
+                await self.collect_slow()
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.exception("Slow loop error: %s", exc)
+            elapsed = time.time() - start
+            await asyncio.sleep(max(0, self.config.scrape_interval_slow - elapsed))
+
+    async def collect_fast(self) -> None:
+        started = time.time_ns()
+        points = await self._gather_nodes("fast", [node.collect_fast() for node in self.nodes])
+        self._submit(points, started)
+
+    async def collect_slow(self) -> None:
+        started = time.time_ns()
+        points, host_points = await asyncio.gather(
+            self._gather_nodes("slow", [node.collect_slow() for node in self.nodes]),
+            # psutil only reads local procfs, but iterating processes still blocks.
+            asyncio.to_thread(self._collect_host_points),
+        )
+        points.extend(host_points)
+        points.extend(create_http_pool_points(self.http.stats()))
+        if self.config.enable_influx:
+            points.extend(create_influx_writer_points(self.writer.status()))
+        if self.governor is not None:
+            points.extend(create_cardinality_points(self.governor.status()))
+        if self.aggregator is not None:
+            points.extend(create_aggregation_points(self.aggregator.status()))
+        if self.registry is not None:
+            points.extend(create_prometheus_points(self.registry.status()))
+        self._submit(points, started)
+        for node in self.nodes:
+            node.rpc_stats_submitted()
+
+    async def _gather_nodes(
+        self, loop: str, scrapes: List[Coroutine[Any, Any, List[Point]]]
+    ) -> List[Point]:
+        results = await asyncio.gather(*scrapes, return_exceptions=True)
+        points: List[Point] = []
+        for node, result in zip(self.nodes, results, strict=True):
+            if isinstance(result, BaseException):
+                if len(self.nodes) == 1:
+                    raise result
+                LOGGER.error(
+                    "%s scrape failed for node %s: %s",
+                    loop.capitalize(),
+                    node.name,
+                    result,
+                    exc_info=result,
+                )
+                continue
+            points.extend(result)
+        return points
+
+    def publish(self, points: List[Point]) -> None:
+        """Queue event-driven points; safe to call from ZMQ listener threads."""
+
+        if self._loop is None or self._loop.is_closed():
+            return
+        # Stamp on arrival rather than when the loop gets around to queueing them.
+        self._loop.call_soon_threadsafe(self._submit, points, time.time_ns())
+
+    def _submit(self, points: List[Point], timestamp: int) -> None:
+        """Hand ``points`` to every enabled output: the Influx writer and the exporter."""
+
+        if self.governor is not None:
+            points = self.governor.apply(points)
+        if self.registry is not None:
+            self.registry.update(points)
+        if self.config.enable_influx:
+            if self.aggregator is not None:
+                points = self.aggregator.process(points, timestamp)
+            self.writer.submit(points, timestamp)
+
+    def notify_block(self, node: NodeCollector, block_hash: str) -> None:
+        """Trigger a fast scrape for a new block; safe to call from ZMQ listener threads."""
+
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._on_block, node, block_hash)
+
+    def _on_block(self, node: NodeCollector, block_hash: str) -> None:
+        LOGGER.debug("New block %s; scraping now", block_hash, extra={"node": node.name})
+        if node.rpc.cache is not None:
+            # Chain-state answers cached before the block arrived are stale now.
+            node.rpc.cache.note_best_block(block_hash)
+        self._new_block.set()
+
+    def _collect_host_points(self) -> List[Point]:
+        if not self.config.enable_process_metrics:
+            return []
+        proc = collect_process_metrics()
+        if proc is None:
+            LOGGER.debug("Skipping process metrics; process not found")
+            return []
+        return [
+            Point("process")
+            .tag("name", "bitcoind")
+            .field("cpu_percent", proc["cpu_percent"])
+            .field("memory_rss_mb", proc["memory_rss_mb"])
+            .field("open_files", proc["open_files"])
+        ]
+
+    async def aclose(self) -> None:
+        for node in self.nodes:
+            await node.aclose()
+        if self.exporter is not None:
+            await self.exporter.aclose()
+        if self.aggregator is not None:
+            # Partial windows are better than none when the collector stops.
+            self.writer.submit(self.aggregator.flush())
+        try:
+            await asyncio.wait_for(self.writer.aclose(self._writer_task), timeout=10)
+        except asyncio.TimeoutError:
+            for name, status in self.writer.status().items():
+                queued = int(status["queue_depth"])
+                LOGGER.warning("Gave up flushing %d queued points for %s", queued, name)
+        await self.http.aclose()
+        self.close()
+
+    def close(self) -> None:
+        for node in self.nodes:
+            node.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        for destination in self.writer.destinations:
+            destination.writer.close()
         self.geoip.close()
+        self.http.close()
 
 
 async def _run(config: CollectorConfig) -> None:
@@ -272,7 +789,7 @@ async def _run(config: CollectorConfig) -> None:
     try:
         await service.start()
     finally:
-        service.close()
+        await service.aclose()
 
 
 def _resolve_log_level(value: str) -> int:
@@ -304,7 +821,7 @@ def main() -> None:
     )
 
     if args.healthcheck:
-        LOGGER.info("Configuration loaded for %s", config.bitcoin_network)
+        LOGGER.info("Configuration loaded for %s", ", ".join(config.node_configs()))
         return
 
     try:
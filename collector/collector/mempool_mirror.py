@@ -0,0 +1,189 @@
+"""Local mempool mirror maintained from ZMQ ``sequence`` notifications."""
+
+from __future__ import annotations
+
+import logging
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Set
+
+from .bitcoin_rpc import BitcoinRPC, RPCError
+from .metrics import FeeBucket, FeeHistogram
+
+LOGGER = logging.getLogger(__name__)
+
+ENTRY_BATCH_SIZE = 500
+_VSIZE_BITS = 32
+_VSIZE_MASK = (1 << _VSIZE_BITS) - 1
+
+
+class MempoolMirror:
+    """Track the node's mempool incrementally instead of re-fetching it every scrape.
+
+    ``handle_notification`` is fed from the ZMQ listener thread. Removals are applied
+    immediately; additions only carry a txid, so they are queued and their fee and vsize
+    are fetched with one batched ``getmempoolentry`` call per ``refresh``. Each entry is
+    stored as a single packed integer and a running :class:`FeeHistogram` is kept, so reading
+    the histogram costs nothing and a scrape only pays for what changed.
+
+    Every add/remove bumps the node's mempool sequence number. A jump in that number means
+    notifications were lost and triggers a full resync from the streaming ``getrawmempool``
+    decoder. Connected blocks remove their transactions without individual notifications,
+    so their txids are fetched with ``getblock`` and the sequence baseline is reset.
+    """
+
+    def __init__(self, edges: Sequence[float]) -> None:
+        self._lock = threading.Lock()
+        self._edges = edges
+        self._entries: Dict[bytes, int] = {}
+        self._histogram = FeeHistogram(edges)
+        self._total_vsize = 0
+        self._pending: Dict[bytes, None] = {}
+        self._blocks: List[str] = []
+        self._expected_sequence: Optional[int] = None
+        self._needs_resync = True
+        self._resyncing = False
+        self._removed_during_resync: Set[bytes] = set()
+        self.gaps = 0
+        self.resyncs = 0
+
+    def handle_notification(self, body: bytes | memoryview) -> None:
+        if len(body) < 33:
+            return
+        txid = bytes(body[:32])
+        label = bytes(body[32:33])
+        with self._lock:
+            if label in (b"A", b"R") and len(body) >= 41:
+                (sequence,) = struct.unpack_from("<Q", body, 33)
+                self._check_sequence(sequence)
+                if label == b"A":
+                    self._pending[txid] = None
+                else:
+                    self._pending.pop(txid, None)
+                    self._remove(txid)
+                    if self._resyncing:
+                        self._removed_during_resync.add(txid)
+            elif label == b"C":
+                self._blocks.append(txid.hex())
+                # Block inclusion consumes sequence numbers without notifications.
+                self._expected_sequence = None
+            elif label == b"D":
+                self._needs_resync = True
+
+    async def refresh(self, rpc: BitcoinRPC) -> None:
+        """Apply queued work: a full resync after a gap, otherwise pending changes."""
+
+        if self._needs_resync:
+            await self._resync(rpc)
+            return
+        with self._lock:
+            blocks, self._blocks = self._blocks, []
+            pending = list(self._pending)
+        if blocks:
+            results = await rpc.abatch([("getblock", [block, 1]) for block in blocks])
+            with self._lock:
+                for block in results:
+                    if isinstance(block, RPCError):
+                        self._needs_resync = True
+                        continue
+                    for txid in block.get("tx", []):
+                        key = bytes.fromhex(txid)
+                        self._pending.pop(key, None)
+                        self._remove(key)
+        for start in range(0, len(pending), ENTRY_BATCH_SIZE):
+            chunk = pending[start : start + ENTRY_BATCH_SIZE]
+            results = await rpc.abatch([("getmempoolentry", [txid.hex()]) for txid in chunk])
+            with self._lock:
+                for txid, entry in zip(chunk, results, strict=True):
+                    # Skip entries removed while the batch was in flight.
+                    if txid not in self._pending:
+                        continue
+                    del self._pending[txid]
+                    if isinstance(entry, RPCError):
+                        continue
+                    fee = (entry.get("fees") or {}).get("base", 0) or 0
+                    self._insert(txid, round(fee * 100_000_000), int(entry.get("vsize") or 0))
+
+    def histogram(self) -> List[FeeBucket]:
+        with self._lock:
+            return self._histogram.buckets()
+
+    def fee_rates(self, txids: Sequence[bytes]) -> List[Optional[float]]:
+        """Return the fee rate in sat/vB of each txid, or None when it is not mirrored."""
+
+        rates: List[Optional[float]] = []
+        with self._lock:
+            for txid in txids:
+                packed = self._entries.get(txid)
+                vsize = 0 if packed is None else packed & _VSIZE_MASK
+                rates.append((packed >> _VSIZE_BITS) / vsize if packed and vsize else None)
+        return rates
+
+    def status(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "tx_count": float(len(self._entries)),
+                "vsize_mb": self._total_vsize / 1_000_000,
+                "pending": float(len(self._pending)),
+                "gaps": float(self.gaps),
+                "resyncs": float(self.resyncs),
+            }
+
+    async def _resync(self, rpc: BitcoinRPC) -> None:
+        LOGGER.info("Resynchronising mempool mirror from getrawmempool")
+        with self._lock:
+            self._resyncing = True
+            self._removed_during_resync.clear()
+            self._blocks.clear()
+            self._needs_resync = False
+        snapshot: Dict[bytes, int] = {}
+        try:
+            async for entry in rpc.aiter_raw_mempool():
+                snapshot[bytes.fromhex(entry.txid)] = _pack(entry.fee, entry.vsize)
+        except BaseException:
+            with self._lock:
+                self._needs_resync = True
+            raise
+        finally:
+            with self._lock:
+                self._resyncing = False
+        with self._lock:
+            for txid in self._removed_during_resync:
+                snapshot.pop(txid, None)
+            self._removed_during_resync.clear()
+            self._entries.clear()
+            self._histogram = FeeHistogram(self._edges)
+            self._total_vsize = 0
+            for txid, packed in snapshot.items():
+                self._pending.pop(txid, None)
+                self._insert(txid, packed >> _VSIZE_BITS, packed & _VSIZE_MASK)
+            self.resyncs += 1
+
+    def _check_sequence(self, sequence: int) -> None:
+        expected = self._expected_sequence
+        if expected is not None and sequence != expected:
+            LOGGER.warning(
+                "Mempool sequence gap detected",
+                extra={"expected": expected, "received": sequence},
+            )
+            self.gaps += 1
+            self._needs_resync = True
+        self._expected_sequence = sequence + 1
+
+    def _insert(self, txid: bytes, fee: int, vsize: int) -> None:
+        self._remove(txid)
+        self._entries[txid] = _pack(fee, vsize)
+        self._histogram.add(fee, vsize)
+        self._total_vsize += vsize
+
+    def _remove(self, txid: bytes) -> None:
+        packed = self._entries.pop(txid, None)
+        if packed is None:
+            return
+        fee, vsize = packed >> _VSIZE_BITS, packed & _VSIZE_MASK
+        self._histogram.remove(fee, vsize)
+        self._total_vsize -= vsize
+
+
+def _pack(fee: int, vsize: int) -> int:
+    return (max(fee, 0) << _VSIZE_BITS) | (vsize & _VSIZE_MASK)
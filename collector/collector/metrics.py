@@ -2,17 +2,42 @@
 
 from __future__ import annotations
 
-from collections import Counter
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict, deque
 from dataclasses import dataclass, field
 from decimal import Decimal
 from ipaddress import ip_address
 from numbers import Real
-from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, TypedDict
-
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NotRequired,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+)
+
+from .block_content import content_fields
+from .block_decoder import BlockSummary
 from .config import CollectorConfig
 from .geoip import GeoIPResolver
 from .influx import Point
 
+try:  # pragma: no cover
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
 
 @dataclass
 class ReorgTracker:
@@ -35,6 +60,106 @@ class ReorgTracker:
         return max(drops) if drops else 0
 
 
+@dataclass
+class BlockIntervalTracker:
+    """Derive inter-block timings from blocks as they arrive over ZMQ ``rawblock``."""
+
+    last_hash: Optional[str] = None
+    last_time: int = 0
+    last_arrival: Optional[float] = None
+
+    def update(self, block: BlockSummary, arrival: float) -> Dict[str, float]:
+        """Return timing fields for ``block`` received at wall-clock time ``arrival``.
+
+        ``interval_s`` compares header timestamps and is only reported when the block
+        builds on the previously seen one, so reorgs and missed blocks do not produce
+        bogus intervals. ``arrival_delay_s`` is how long after its header timestamp the
+        block reached this node.
+        """
+
+        timings = {"arrival_delay_s": arrival - block.time}
+        if self.last_hash is not None and block.prev_hash == self.last_hash:
+            timings["interval_s"] = float(block.time - self.last_time)
+        if self.last_arrival is not None:
+            timings["arrival_interval_s"] = arrival - self.last_arrival
+        self.last_hash = block.hash
+        self.last_time = block.time
+        self.last_arrival = arrival
+        return timings
+
+
+class BlockLatencyTracker:
+    """Compare when a block was mined, announced over ZMQ, and first reported as tip by RPC.
+
+    ``record_arrival`` is called from the ZMQ listener for every ``rawblock`` and
+    ``observe_tip`` from the fast scrape with the ``bestblockhash`` that also feeds
+    :class:`ReorgTracker`. Propagation delay (ZMQ arrival minus header ``time``) has to use
+    the wall clock and inherits miners' clock skew; the tip delay is measured with the
+    monotonic clock. Memory is bounded by ``max_pending`` blocks awaiting their tip report
+    and ``max_samples`` completed samples per distribution.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 16,
+        max_samples: int = 144,
+        clock: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_pending = max_pending
+        self._clock = clock
+        self._monotonic = monotonic
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[str, float] = OrderedDict()
+        self.propagation: Deque[float] = deque(maxlen=max_samples)
+        self.tip_delay: Deque[float] = deque(maxlen=max_samples)
+        self.superseded = 0
+
+    def record_arrival(self, block_hash: str, header_time: int) -> None:
+        arrival = self._monotonic()
+        propagation = self._clock() - header_time
+        with self._lock:
+            if block_hash in self._pending:
+                return
+            self._pending[block_hash] = arrival
+            self.propagation.append(propagation)
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+                self.superseded += 1
+
+    def observe_tip(self, block_hash: Optional[str]) -> None:
+        """Close out ``block_hash`` once RPC reports it as the best block."""
+
+        seen = self._monotonic()
+        with self._lock:
+            if not block_hash or block_hash not in self._pending:
+                return
+            # Blocks announced before the new tip were replaced before any scrape saw them.
+            while True:
+                pending_hash, arrival = self._pending.popitem(last=False)
+                if pending_hash == block_hash:
+                    break
+                self.superseded += 1
+            self.tip_delay.append(seen - arrival)
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            distributions = {"propagation_s": list(self.propagation)}
+            distributions["tip_delay_s"] = list(self.tip_delay)
+            fields = {
+                "blocks": float(len(self.propagation)),
+                "pending": float(len(self._pending)),
+                "superseded": float(self.superseded),
+            }
+        for name, values in distributions.items():
+            if not values:
+                continue
+            fields[f"{name}_p50"] = percentile(values, 0.5)
+            fields[f"{name}_p90"] = percentile(values, 0.9)
+            fields[f"{name}_max"] = max(values)
+        return fields
+
+
 def calculate_block_lag(headers: int, best: int) -> int:
     return max(headers - best, 0)
 
@@ -56,15 +181,104 @@ def percentile(values: Iterable[float], percent: float) -> float:
 class FeeBucket(TypedDict):
     bucket: str
     count: float
-
-
-def bucket_mempool_histogram(raw: Mapping[str, int]) -> List[FeeBucket]:
+    vsize: NotRequired[float]
+
+
+def log_spaced_edges(minimum: float, maximum: float, per_decade: int) -> List[float]:
+    """Return fee-rate bucket edges spaced evenly on a log scale.
+
+    Edges are rounded to three significant digits so bucket labels stay readable.
+    """
+
+    if minimum <= 0 or maximum <= minimum or per_decade <= 0:
+        raise ValueError("Histogram edges need 0 < minimum < maximum and per_decade > 0")
+    steps = math.ceil(round(math.log10(maximum / minimum) * per_decade, 9))
+    edges: List[float] = []
+    for step in range(steps + 1):
+        value = float(f"{minimum * 10 ** (step / per_decade):.3g}")
+        if not edges or value > edges[-1]:
+            edges.append(value)
+    return edges
+
+
+class FeeHistogram:
+    """Fee-rate histogram counting transactions and vbytes over fixed edges.
+
+    Bucket ``i`` covers ``[edges[i - 1], edges[i])``; the first bucket starts at zero and
+    the last one is open-ended, so the set of bucket labels never grows. ``add_batch``
+    bins a whole array of transactions at once (vectorised through NumPy when it is
+    installed) while ``add``/``remove`` serve incremental callers.
+    """
+
+    def __init__(self, edges: Sequence[float]) -> None:
+        self.edges = tuple(float(edge) for edge in edges)
+        labels = ["0", *(f"{edge:g}" for edge in self.edges)]
+        self.labels = [f"{low}-{high}" for low, high in zip(labels, labels[1:], strict=False)]
+        self.labels.append(f"{labels[-1]}+")
+        self.counts = array("q", bytes(8 * len(self.labels)))
+        self.vsizes = array("q", bytes(8 * len(self.labels)))
+
+    def add(self, fee: int, vsize: int) -> None:
+        index = self._index(fee, vsize)
+        self.counts[index] += 1
+        self.vsizes[index] += vsize
+
+    def remove(self, fee: int, vsize: int) -> None:
+        index = self._index(fee, vsize)
+        self.counts[index] -= 1
+        self.vsizes[index] -= vsize
+
+    def add_batch(self, fees: Sequence[int], vsizes: Sequence[int]) -> None:
+        """Bin ``fees`` (sat) and ``vsizes`` (vB) pairwise into the histogram."""
+
+        if not len(fees):
+            return
+        if np is not None:
+            fee_arr = np.asarray(fees, dtype=np.float64)
+            vsize_arr = np.asarray(vsizes, dtype=np.int64)
+            rates = fee_arr / np.maximum(vsize_arr, 1)
+            indexes = np.searchsorted(np.asarray(self.edges), rates, side="right")
+            size = len(self.labels)
+            counts = np.bincount(indexes, minlength=size)
+            weights = np.bincount(indexes, weights=vsize_arr, minlength=size)
+            for index in np.flatnonzero(counts):
+                self.counts[index] += int(counts[index])
+                self.vsizes[index] += int(weights[index])
+            return
+        for fee, vsize in zip(fees, vsizes, strict=True):
+            self.add(fee, vsize)
+
+    def buckets(self) -> List[FeeBucket]:
+        return [
+            {"bucket": label, "count": float(count), "vsize": float(vsize)}
+            for label, count, vsize in zip(self.labels, self.counts, self.vsizes, strict=True)
+        ]
+
+    def _index(self, fee: int, vsize: int) -> int:
+        return bisect_right(self.edges, fee / (vsize or 1))
+
+
+def bucket_mempool_histogram(raw: Mapping[str, int] | FeeHistogram) -> List[FeeBucket]:
+    if isinstance(raw, FeeHistogram):
+        return raw.buckets()
     buckets: List[FeeBucket] = []
     for fee_range, count in raw.items():
         buckets.append({"bucket": fee_range, "count": float(count)})
     return buckets
 
 
+def create_mempool_hist_points(
+    config: CollectorConfig, hist: Sequence[FeeBucket]
+) -> List[Point]:
+    counts = Point("mempool_hist").tag("network", config.bitcoin_network)
+    vsizes = Point("mempool_hist_vsize").tag("network", config.bitcoin_network)
+    for entry in hist:
+        counts.field(entry["bucket"], entry["count"])
+        if "vsize" in entry:
+            vsizes.field(entry["bucket"], entry["vsize"])
+    return [point for point in (counts, vsizes) if point.fields]
+
+
 def peers_metrics(peers: Sequence[Mapping[str, Any]]) -> Dict[str, float]:
     total = len(peers)
     inbound = len([p for p in peers if p.get("inbound")])
@@ -105,7 +319,152 @@ def create_blockchain_points(
             .tag("stream", topic)
             .field("seconds_since", float(status.get("seconds_since", 0.0)))
             .field("messages", float(status.get("messages", 0.0)))
+            .field("sequence_gaps", float(status.get("sequence_gaps", 0.0)))
+            .field("missed", float(status.get("missed", 0.0)))
+            .field("queue_drops", float(status.get("queue_drops", 0.0)))
+            .field("queue_depth", float(status.get("queue_depth", 0.0)))
+            .field("lag_ms", float(status.get("lag_ms", 0.0)))
+        )
+    return points
+
+
+def create_block_points(
+    config: CollectorConfig, block: BlockSummary, timings: Mapping[str, float]
+) -> List[Point]:
+    point = (
+        Point("block")
+        .tag("network", config.bitcoin_network)
+        .field("version", float(block.version))
+        .field("header_time", float(block.time))
+        .field("tx_count", float(block.tx_count))
+        .field("size", float(block.size))
+        .field("stripped_size", float(block.stripped_size))
+        .field("weight", float(block.weight))
+    )
+    if block.height is not None:
+        point.field("height", float(block.height))
+    for key, value in timings.items():
+        point.field(key, float(value))
+    return [point]
+
+
+def create_tx_rate_points(
+    config: CollectorConfig, windows: Mapping[str, Mapping[str, float]]
+) -> List[Point]:
+    points: List[Point] = []
+    for window, fields in windows.items():
+        point = Point("tx_rate").tag("network", config.bitcoin_network).tag("window", window)
+        for key, value in fields.items():
+            point.field(key, float(value))
+        points.append(point)
+    return points
+
+
+def create_block_content_points(
+    config: CollectorConfig, counts: Sequence[int], dropped: int = 0
+) -> List[Point]:
+    point = Point("block_content").tag("network", config.bitcoin_network)
+    for key, value in content_fields(counts).items():
+        point.field(key, value)
+    point.field("dropped", float(dropped))
+    return [point]
+
+
+def create_tx_confirmation_points(
+    config: CollectorConfig, bands: Mapping[str, Mapping[str, float]]
+) -> List[Point]:
+    points: List[Point] = []
+    for band, fields in bands.items():
+        point = (
+            Point("tx_confirmation").tag("network", config.bitcoin_network).tag("fee_band", band)
         )
+        for key, value in fields.items():
+            point.field(key, float(value))
+        points.append(point)
+    return points
+
+
+def create_block_latency_points(
+    config: CollectorConfig, summary: Mapping[str, float]
+) -> List[Point]:
+    if not summary.get("blocks"):
+        return []
+    point = Point("block_latency").tag("network", config.bitcoin_network)
+    for key, value in summary.items():
+        point.field(key, float(value))
+    return [point]
+
+
+def create_http_pool_points(stats: Mapping[str, Mapping[str, float]]) -> List[Point]:
+    points: List[Point] = []
+    for endpoint, counters in stats.items():
+        points.append(
+            Point("collector_http")
+            .tag("endpoint", endpoint)
+            .field("requests", float(counters.get("requests", 0.0)))
+            .field("connections", float(counters.get("connections", 0.0)))
+            .field("reused", float(counters.get("reused", 0.0)))
+            .field("reconnects", float(counters.get("reconnects", 0.0)))
+            .field("idle_evictions", float(counters.get("idle_evictions", 0.0)))
+        )
+    return points
+
+
+def create_influx_writer_points(
+    statuses: Mapping[str, Mapping[str, float]],
+) -> List[Point]:
+    points: List[Point] = []
+    for destination, status in statuses.items():
+        point = Point("collector_influx").tag("destination", destination)
+        for key in ("queue_depth", "dropped", "written", "failed", "batches"):
+            point.field(key, float(status.get(key, 0.0)))
+        for key, value in status.items():
+            if key.startswith("spool"):  # only present with INFLUX_SPOOL_DIR
+                point.field(key, float(value))
+        points.append(point)
+    return points
+
+
+def create_aggregation_points(status: Mapping[str, float]) -> List[Point]:
+    point = Point("collector_aggregation")
+    for key in ("series", "aggregated", "windows", "overflow"):
+        point.field(key, float(status.get(key, 0.0)))
+    return [point]
+
+
+def create_cardinality_points(
+    statuses: Mapping[Tuple[str, str], Mapping[str, float]],
+) -> List[Point]:
+    points: List[Point] = []
+    for (measurement, tag), status in statuses.items():
+        point = Point("collector_cardinality").tag("measurement", measurement).tag("tag", tag)
+        for key in ("distinct", "admitted", "budget", "folded"):
+            point.field(key, float(status.get(key, 0.0)))
+        points.append(point)
+    return points
+
+
+def create_prometheus_points(status: Mapping[str, float]) -> List[Point]:
+    point = Point("collector_prometheus")
+    for key in ("series", "scrapes", "renders"):
+        point.field(key, float(status.get(key, 0.0)))
+    return [point]
+
+
+def create_rpc_cache_points(status: Mapping[str, float]) -> List[Point]:
+    point = Point("collector_rpc_cache")
+    for key in ("entries", "hits", "misses", "coalesced", "invalidations"):
+        point.field(key, float(status.get(key, 0.0)))
+    return [point]
+
+
+def create_rpc_points(stats: Mapping[str, Mapping[str, float]]) -> List[Point]:
+    points: List[Point] = []
+    for method, fields in stats.items():
+        point = Point("collector_rpc").tag("method", method)
+        for key, value in fields.items():
+            point.field(key, float(value))
+        points.append(point)
     return points
 
 
@@ -125,6 +484,21 @@ def create_mempool_points(
     return [point]
 
 
+def create_mempool_mirror_points(
+    config: CollectorConfig, status: Mapping[str, float]
+) -> List[Point]:
+    point = (
+        Point("mempool_mirror")
+        .tag("network", config.bitcoin_network)
+        .field("tx_count", float(status.get("tx_count", 0.0)))
+        .field("vsize_mb", float(status.get("vsize_mb", 0.0)))
+        .field("pending", float(status.get("pending", 0.0)))
+        .field("gaps", float(status.get("gaps", 0.0)))
+        .field("resyncs", float(status.get("resyncs", 0.0)))
+    )
+    return [point]
+
+
 def create_peer_points(config: CollectorConfig, summary: Mapping[str, float]) -> List[Point]:
     point = (
         Point("peers")
@@ -0,0 +1,148 @@
+"""Prometheus/OpenMetrics exporter serving the latest collected values from memory."""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from aiohttp import web
+
+from .influx import Point
+
+LOGGER = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+
+class MetricRegistry:
+    """Latest value of every series, rendered to exposition text on demand.
+
+    Each point field becomes a gauge named ``<prefix>_<measurement>_<field>`` with the
+    point's tags as labels. ``update`` only overwrites values; the exposition text is
+    rendered on the first scrape after an update and then served from cache, so
+    Prometheus scrapes cost neither RPC calls nor re-rendering. Series not refreshed for
+    ``stale_after`` seconds, such as disconnected peers, are dropped on the next render.
+
+    Both ``update`` and ``render`` run on the event loop, so the registry needs no lock.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "bitcoin",
+        stale_after: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.prefix = prefix
+        self.stale_after = stale_after
+        self._clock = clock
+        self._series: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self._cache: Dict[bool, bytes] = {}
+        self.scrapes = 0
+        self.renders = 0
+
+    def update(self, points: Iterable[Point]) -> None:
+        now = self._clock()
+        for point in points:
+            labels = _labels(tuple(point.tags.items()))
+            for key, value in point.fields.items():
+                name = _metric_name(self.prefix, point.measurement, key)
+                self._series.setdefault(name, {})[labels] = (float(value), now)
+        self._cache.clear()
+
+    def render(self, openmetrics: bool = False) -> bytes:
+        self.scrapes += 1
+        cached = self._cache.get(openmetrics)
+        if cached is not None:
+            return cached
+        self.renders += 1
+        self._expire()
+        lines = []
+        for name in sorted(self._series):
+            lines.append(f"# TYPE {name} gauge")
+            for labels, (value, _updated) in self._series[name].items():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        body = ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+        self._cache[openmetrics] = body
+        return body
+
+    def status(self) -> Dict[str, float]:
+        return {
+            "series": float(sum(len(series) for series in self._series.values())),
+            "scrapes": float(self.scrapes),
+            "renders": float(self.renders),
+        }
+
+    def _expire(self) -> None:
+        cutoff = self._clock() - self.stale_after
+        for name in list(self._series):
+            series = self._series[name]
+            for labels in [labels for labels, (_, updated) in series.items() if updated < cutoff]:
+                del series[labels]
+            if not series:
+                del self._series[name]
+
+
+class PrometheusExporter:
+    """Serve a :class:`MetricRegistry` on ``/metrics`` from the collector's event loop."""
+
+    def __init__(self, registry: MetricRegistry, host: str = "0.0.0.0", port: int = 9332) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        LOGGER.info("Serving Prometheus metrics on %s:%d/metrics", self.host, self.port)
+
+    async def aclose(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        openmetrics = "application/openmetrics-text" in request.headers.get("Accept", "")
+        content_type = OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+        return web.Response(
+            body=self.registry.render(openmetrics), headers={"Content-Type": content_type}
+        )
+
+
+@lru_cache(maxsize=1024)
+def _metric_name(prefix: str, measurement: str, key: str) -> str:
+    return _INVALID_NAME.sub("_", f"{prefix}_{measurement}_{key}")
+
+
+@lru_cache(maxsize=4096)
+def _labels(tags: Tuple[Tuple[str, str], ...]) -> str:
+    if not tags:
+        return ""
+    pairs = [f'{_label_name(k)}="{str(v).translate(_LABEL_ESCAPES)}"' for k, v in tags]
+    return "{" + ",".join(pairs) + "}"
+
+
+def _label_name(key: str) -> str:
+    name = _INVALID_NAME.sub("_", key)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
@@ -0,0 +1,167 @@
+"""Short-lived RPC result cache with request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from .bitcoin_rpc import RPCError, RPCRequest
+
+# Read-only calls whose answers may be shared between the fast and slow loops.
+CACHEABLE_METHODS = frozenset(
+    {
+        "estimatesmartfee",
+        "getblock",
+        "getblockchaininfo",
+        "getblockhash",
+        "getblockheader",
+        "getblockstats",
+        "getchaintxstats",
+        "getdeploymentinfo",
+        "getmempoolinfo",
+        "getmininginfo",
+        "getnettotals",
+        "getnetworkinfo",
+        "getpeerinfo",
+    }
+)
+
+# Answers that change whenever a new block is connected.
+CHAIN_STATE_METHODS = frozenset(
+    {
+        "estimatesmartfee",
+        "getblockchaininfo",
+        "getchaintxstats",
+        "getdeploymentinfo",
+        "getmininginfo",
+    }
+)
+
+CacheKey = Tuple[str, str]
+BatchLoader = Callable[[Sequence[RPCRequest]], Awaitable[List[Any]]]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires: float
+
+
+class RPCCache:
+    """TTL cache in front of ``BitcoinRPC.abatch`` keyed by method and params.
+
+    Concurrent callers asking for the same key share one in-flight request instead of each
+    reaching bitcoind, and keys missing from a batch are fetched together in a single batch.
+    Node-side errors are passed through but never cached. Chain-state entries are dropped
+    as soon as a ``getblockchaininfo`` answer reports a new best block hash.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[CacheKey, _Entry] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future[Any]] = {}
+        self._best_block: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def fetch(self, calls: Sequence[RPCRequest], loader: BatchLoader) -> List[Any]:
+        now = self._clock()
+        results: List[Any] = [None] * len(calls)
+        waiting: List[Tuple[int, asyncio.Future[Any]]] = []
+        missing: List[int] = []
+        owned: Dict[CacheKey, asyncio.Future[Any]] = {}
+        for index, (method, params) in enumerate(calls):
+            if method not in CACHEABLE_METHODS:
+                missing.append(index)
+                continue
+            key = _key(method, params)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > now:
+                self.hits += 1
+                results[index] = entry.value
+            elif key in self._inflight:
+                self.coalesced += 1
+                waiting.append((index, self._inflight[key]))
+            elif key in owned:
+                waiting.append((index, owned[key]))
+            else:
+                self.misses += 1
+                missing.append(index)
+                owned[key] = self._inflight[key] = asyncio.get_running_loop().create_future()
+
+        if missing:
+            await self._load(calls, missing, results, owned, loader)
+        for index, future in waiting:
+            results[index] = await asyncio.shield(future)
+        return results
+
+    def note_best_block(self, block_hash: str | None) -> None:
+        """Drop chain-state entries when the node reports a different tip."""
+
+        if not block_hash or block_hash == self._best_block:
+            return
+        if self._best_block is not None:
+            self.invalidations += 1
+            for key in [key for key in self._entries if key[0] in CHAIN_STATE_METHODS]:
+                del self._entries[key]
+        self._best_block = block_hash
+
+    def status(self) -> Dict[str, float]:
+        return {
+            "entries": float(len(self._entries)),
+            "hits": float(self.hits),
+            "misses": float(self.misses),
+            "coalesced": float(self.coalesced),
+            "invalidations": float(self.invalidations),
+        }
+
+    async def _load(
+        self,
+        calls: Sequence[RPCRequest],
+        missing: List[int],
+        results: List[Any],
+        owned: Dict[CacheKey, asyncio.Future[Any]],
+        loader: BatchLoader,
+    ) -> None:
+        try:
+            loaded = await loader([calls[index] for index in missing])
+        except BaseException as exc:
+            for key, future in owned.items():
+                self._inflight.pop(key, None)
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+                    # Nobody else may be waiting; mark the exception as retrieved.
+                    future.exception()
+            raise
+        expires = self._clock() + self.ttl
+        for index, value in zip(missing, loaded, strict=True):
+            results[index] = value
+            method, params = calls[index]
+            if method == "getblockchaininfo" and isinstance(value, dict):
+                self.note_best_block(value.get("bestblockhash"))
+            key = _key(method, params)
+            if key not in owned:
+                continue
+            future = owned.pop(key)
+            self._inflight.pop(key, None)
+            future.set_result(value)
+            if not isinstance(value, RPCError):
+                self._entries[key] = _Entry(value, expires)
+        self._evict_expired()
+
+    def _evict_expired(self) -> None:
+        now = self._clock()
+        for key in [key for key, entry in self._entries.items() if entry.expires <= now]:
+            del self._entries[key]
+
+
+def _key(method: str, params: Sequence[Any]) -> CacheKey:
+    return method, json.dumps(list(params), sort_keys=True)
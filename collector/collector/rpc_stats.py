@@ -0,0 +1,210 @@
+"""In-process latency, payload size and error statistics for RPC calls."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import threading
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import aiohttp
+import requests
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS: Sequence[float] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 30_000,
+)  # fmt: skip
+
+ERROR_CLASSES = ("rpc", "http", "timeout", "connection", "decode", "other")
+
+# Label shared by every JSON-RPC batch request carrying more than one call.
+BATCH_LABEL = "batch"
+
+
+def _bucket_counts() -> array:
+    return array("q", [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+
+@dataclass
+class _MethodStats:
+    calls: int = 0
+    methods: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    latency_buckets: array = field(default_factory=_bucket_counts)
+    bytes_total: int = 0
+    bytes_max: int = 0
+    decode_ms_total: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: "_MethodStats") -> None:
+        self.calls += other.calls
+        self.methods += other.methods
+        self.latency_ms_total += other.latency_ms_total
+        self.latency_ms_max = max(self.latency_ms_max, other.latency_ms_max)
+        for index, count in enumerate(other.latency_buckets):
+            self.latency_buckets[index] += count
+        self.bytes_total += other.bytes_total
+        self.bytes_max = max(self.bytes_max, other.bytes_max)
+        self.decode_ms_total += other.decode_ms_total
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+
+class RPCStats:
+    """Per-method RPC timings accumulated until :meth:`reset` is called.
+
+    :meth:`snapshot` summarises everything recorded since the last reset without
+    forgetting it, so stats whose points never got submitted are reported again, merged
+    into the next interval, instead of being lost.
+
+    Latency covers sending the request until the last response byte arrived; decode time
+    is measured separately so a slow ``json`` parse is not blamed on bitcoind. Latencies
+    are kept in a fixed bucket histogram, so recording a call is O(log buckets) and memory
+    does not grow with the number of calls.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._methods: Dict[str, _MethodStats] = {}
+        self._pending: Dict[str, _MethodStats] = {}
+
+    def observe(
+        self,
+        method: str,
+        latency: float,
+        size: int = 0,
+        decode: float = 0.0,
+        rpc_errors: int = 0,
+        methods: int = 1,
+    ) -> None:
+        """Record a completed call; ``latency`` and ``decode`` are in seconds.
+
+        ``methods`` is the number of JSON-RPC calls the request carried.
+        """
+
+        with self._lock:
+            stats = self._record(method, latency, methods)
+            stats.bytes_total += size
+            stats.bytes_max = max(stats.bytes_max, size)
+            stats.decode_ms_total += decode * 1000
+            if rpc_errors:
+                stats.errors["rpc"] = stats.errors.get("rpc", 0) + rpc_errors
+
+    def observe_failure(
+        self, method: str, latency: float, exc: BaseException, methods: int = 1
+    ) -> None:
+        """Record a call that raised before a usable response was decoded."""
+
+        with self._lock:
+            stats = self._record(method, latency, methods)
+            error = error_class(exc)
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return per-method summaries of everything recorded since the last reset."""
+
+        with self._lock:
+            for method, stats in self._methods.items():
+                pending = self._pending.get(method)
+                if pending is None:
+                    self._pending[method] = stats
+                else:
+                    pending.merge(stats)
+            self._methods = {}
+            return {method: _summarise(stats) for method, stats in self._pending.items()}
+
+    def reset(self) -> None:
+        """Forget what :meth:`snapshot` returned, once its points have been submitted.
+
+        Calls recorded after that snapshot are kept for the next one.
+        """
+
+        with self._lock:
+            self._pending = {}
+
+    def _record(self, method: str, latency: float, methods: int) -> _MethodStats:
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = _MethodStats()
+        latency_ms = latency * 1000
+        stats.calls += 1
+        stats.methods += methods
+        stats.latency_ms_total += latency_ms
+        stats.latency_ms_max = max(stats.latency_ms_max, latency_ms)
+        stats.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        return stats
+
+
+def _summarise(stats: _MethodStats) -> Dict[str, float]:
+    calls = stats.calls or 1
+    fields = {
+        "calls": float(stats.calls),
+        "methods": float(stats.methods),
+        "latency_ms_avg": stats.latency_ms_total / calls,
+        "latency_ms_p50": _quantile(stats.latency_buckets, 0.5, stats.latency_ms_max),
+        "latency_ms_p95": _quantile(stats.latency_buckets, 0.95, stats.latency_ms_max),
+        "latency_ms_max": stats.latency_ms_max,
+        "bytes_total": float(stats.bytes_total),
+        "bytes_max": float(stats.bytes_max),
+        "decode_ms_avg": stats.decode_ms_total / calls,
+        "errors": float(sum(stats.errors.values())),
+    }
+    for error in ERROR_CLASSES:
+        fields[f"errors_{error}"] = float(stats.errors.get(error, 0))
+    return fields
+
+
+def error_class(exc: BaseException) -> str:
+    """Map an exception raised by an RPC transport onto a coarse error class."""
+
+    if isinstance(exc, (asyncio.TimeoutError, requests.Timeout)):
+        return "timeout"
+    if isinstance(exc, (aiohttp.ClientResponseError, requests.HTTPError)):
+        return "http"
+    if isinstance(exc, (aiohttp.ClientError, requests.ConnectionError, OSError)):
+        return "connection"
+    if isinstance(exc, ValueError):
+        return "decode"
+    return "other"
+
+
+def _quantile(buckets: array, q: float, maximum: float) -> float:
+    """Upper bound of the bucket holding quantile ``q``, capped at the observed maximum."""
+
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(buckets):
+        seen += count
+        if seen >= rank and count:
+            if index < len(LATENCY_BUCKETS_MS):
+                return min(float(LATENCY_BUCKETS_MS[index]), maximum)
+            break
+    return maximum
+
+
+def method_label(payload: Dict[str, object] | List[Dict[str, object]]) -> str:
+    """Name a request by its method; batches of several calls are :data:`BATCH_LABEL`.
+
+    What a batch carries shifts with cache hits and the REST fallback, so naming batches
+    after their methods would give the ``method`` tag an unbounded set of values. A batch
+    of one call is named after that call, so single calls made through ``abatch`` (such
+    as ``getpeerinfo``) keep their own series.
+    """
+
+    if isinstance(payload, list) and len(payload) == 1:
+        payload = payload[0]
+    if isinstance(payload, dict):
+        return str(payload.get("method", "unknown"))
+    return BATCH_LABEL
+
+
+def method_count(payload: Dict[str, object] | List[Dict[str, object]]) -> int:
+    """Number of JSON-RPC calls in a single or batch request."""
+
+    return 1 if isinstance(payload, dict) else len(payload)
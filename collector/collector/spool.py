@@ -0,0 +1,186 @@
+"""Append-only on-disk spool for line-protocol batches that could not be written."""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+SUFFIX = ".spool"
+
+_LENGTH = struct.Struct("<I")
+
+
+class WriteSpool:
+    """Segmented write-ahead spool replayed oldest-first.
+
+    Each record is a length-prefixed line-protocol body appended to the newest segment
+    file; a new segment is started once the current one reaches ``segment_bytes``. When the
+    spool grows past ``max_bytes`` whole segments are evicted, oldest first. Replay reads
+    one record at a time with :meth:`peek` and advances with :meth:`ack`; consumed segments
+    are deleted.
+
+    Only the read position inside the oldest segment is kept in memory, so after a restart
+    that segment is replayed from its start again. Points carry their collection
+    timestamp, which makes the repeated writes idempotent in InfluxDB. A torn record at the
+    end of a segment, left by a crash mid-append, is truncated when the spool is opened.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = 256 * 1024 * 1024,
+        segment_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._segments: Deque[List[int]] = deque()  # [sequence, size] per segment
+        self._offset = 0
+        self._next_sequence = 0
+        self._peeked: Optional[Tuple[int, int]] = None
+        self.spooled = 0
+        self.replayed = 0
+        self.evicted_bytes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def append(self, body: bytes) -> None:
+        record = _LENGTH.pack(len(body)) + body
+        with self._lock:
+            if not self._segments or self._segments[-1][1] >= self.segment_bytes:
+                self._segments.append([self._next_sequence, 0])
+                self._next_sequence += 1
+            segment = self._segments[-1]
+            with open(self._path(segment[0]), "ab") as handle:
+                handle.write(record)
+                handle.flush()
+                os.fsync(handle.fileno())
+            segment[1] += len(record)
+            self.spooled += 1
+            self._evict()
+
+    def peek(self) -> Optional[bytes]:
+        """Return the oldest unreplayed record without consuming it."""
+
+        with self._lock:
+            if not self._segments or self._offset >= self._segments[0][1]:
+                return None
+            self._peeked = (self._segments[0][0], self._offset)
+            with open(self._path(self._segments[0][0]), "rb") as handle:
+                handle.seek(self._offset)
+                (length,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+                return handle.read(length)
+
+    def ack(self, body: bytes) -> None:
+        """Mark ``body``, the record last returned by :meth:`peek`, as replayed.
+
+        Does nothing if the record was evicted while it was being replayed.
+        """
+
+        with self._lock:
+            if not self._segments or self._peeked != (self._segments[0][0], self._offset):
+                return
+            self._offset += _LENGTH.size + len(body)
+            self.replayed += 1
+            if self._offset >= self._segments[0][1]:
+                self._drop_oldest()  # may be the active segment; the next append starts anew
+
+    @property
+    def pending(self) -> int:
+        """Bytes still waiting to be replayed."""
+
+        with self._lock:
+            return sum(segment[1] for segment in self._segments) - self._offset
+
+    def status(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "bytes": float(sum(segment[1] for segment in self._segments) - self._offset),
+                "segments": float(len(self._segments)),
+                "spooled": float(self.spooled),
+                "replayed": float(self.replayed),
+                "evicted_bytes": float(self.evicted_bytes),
+            }
+
+    def _load(self) -> None:
+        sequences = sorted(int(path.stem) for path in self.directory.glob(f"*{SUFFIX}"))
+        self._next_sequence = sequences[-1] + 1 if sequences else 0
+        for sequence in sequences:
+            size = _valid_length(self._path(sequence))
+            if size:
+                self._segments.append([sequence, size])
+            else:
+                self._path(sequence).unlink(missing_ok=True)
+        if self._segments:
+            LOGGER.info(
+                "Resuming replay of %d spooled segments from %s",
+                len(self._segments),
+                self.directory,
+            )
+
+    def _evict(self) -> None:
+        total = sum(segment[1] for segment in self._segments)
+        while total > self.max_bytes and len(self._segments) > 1:
+            evicted = self._segments[0][1] - self._offset
+            total -= self._segments[0][1]
+            self.evicted_bytes += evicted
+            LOGGER.warning("Spool over %d bytes; evicted %d oldest bytes", self.max_bytes, evicted)
+            self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        sequence, _size = self._segments.popleft()
+        self._offset = 0
+        self._path(sequence).unlink(missing_ok=True)
+
+    def _path(self, sequence: int) -> Path:
+        return self.directory / f"{sequence:020d}{SUFFIX}"
+
+
+def adopt_segments(source: str | os.PathLike[str], directory: str | os.PathLike[str]) -> int:
+    """Move the segment files lying directly in ``source`` into the spool at ``directory``.
+
+    Spools used to live at the top of ``INFLUX_SPOOL_DIR``; they now sit in one
+    subdirectory per destination. Adopted segments keep their order and are numbered after
+    any the target already holds, so the next :class:`WriteSpool` opened there replays
+    them. Returns the number of files moved.
+    """
+
+    source, directory = Path(source), Path(directory)
+    legacy = sorted(source.glob(f"*{SUFFIX}"), key=lambda path: int(path.stem))
+    if not legacy:
+        return 0
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = [int(path.stem) for path in directory.glob(f"*{SUFFIX}")]
+    sequence = max(existing, default=-1) + 1
+    for path in legacy:
+        path.replace(directory / f"{sequence:020d}{SUFFIX}")
+        sequence += 1
+    LOGGER.info("Moved %d spool segments from %s to %s", len(legacy), source, directory)
+    return len(legacy)
+
+
+def _valid_length(path: Path) -> int:
+    """Return the length of the complete records in ``path``, truncating a torn tail."""
+
+    size = path.stat().st_size
+    valid = 0
+    with open(path, "rb") as handle:
+        while valid + _LENGTH.size <= size:
+            handle.seek(valid)
+            (length,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+            if valid + _LENGTH.size + length > size:
+                break
+            valid += _LENGTH.size + length
+    if valid != size:
+        LOGGER.warning("Truncating torn record at the end of %s", path)
+        with open(path, "r+b") as handle:
+            handle.truncate(valid)
+    return valid
@@ -0,0 +1,121 @@
+"""Confirmation latency of transactions first seen on the ZMQ ``rawtx`` stream."""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .block_decoder import block_txids, decode_txid
+from .metrics import percentile
+
+# Entries kept in the first-seen index; roughly 100 bytes each, so about 40 MB at the cap.
+MAX_ENTRIES = 400_000
+
+# Fee-rate band edges in sat/vB; labels follow ``FeeHistogram`` (``0-1`` ... ``100+``).
+FEE_BANDS: Sequence[float] = (1, 2, 5, 10, 20, 50, 100)
+
+FeeRateLookup = Callable[[Sequence[bytes]], List[Optional[float]]]
+
+
+class ConfirmationTracker:
+    """Remember when each transaction was first relayed to us and time its confirmation.
+
+    ``record`` hashes every ``rawtx`` body into its txid and stores the first-seen time in
+    a dict keyed by the first 8 txid bytes, which is plenty to tell a mempool apart and
+    keeps each entry to a small int key and a float. The dict's insertion order doubles as
+    the eviction queue: once ``max_entries`` is reached the oldest sighting is dropped,
+    since the longest-waiting transactions are the least likely to confirm soon.
+
+    ``confirm`` walks a ``rawblock`` and returns latency statistics per fee-rate band for
+    the transactions found in the index. Fee rates come from ``fee_rates`` (the mempool
+    mirror) when available; otherwise everything lands in the ``unknown`` band.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        edges: Sequence[float] = FEE_BANDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self._edges = list(edges)
+        labels = ["0", *(f"{edge:g}" for edge in self._edges)]
+        self._labels = [f"{low}-{high}" for low, high in zip(labels, labels[1:], strict=False)]
+        self._labels.append(f"{labels[-1]}+")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._first_seen: Dict[int, float] = {}
+        self.evictions = 0
+        self.parse_errors = 0
+
+    def record(self, raw: bytes | memoryview) -> None:
+        try:
+            key = _key(decode_txid(raw))
+        except (ValueError, IndexError):
+            self.parse_errors += 1
+            return
+        seen = self._clock()
+        with self._lock:
+            if key in self._first_seen:
+                return
+            self._first_seen[key] = seen
+            if len(self._first_seen) > self.max_entries:
+                del self._first_seen[next(iter(self._first_seen))]
+                self.evictions += 1
+
+    def confirm(
+        self, raw_block: bytes | memoryview, fee_rates: Optional[FeeRateLookup] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Remove the block's transactions from the index and summarise their latency.
+
+        The ``all`` entry also counts ``unseen`` transactions that were mined without ever
+        reaching us over ``rawtx``.
+        """
+
+        try:
+            txids = block_txids(raw_block)[1:]  # the coinbase is never relayed
+        except (ValueError, IndexError):
+            self.parse_errors += 1
+            return {}
+        now = self._clock()
+        seen: List[bytes] = []
+        latencies: List[float] = []
+        with self._lock:
+            for txid in txids:
+                first_seen = self._first_seen.pop(_key(txid), None)
+                if first_seen is not None:
+                    seen.append(txid)
+                    latencies.append(now - first_seen)
+        rates = fee_rates(seen) if fee_rates is not None and seen else [None] * len(seen)
+        bands: Dict[str, List[float]] = {}
+        for rate, latency in zip(rates, latencies, strict=True):
+            label = "unknown" if rate is None else self._labels[bisect_right(self._edges, rate)]
+            bands.setdefault(label, []).append(latency)
+        summary = {label: _summarise(values) for label, values in bands.items()}
+        summary["all"] = _summarise(latencies)
+        summary["all"]["unseen"] = float(len(txids) - len(seen))
+        return summary
+
+    def status(self) -> Dict[str, float]:
+        with self._lock:
+            entries = len(self._first_seen)
+        return {
+            "entries": float(entries),
+            "evictions": float(self.evictions),
+            "parse_errors": float(self.parse_errors),
+        }
+
+
+def _key(txid: bytes) -> int:
+    return int.from_bytes(txid[:8], "little")
+
+
+def _summarise(latencies: List[float]) -> Dict[str, float]:
+    fields = {"confirmed": float(len(latencies))}
+    if latencies:
+        fields["latency_s_p50"] = percentile(latencies, 0.5)
+        fields["latency_s_p90"] = percentile(latencies, 0.9)
+        fields["latency_s_max"] = max(latencies)
+    return fields
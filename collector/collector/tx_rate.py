@@ -0,0 +1,121 @@
+"""Rolling transaction arrival statistics fed from the ZMQ ``rawtx`` stream."""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from typing import Callable, Dict, Sequence
+
+from .block_decoder import decode_transaction
+from .metrics import log_spaced_edges
+
+# Rolling windows reported by :meth:`TxRateEngine.snapshot`, in seconds.
+WINDOWS: Dict[str, int] = {"1s": 1, "1m": 60, "10m": 600}
+
+# vsize bucket edges: 50 vB (smallest standard tx) to 100 kvB (standardness limit).
+VSIZE_EDGES = log_spaced_edges(50, 100_000, 10)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class TxRateEngine:
+    """Per-second ring buffer of transaction counts, vbytes and vsize histograms.
+
+    ``record`` is called from the ZMQ listener thread for every ``rawtx`` message and only
+    parses the transaction sizes and bumps a few counters, so it keeps up with broadcast
+    bursts of thousands of transactions per second. Memory is fixed by the longest window:
+    one slot per second, each holding a count, a vbyte total and a vsize histogram.
+
+    Windows cover the most recent *complete* seconds, so the ``1s`` window reports the last
+    full second instead of the partially filled current one.
+    """
+
+    def __init__(
+        self,
+        windows: Dict[str, int] = WINDOWS,
+        edges: Sequence[float] = VSIZE_EDGES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.windows = dict(windows)
+        self._edges = list(edges)
+        self._buckets = len(self._edges) + 1
+        self._slots = max(self.windows.values()) + 1
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stamps = array("q", [-1] * self._slots)
+        self._counts = array("q", [0] * self._slots)
+        self._vbytes = array("q", [0] * self._slots)
+        self._weights = array("q", [0] * self._slots)
+        self._hist = array("q", [0] * (self._slots * self._buckets))
+        self.parse_errors = 0
+
+    def record(self, raw: bytes | memoryview) -> None:
+        try:
+            tx = decode_transaction(raw)
+        except (ValueError, IndexError):
+            self.parse_errors += 1
+            return
+        second = int(self._clock())
+        slot = second % self._slots
+        bucket = bisect_right(self._edges, tx.vsize)
+        with self._lock:
+            if self._stamps[slot] != second:
+                self._reset(slot, second)
+            self._counts[slot] += 1
+            self._vbytes[slot] += tx.vsize
+            self._weights[slot] += tx.weight
+            self._hist[slot * self._buckets + bucket] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return rate and vsize quantiles per window, keyed by window label."""
+
+        current = int(self._clock())
+        summary: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for label, seconds in self.windows.items():
+                count = vbytes = weight = 0
+                hist = [0] * self._buckets
+                for second in range(current - seconds, current):
+                    slot = second % self._slots
+                    if self._stamps[slot] != second:
+                        continue
+                    count += self._counts[slot]
+                    vbytes += self._vbytes[slot]
+                    weight += self._weights[slot]
+                    offset = slot * self._buckets
+                    for bucket in range(self._buckets):
+                        hist[bucket] += self._hist[offset + bucket]
+                fields = {
+                    "tx_per_s": count / seconds,
+                    "vbytes_per_s": vbytes / seconds,
+                    "weight_per_s": weight / seconds,
+                }
+                for quantile in QUANTILES:
+                    key = f"vsize_p{round(quantile * 100)}"
+                    fields[key] = self._quantile(hist, count, quantile)
+                summary[label] = fields
+        return summary
+
+    def _reset(self, slot: int, second: int) -> None:
+        self._stamps[slot] = second
+        self._counts[slot] = 0
+        self._vbytes[slot] = 0
+        self._weights[slot] = 0
+        offset = slot * self._buckets
+        for bucket in range(self._buckets):
+            self._hist[offset + bucket] = 0
+
+    def _quantile(self, hist: Sequence[int], total: int, quantile: float) -> float:
+        """Upper edge of the bucket holding ``quantile``; the open last bucket uses its floor."""
+
+        if not total:
+            return 0.0
+        rank = quantile * total
+        seen = 0
+        for bucket, count in enumerate(hist):
+            seen += count
+            if count and seen >= rank:
+                return float(self._edges[min(bucket, len(self._edges) - 1)])
+        return float(self._edges[-1])
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import queue
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
 
 try:  # pragma: no cover
     import zmq  # type: ignore[import-not-found, import-untyped]
+    import zmq.asyncio  # type: ignore[import-not-found, import-untyped]
 except ImportError:  # pragma: no cover
     zmq = None  # type: ignore[assignment]
 
+LOGGER = logging.getLogger(__name__)
+
+# Messages buffered per topic between the socket reader and its consumer.
+QUEUE_SIZE = 10_000
+
+# libzmq's default receive high-water mark, in messages.
+RCVHWM = 1_000
+
+# Bitcoin Core's per-topic notification counter is a little-endian uint32 that wraps.
+SEQUENCE_MODULUS = 1 << 32
+
 
 @dataclass
 class ZMQMetric:
@@ -19,22 +34,76 @@ class ZMQMetric:
     topic: bytes
     last_seen: float = field(default_factory=time.time)
     message_count: int = 0
+    sequence: Optional[int] = None
+    sequence_gaps: int = 0
+    missed: int = 0
+    queue_drops: int = 0
+    lag_max: float = 0.0
+
+    def observe_sequence(self, sequence: Optional[int]) -> None:
+        """Count notifications skipped between the previous and the current sequence."""
+
+        if sequence is None:
+            return
+        previous, self.sequence = self.sequence, sequence
+        if previous is None:
+            return
+        skipped = (sequence - previous - 1) % SEQUENCE_MODULUS
+        # A backwards jump means bitcoind restarted and counts from zero again.
+        if skipped and skipped < SEQUENCE_MODULUS // 2:
+            self.sequence_gaps += 1
+            self.missed += skipped
+
+    def observe_lag(self, received: float) -> None:
+        self.lag_max = max(self.lag_max, time.monotonic() - received)
+
+    def snapshot(self, queue_depth: int) -> Dict[str, float | str]:
+        """Return the status fields; the maximum queue lag restarts with every call."""
+
+        lag, self.lag_max = self.lag_max, 0.0
+        return {
+            "endpoint": self.endpoint,
+            "seconds_since": max(0.0, time.time() - self.last_seen),
+            "messages": float(self.message_count),
+            "sequence_gaps": float(self.sequence_gaps),
+            "missed": float(self.missed),
+            "queue_drops": float(self.queue_drops),
+            "queue_depth": float(queue_depth),
+            "lag_ms": lag * 1000,
+        }
 
 
 class ZMQListener:
-    """Simple threaded ZMQ subscriber that tracks message liveness."""
+    """Threaded ZMQ subscriber that tracks message liveness, gaps and backpressure.
+
+    Each topic gets a receiver thread, which only reads the socket and tracks sequence
+    numbers, and a decoder thread that invokes ``callback``. They are joined by a bounded
+    queue: when the decoder falls behind, new messages are dropped and counted instead of
+    piling up in the socket until the high-water mark silently discards them.
+
+    Message bodies are handed to ``callback`` as a :class:`memoryview` over the received
+    frame, so multi-megabyte ``rawblock`` payloads are never copied. The view is only valid
+    for the duration of the callback.
+    """
 
     def __init__(
         self,
         endpoints: Dict[str, str],
-        callback: Optional[Callable[[str, bytes], None]] = None,
+        callback: Optional[Callable[[str, memoryview], None]] = None,
+        rcvhwm: int = RCVHWM,
+        rcvbuf: int = 0,
+        queue_size: int = QUEUE_SIZE,
     ) -> None:
         if zmq is None:
             raise RuntimeError("pyzmq is required for ZMQListener")
-        self.context = zmq.Context.instance()
+        self.context = zmq.Context()
         self.endpoints = endpoints
         self.callback = callback
+        self.rcvhwm = rcvhwm
+        self.rcvbuf = rcvbuf
+        self.queue_size = queue_size
         self.metrics: Dict[str, ZMQMetric] = {}
+        self._queues: Dict[str, queue.Queue[Tuple[float, memoryview]]] = {}
         self._threads: list[threading.Thread] = []
         self._stop = threading.Event()
 
@@ -42,9 +111,11 @@ class ZMQListener:
         for topic, endpoint in self.endpoints.items():
             metric = ZMQMetric(endpoint=endpoint, topic=topic.encode())
             self.metrics[topic] = metric
-            thread = threading.Thread(target=self._worker, args=(topic, endpoint), daemon=True)
-            thread.start()
-            self._threads.append(thread)
+            self._queues[topic] = queue.Queue(maxsize=self.queue_size)
+            for target, args in ((self._worker, (topic, endpoint)), (self._decoder, (topic,))):
+                thread = threading.Thread(target=target, args=args, daemon=True)
+                thread.start()
+                self._threads.append(thread)
 
     def stop(self) -> None:
         self._stop.set()
@@ -56,27 +127,183 @@ class ZMQListener:
         if zmq is None:
             raise RuntimeError("pyzmq is required for ZMQListener")
         socket = self.context.socket(zmq.SUB)
+        _configure(socket, self.rcvhwm, self.rcvbuf)
         socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
         socket.connect(endpoint)
         poller = zmq.Poller()
         poller.register(socket, zmq.POLLIN)
         metric = self.metrics[topic]
+        pending = self._queues[topic]
+        try:
+            while not self._stop.is_set():
+                events = dict(poller.poll(timeout=1000))
+                if socket in events and events[socket] == zmq.POLLIN:
+                    parsed = _split_frames(socket.recv_multipart(copy=False))
+                    if parsed is None:
+                        continue
+                    _topic, body, sequence = parsed
+                    metric.last_seen = time.time()
+                    metric.message_count += 1
+                    metric.observe_sequence(sequence)
+                    try:
+                        pending.put_nowait((time.monotonic(), body))
+                    except queue.Full:
+                        metric.queue_drops += 1
+        except zmq.ContextTerminated:
+            pass  # stop() gave up waiting and terminated the context under us
+        finally:
+            # term() blocks until every socket is closed, so always close ours.
+            socket.close(linger=0)
+
+    def _decoder(self, topic: str) -> None:
+        metric = self.metrics[topic]
+        pending = self._queues[topic]
         while not self._stop.is_set():
-            events = dict(poller.poll(timeout=1000))
-            if socket in events and events[socket] == zmq.POLLIN:
-                message = socket.recv()
-                metric.last_seen = time.time()
-                metric.message_count += 1
-                if self.callback:
-                    self.callback(topic, message)
-        socket.close(linger=0)
+            try:
+                received, body = pending.get(timeout=1)
+            except queue.Empty:
+                continue
+            metric.observe_lag(received)
+            if self.callback is None:
+                continue
+            try:
+                self.callback(topic, body)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("ZMQ %s handler failed", topic)
 
     def status(self) -> Dict[str, Dict[str, float | str]]:
         return {
-            topic: {
-                "endpoint": metric.endpoint,
-                "seconds_since": max(0.0, time.time() - metric.last_seen),
-                "messages": float(metric.message_count),
-            }
+            topic: metric.snapshot(self._queues[topic].qsize())
             for topic, metric in self.metrics.items()
         }
+
+
+class AsyncZMQListener:
+    """ZMQ subscriber running on the collector's event loop via ``zmq.asyncio``.
+
+    Topics that share an endpoint share one SUB socket. A reader task per socket splits the
+    ``[topic, body, sequence]`` frames and hands bodies to a per-topic queue, whose consumer
+    task invokes ``callback`` on the loop. Topics listed in ``blocking_topics`` are
+    dispatched through ``asyncio.to_thread`` instead, so expensive decoding (for example
+    ``rawblock``) never stalls the loop. No threads poll idle sockets. As in
+    :class:`ZMQListener`, a full queue drops and counts new messages.
+    """
+
+    def __init__(
+        self,
+        endpoints: Dict[str, str],
+        callback: Optional[Callable[[str, memoryview], None]] = None,
+        blocking_topics: Collection[str] = (),
+        rcvhwm: int = RCVHWM,
+        rcvbuf: int = 0,
+        queue_size: int = QUEUE_SIZE,
+    ) -> None:
+        if zmq is None:
+            raise RuntimeError("pyzmq is required for AsyncZMQListener")
+        self.context = zmq.asyncio.Context()
+        self.endpoints = endpoints
+        self.callback = callback
+        self.blocking_topics = set(blocking_topics)
+        self.rcvhwm = rcvhwm
+        self.rcvbuf = rcvbuf
+        self.queue_size = queue_size
+        self.metrics: Dict[str, ZMQMetric] = {}
+        self._queues: Dict[str, asyncio.Queue[Tuple[float, memoryview]]] = {}
+        self._sockets: List[Any] = []
+        self._tasks: List[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        """Subscribe and spawn reader/consumer tasks; requires a running event loop."""
+
+        loop = asyncio.get_running_loop()
+        by_endpoint: Dict[str, List[str]] = {}
+        for topic, endpoint in self.endpoints.items():
+            by_endpoint.setdefault(endpoint, []).append(topic)
+            self.metrics[topic] = ZMQMetric(endpoint=endpoint, topic=topic.encode())
+            self._queues[topic] = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks.append(loop.create_task(self._consume(topic)))
+        for endpoint, topics in by_endpoint.items():
+            socket = self.context.socket(zmq.SUB)
+            _configure(socket, self.rcvhwm, self.rcvbuf)
+            for topic in topics:
+                socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+            socket.connect(endpoint)
+            self._sockets.append(socket)
+            self._tasks.append(loop.create_task(self._read(socket)))
+
+    async def aclose(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.stop()
+
+    def stop(self) -> None:
+        if self.context.closed:
+            return
+        for task in self._tasks:
+            task.cancel()
+        for socket in self._sockets:
+            socket.close(linger=0)
+        self._sockets.clear()
+        self.context.term()
+
+    async def _read(self, socket: Any) -> None:
+        while True:
+            frames = await socket.recv_multipart(copy=False)
+            parsed = _split_frames(frames)
+            if parsed is None:
+                continue
+            topic, body, sequence = parsed
+            metric = self.metrics.get(topic)
+            if metric is None:
+                continue
+            metric.last_seen = time.time()
+            metric.message_count += 1
+            metric.observe_sequence(sequence)
+            try:
+                self._queues[topic].put_nowait((time.monotonic(), body))
+            except asyncio.QueueFull:
+                metric.queue_drops += 1
+
+    async def _consume(self, topic: str) -> None:
+        metric = self.metrics[topic]
+        pending = self._queues[topic]
+        while True:
+            received, body = await pending.get()
+            metric.observe_lag(received)
+            if self.callback is None:
+                continue
+            try:
+                if topic in self.blocking_topics:
+                    await asyncio.to_thread(self.callback, topic, body)
+                else:
+                    self.callback(topic, body)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("ZMQ %s handler failed", topic)
+
+    def status(self) -> Dict[str, Dict[str, float | str]]:
+        return {
+            topic: metric.snapshot(self._queues[topic].qsize())
+            for topic, metric in self.metrics.items()
+        }
+
+
+def _configure(socket: Any, rcvhwm: int, rcvbuf: int) -> None:
+    """Apply receive buffer limits; they only take effect before ``connect``."""
+
+    socket.setsockopt(zmq.RCVHWM, rcvhwm)
+    if rcvbuf > 0:
+        socket.setsockopt(zmq.RCVBUF, rcvbuf)
+
+
+def _split_frames(frames: List[Any]) -> Optional[Tuple[str, memoryview, Optional[int]]]:
+    """Return topic, body and sequence number of a ``[topic, body, sequence]`` message."""
+
+    if len(frames) < 2:
+        return None
+    topic = bytes(frames[0].buffer).decode("ascii", errors="replace")
+    sequence = None
+    if len(frames) > 2 and len(frames[2].buffer) == 4:
+        sequence = int.from_bytes(frames[2].buffer, "little")
+    return topic, frames[1].buffer, sequence
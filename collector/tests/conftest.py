@@ -0,0 +1,32 @@
+import pytest
+
+# Mainnet genesis block, serialised as bitcoind publishes it on ``rawblock``.
+GENESIS_HEX = (
+    "0100000000000000000000000000000000000000000000000000000000000000000000003ba3edfd7a7b12b2"
+    "7ac72c3e67768f617fc81bc3888a51323a9fb8aa4b1e5e4a29ab5f49ffff001d1dac2b7c0101000000010000"
+    "000000000000000000000000000000000000000000000000000000000000ffffffff4d04ffff001d01044554"
+    "68652054696d65732030332f4a616e2f32303039204368616e63656c6c6f72206f6e206272696e6b206f6620"
+    "7365636f6e64206261696c6f757420666f722062616e6b73ffffffff0100f2052a01000000434104678afdb0"
+    "fe5548271967f1a67130b7105cd6a828e03909a67962e0ea1f61deb649f6bc3f4cef38c4f35504e51ec112de"
+    "5c384df7ba0b8d578a4c702b6bf11d5fac00000000"
+)
+
+
+@pytest.fixture
+def genesis_block() -> bytes:
+    return bytes.fromhex(GENESIS_HEX)
+
+
+class Clock:
+    """Manually advanced stand-in for ``time.monotonic``; tests move ``now`` forward."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
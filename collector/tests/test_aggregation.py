@@ -0,0 +1,58 @@
+from collector.aggregation import RESERVOIR_SIZE, WindowAggregator
+from collector.influx import Point
+
+SECOND = 1_000_000_000
+
+
+def _sample(value: float, stamp: float, window: str = "1s") -> Point:
+    return Point("tx_rate", {"window": window}, {"tx_per_s": value}, int(stamp * SECOND))
+
+
+def test_aggregator_emits_one_point_per_series_and_window():
+    aggregator = WindowAggregator(["tx_rate"], window=10, quantiles=[0.5])
+    passthrough = Point("blockchain").field("blocks", 1.0)
+
+    first = aggregator.process([_sample(1, 100), _sample(3, 105), passthrough], 105 * SECOND)
+    second = aggregator.process([_sample(5, 111)], 111 * SECOND)
+
+    assert first == [passthrough]
+    (window,) = second
+    assert window.time == 100 * SECOND
+    assert window.tags == {"window": "1s"}
+    assert window.fields == {
+        "tx_per_s_count": 2.0,
+        "tx_per_s_min": 1.0,
+        "tx_per_s_max": 3.0,
+        "tx_per_s_mean": 2.0,
+        "tx_per_s_last": 3.0,
+        "tx_per_s_p50": 2.0,
+    }
+    (rest,) = aggregator.flush()
+    assert rest.time == 110 * SECOND
+    assert rest.fields["tx_per_s_count"] == 1.0
+    assert aggregator.status() == {
+        "series": 0.0,
+        "aggregated": 3.0,
+        "windows": 2.0,
+        "overflow": 0.0,
+    }
+
+
+def test_aggregator_keeps_raw_on_request_and_bounds_series():
+    aggregator = WindowAggregator(["tx_rate"], window=10, keep_raw=["tx_rate"], max_series=1)
+    raw, other = _sample(1, 100), _sample(2, 100, window="1m")
+
+    assert aggregator.process([raw, other], 100 * SECOND) == [raw, other]
+    assert aggregator.status()["overflow"] == 1
+
+
+def test_aggregator_reservoir_stays_bounded():
+    aggregator = WindowAggregator(["tx_rate"], window=10, quantiles=[0.9])
+    aggregator.process([_sample(value, 100) for value in range(10_000)], 100 * SECOND)
+
+    (series,) = aggregator._series.values()
+    samples = series.fields["tx_per_s"].samples
+    assert samples is not None and len(samples) == RESERVOIR_SIZE
+    (window,) = aggregator.flush()
+    assert window.fields["tx_per_s_max"] == 9_999
+    assert 8_000 < window.fields["tx_per_s_p90"] < 10_000
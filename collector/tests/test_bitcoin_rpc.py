@@ -1,17 +1,20 @@
+import asyncio
 import json
 
 import pytest
 import requests
 from requests import Response
 
-from collector.bitcoin_rpc import BitcoinRPC, RPCError
+from collector.bitcoin_rpc import BitcoinRPC, MempoolEntry, MempoolStreamDecoder, RPCError
+from collector.http_pool import HTTPResult
 
 
 class DummyResponse(Response):
-    def __init__(self, status_code: int, payload: dict) -> None:
+    def __init__(self, status_code: int, payload: dict | list) -> None:
         super().__init__()
         self.status_code = status_code
         self._content = json.dumps(payload).encode()
+        self._content_consumed = True
 
 
 def test_call_raises_rpc_error(monkeypatch):
@@ -25,7 +28,7 @@ def test_call_raises_rpc_error(monkeypatch):
         }
         return DummyResponse(200, payload)
 
-    monkeypatch.setattr("collector.bitcoin_rpc.requests.post", fake_post)
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
 
     with pytest.raises(RPCError) as excinfo:
         rpc.call("getblock")
@@ -40,7 +43,254 @@ def test_call_propagates_request_exception(monkeypatch):
     def fake_post(*args, **kwargs):
         raise requests.ConnectionError("connection failed")
 
-    monkeypatch.setattr("collector.bitcoin_rpc.requests.post", fake_post)
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
 
     with pytest.raises(requests.ConnectionError):
         rpc.call("getblockchaininfo")
+
+
+def test_batch_orders_results_and_returns_entry_errors(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332")
+    sent = {}
+
+    def fake_post(*args, **kwargs):
+        sent["payload"] = json.loads(kwargs["data"])
+        payload = [
+            {"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found"}},
+            {"jsonrpc": "2.0", "id": 0, "result": {"blocks": 10}},
+        ]
+        return DummyResponse(200, payload)
+
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
+
+    results = rpc.batch([("getblockchaininfo", []), ("getfoo", [1])])
+
+    assert [entry["method"] for entry in sent["payload"]] == ["getblockchaininfo", "getfoo"]
+    assert results[0] == {"blocks": 10}
+    assert isinstance(results[1], RPCError)
+    assert results[1].code == -32601
+
+
+def test_batch_skips_request_when_empty(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332")
+
+    def fake_post(*args, **kwargs):  # pragma: no cover - indicates regression
+        raise AssertionError("empty batches must not hit the node")
+
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
+
+    assert rpc.batch([]) == []
+
+
+def test_abatch_posts_through_async_pool(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332", username="user", password="pass")
+    sent = {}
+
+    async def fake_arequest(method, url, **kwargs):
+        sent.update(kwargs)
+        payload = [{"jsonrpc": "2.0", "id": 0, "result": {"size": 3}}]
+        return HTTPResult(200, json.dumps(payload).encode(), None)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(rpc.pool, "arequest", fake_arequest)
+
+    results = asyncio.run(rpc.abatch([("getmempoolinfo", [])]))
+
+    assert results == [{"size": 3}]
+    assert sent["auth"] == ("user", "pass")
+
+
+RAW_MEMPOOL_RESPONSE = json.dumps(
+    {
+        "result": {
+            "aa" * 32: {"vsize": 141, "time": 1700000000, "fees": {"base": 0.00000705}},
+            "bb" * 32: {"vsize": 250, "time": 1700000100, "fees": {"base": 0.0001}},
+        },
+        "error": None,
+        "id": "btc-monitor",
+    },
+    indent=1,
+).encode()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, len(RAW_MEMPOOL_RESPONSE)])
+def test_mempool_stream_decoder_handles_any_chunking(chunk_size):
+    decoder = MempoolStreamDecoder()
+    entries = []
+    for start in range(0, len(RAW_MEMPOOL_RESPONSE), chunk_size):
+        entries.extend(decoder.feed(RAW_MEMPOOL_RESPONSE[start : start + chunk_size]))
+    decoder.close()
+
+    assert entries == [
+        MempoolEntry("aa" * 32, 705, 141, 1700000000),
+        MempoolEntry("bb" * 32, 10000, 250, 1700000100),
+    ]
+
+
+def test_mempool_stream_decoder_raises_rpc_error():
+    decoder = MempoolStreamDecoder()
+    payload = {"result": None, "error": {"code": -28, "message": "Loading"}, "id": "x"}
+
+    assert decoder.feed(json.dumps(payload).encode()) == []
+    with pytest.raises(RPCError) as excinfo:
+        decoder.close()
+
+    assert excinfo.value.code == -28
+
+
+def test_mempool_stream_decoder_detects_truncation():
+    decoder = MempoolStreamDecoder()
+    decoder.feed(RAW_MEMPOOL_RESPONSE[:-20])
+
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+def test_iter_raw_mempool_streams_response(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332")
+
+    def fake_post(*args, **kwargs):
+        assert kwargs["stream"] is True
+        return DummyResponse(200, json.loads(RAW_MEMPOOL_RESPONSE))
+
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
+
+    assert [entry.vsize for entry in rpc.iter_raw_mempool()] == [141, 250]
+    stats = rpc.stats.snapshot()["getrawmempool"]
+    assert stats["calls"] == 1
+    assert stats["bytes_total"] == len(json.dumps(json.loads(RAW_MEMPOOL_RESPONSE)))
+
+
+def test_batch_records_latency_size_and_errors(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332")
+    payload = [
+        {"jsonrpc": "2.0", "id": 0, "result": {"blocks": 10}},
+        {"jsonrpc": "2.0", "id": 1, "error": {"code": -32601, "message": "Method not found"}},
+    ]
+
+    def fake_post(*args, **kwargs):
+        return DummyResponse(200, payload)
+
+    def failing_post(*args, **kwargs):
+        raise requests.ConnectTimeout("timed out")
+
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
+    rpc.batch([("getblockchaininfo", []), ("getfoo", []), ("getblockchaininfo", [])])
+    monkeypatch.setattr(rpc.pool, "post", failing_post)
+    with pytest.raises(requests.Timeout):
+        rpc.call("getpeerinfo")
+
+    stats = rpc.stats.snapshot()
+    batch = stats["batch"]
+    assert batch["calls"] == 1
+    assert batch["methods"] == 3
+    assert batch["bytes_total"] == len(json.dumps(payload))
+    assert batch["errors_rpc"] == 1
+    assert stats["getpeerinfo"]["errors_timeout"] == 1
+    rpc.stats.reset()
+    assert rpc.stats.snapshot() == {}
+
+
+def test_call_uses_rest_for_selected_methods(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332", rest_methods=["getblockchaininfo"])
+    requested = []
+
+    def fake_get(url, **kwargs):
+        requested.append(url)
+        return DummyResponse(200, {"blocks": 840000})
+
+    def fake_post(*args, **kwargs):  # pragma: no cover - indicates regression
+        raise AssertionError("REST-backed calls must not use JSON-RPC")
+
+    monkeypatch.setattr(rpc.pool, "get", fake_get)
+    monkeypatch.setattr(rpc.pool, "post", fake_post)
+
+    assert rpc.get_blockchain_info() == {"blocks": 840000}
+    assert requested == ["http://localhost:8332/rest/chaininfo.json"]
+    assert rpc.stats.snapshot()["rest:getblockchaininfo"]["calls"] == 1
+
+
+def test_abatch_mixes_rest_and_rpc_and_falls_back(monkeypatch):
+    rpc = BitcoinRPC(
+        "http://localhost:8332", rest_methods=["getblockchaininfo", "getmempoolinfo"]
+    )
+    requests_seen = []
+
+    async def fake_arequest(method, url, **kwargs):
+        requests_seen.append((method, url))
+        if url.endswith("/rest/chaininfo.json"):
+            return HTTPResult(200, b'{"blocks": 5}', None)  # type: ignore[arg-type]
+        if url.endswith("/rest/mempool/info.json"):
+            # bitcoind without -rest answers every REST path with an empty 404.
+            return HTTPResult(404, b"", None)  # type: ignore[arg-type]
+        calls = json.loads(kwargs["data"])
+        payload = [
+            {"jsonrpc": "2.0", "id": call["id"], "result": call["method"]} for call in calls
+        ]
+        return HTTPResult(200, json.dumps(payload).encode(), None)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(rpc.pool, "arequest", fake_arequest)
+
+    results = asyncio.run(
+        rpc.abatch([("getblockchaininfo", []), ("getmempoolinfo", []), ("estimatesmartfee", [3])])
+    )
+
+    assert results == [{"blocks": 5}, "getmempoolinfo", "estimatesmartfee"]
+    assert rpc.rest_methods == {"getblockchaininfo"}
+    assert sum(1 for method, _ in requests_seen if method == "POST") == 2
+
+
+def test_acall_without_cache_uses_rest(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332", rest_methods=["getblockchaininfo"])
+    requested = []
+
+    async def fake_arequest(method, url, **kwargs):
+        requested.append((method, url))
+        return HTTPResult(200, b'{"blocks": 840000}', None)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(rpc.pool, "arequest", fake_arequest)
+
+    assert rpc.cache is None
+    assert asyncio.run(rpc.acall("getblockchaininfo")) == {"blocks": 840000}
+    assert requested == [("GET", "http://localhost:8332/rest/chaininfo.json")]
+
+
+def test_rest_errors_are_returned_as_rpc_errors(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332", rest_methods=["getblock"])
+
+    async def fake_arequest(method, url, **kwargs):
+        return HTTPResult(404, b"0000 not found\r\n", None)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(rpc.pool, "arequest", fake_arequest)
+
+    (result,) = asyncio.run(rpc.abatch([("getblock", ["0000", 1])]))
+
+    assert isinstance(result, RPCError)
+    assert result.code == 404
+    assert rpc.rest_methods == {"getblock"}
+
+
+def test_iter_raw_mempool_streams_rest_contents(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332", rest_methods=["getrawmempool"])
+
+    def fake_get(url, **kwargs):
+        assert url.endswith("/rest/mempool/contents.json")
+        return DummyResponse(200, json.loads(RAW_MEMPOOL_RESPONSE)["result"])
+
+    monkeypatch.setattr(rpc.pool, "get", fake_get)
+
+    assert [entry.fee for entry in rpc.iter_raw_mempool()] == [705, 10000]
+    assert rpc.stats.snapshot()["rest:getrawmempool"]["calls"] == 1
+
+
+def test_get_block_raw_prefers_binary_rest(monkeypatch):
+    rpc = BitcoinRPC("http://localhost:8332", rest_methods=["getblock"])
+
+    def fake_get(url, **kwargs):
+        response = Response()
+        response.status_code = 200
+        response._content = b"\x01\x02\x03"
+        return response
+
+    monkeypatch.setattr(rpc.pool, "get", fake_get)
+
+    assert rpc.get_block_raw("ab" * 32) == b"\x01\x02\x03"
@@ -0,0 +1,61 @@
+import pickle
+import struct
+
+import pytest
+from test_block_decoder import _varint
+
+from collector.block_content import COUNTERS, analyze_block, content_fields, script_type
+
+SCRIPTS = {
+    "p2pkh": b"\x76\xa9\x14" + b"\x01" * 20 + b"\x88\xac",
+    "p2sh": b"\xa9\x14" + b"\x01" * 20 + b"\x87",
+    "p2wpkh": b"\x00\x14" + b"\x01" * 20,
+    "p2wsh": b"\x00\x20" + b"\x01" * 32,
+    "p2tr": b"\x51\x20" + b"\x01" * 32,
+    "p2a": b"\x51\x02\x4e\x73",
+    "p2pk": b"\x21" + b"\x02" * 33 + b"\xac",
+    "multisig": b"\x51\x21" + b"\x02" * 33 + b"\x51\xae",
+    "op_return": b"\x6a\x04" + b"memo",
+}
+
+
+def _tx(scripts: list[bytes], witness: bool = False) -> bytes:
+    body = _varint(1) + b"\x11" * 36 + _varint(0) + b"\xff" * 4
+    body += _varint(len(scripts))
+    body += b"".join(b"\x00" * 8 + _varint(len(script)) + script for script in scripts)
+    if not witness:
+        return struct.pack("<i", 2) + body + b"\x00" * 4
+    stack = _varint(2) + _varint(71) + b"\x30" * 71 + _varint(33) + b"\x02" * 33
+    return struct.pack("<i", 2) + b"\x00\x01" + body + stack + b"\x00" * 4
+
+
+@pytest.mark.parametrize("expected", sorted(SCRIPTS))
+def test_script_type_templates(expected):
+    assert script_type(SCRIPTS[expected]) == expected
+
+
+def test_analyze_block_counts_script_mix_and_witness_share(genesis_block):
+    legacy = _tx([SCRIPTS["p2pkh"], SCRIPTS["op_return"]])
+    segwit = _tx([SCRIPTS["p2tr"], SCRIPTS["p2wpkh"], b"\x52"], witness=True)
+    block = genesis_block[:80] + _varint(2) + legacy + segwit
+
+    counts = analyze_block(block)
+    fields = content_fields(counts)
+
+    assert len(pickle.dumps(counts)) < 512
+    assert len(counts) == len(COUNTERS)
+    assert fields["tx_count"] == 2
+    assert fields["segwit_txs"] == 1
+    assert fields["inputs"] == 2
+    assert fields["outputs"] == 5
+    assert fields["outputs_p2tr"] == fields["outputs_other"] == 1
+    assert fields["op_return_bytes"] == 6
+    assert fields["share_op_return"] == 0.2
+    assert fields["size"] == len(block)
+    assert fields["witness_bytes"] == 2 + 1 + 1 + 71 + 1 + 33
+    assert fields["witness_share"] == fields["witness_bytes"] / len(block)
+
+
+def test_analyze_block_rejects_truncated_blocks(genesis_block):
+    with pytest.raises(ValueError):
+        analyze_block(genesis_block[:-10])
@@ -0,0 +1,102 @@
+import hashlib
+import struct
+
+import pytest
+
+from collector.block_decoder import (
+    block_txids,
+    decode_block,
+    decode_transaction,
+    decode_txid,
+    read_varint,
+    scan_transaction,
+)
+
+
+def _varint(value: int) -> bytes:
+    if value < 0xFD:
+        return bytes([value])
+    return b"\xfd" + value.to_bytes(2, "little")
+
+
+def _tx(script_sig: bytes, witness: list[bytes] | None = None, outputs: int = 2) -> bytes:
+    body = _varint(1) + b"\x11" * 36 + _varint(len(script_sig)) + script_sig + b"\xff" * 4
+    body += _varint(outputs) + (b"\x00" * 8 + _varint(22) + b"\x00\x14" + b"\x22" * 20) * outputs
+    if witness is None:
+        return struct.pack("<i", 2) + body + b"\x00" * 4
+    stack = _varint(len(witness)) + b"".join(_varint(len(item)) + item for item in witness)
+    return struct.pack("<i", 2) + b"\x00\x01" + body + stack + b"\x00" * 4
+
+
+def test_decode_block_matches_genesis(genesis_block):
+    block = decode_block(genesis_block)
+
+    assert block.hash == "000000000019d6689c085ae165831e934ff763ae46a2a6c172b3f1b60a8ce26f"
+    assert block.time == 1231006505
+    assert block.tx_count == 1
+    assert block.size == block.stripped_size == 285
+    assert block.weight == 1140
+    assert block.height is None
+
+
+def test_decode_block_measures_witness_data_and_bip34_height():
+    coinbase = _tx(b"\x03" + (840_000).to_bytes(3, "little") + b"pool", [b"\x00" * 32])
+    spend = _tx(b"", [b"\x30" * 72, b"\x02" * 33])
+    header = struct.pack(
+        "<i32s32sIII", 0x20000000, b"\xaa" * 32, b"\x00" * 32, 1_700_000_000, 0x17034219, 7
+    )
+    raw = header + _varint(2) + coinbase + spend
+
+    block = decode_block(memoryview(raw))
+
+    witness = (2 + 1 + 1 + 32) + (2 + 1 + 1 + 72 + 1 + 33)
+    assert block.height == 840_000
+    assert block.tx_count == 2
+    assert block.size == len(raw)
+    assert block.stripped_size == len(raw) - witness
+    assert block.weight == block.stripped_size * 3 + block.size
+    assert block.prev_hash == "aa" * 32
+    assert block.hash == hashlib.sha256(hashlib.sha256(header).digest()).digest()[::-1].hex()
+
+
+def test_decode_transaction_reports_vsize():
+    legacy = decode_transaction(_tx(b"\x51"))
+    segwit = decode_transaction(_tx(b"", [b"\x30" * 71, b"\x02" * 33]))
+
+    assert legacy.weight == legacy.size * 4
+    assert legacy.vsize == legacy.size
+    assert segwit.stripped_size < segwit.size
+    assert segwit.vsize == -(-segwit.weight // 4)
+
+
+def test_decode_block_rejects_truncated_payload(genesis_block):
+    with pytest.raises(ValueError):
+        decode_block(genesis_block[:-10])
+
+
+def test_scan_transaction_visits_input_and_output_scripts():
+    raw = _tx(b"\x03\x01\x00\x00", witness=[b"\x30" * 72])
+    inputs: list[memoryview] = []
+    outputs: list[memoryview] = []
+
+    end, witness_bytes = scan_transaction(memoryview(raw), 0, inputs.append, outputs.append)
+
+    assert (end, witness_bytes) == (len(raw), 2 + 1 + 1 + 72)
+    assert [bytes(script) for script in inputs] == [b"\x03\x01\x00\x00"]
+    assert [bytes(script) for script in outputs] == [b"\x00\x14" + b"\x22" * 20] * 2
+
+
+def test_read_varint_widths():
+    assert read_varint(memoryview(b"\xfc"), 0) == (0xFC, 1)
+    assert read_varint(memoryview(b"\xfd\x00\x01"), 0) == (0x100, 3)
+    assert read_varint(memoryview(b"\xfe\x00\x00\x01\x00"), 0) == (0x10000, 5)
+
+
+def test_txids_hash_the_non_witness_serialization(genesis_block):
+    (coinbase,) = block_txids(genesis_block)
+    assert coinbase.hex() == "4a5e1e4baab89f3a32518a88c31bc87f618f76673e2cc77ab2127b7afdeda33b"
+
+    legacy = _tx(b"\x51")
+    segwit = _tx(b"\x51", witness=[b"\x30" * 72, b"\x02" * 33])
+    expected = hashlib.sha256(hashlib.sha256(legacy).digest()).digest()[::-1]
+    assert decode_txid(legacy) == decode_txid(memoryview(segwit)) == expected
@@ -0,0 +1,73 @@
+from collector.cardinality import CardinalityGovernor, HyperLogLog
+from collector.influx import Point
+
+
+def _coords(ip: str, country: str = "DE") -> Point:
+    return Point(
+        "peer_geo_coords",
+        {"direction": "inbound", "ip": ip, "country": country},
+        {"peer_count": 1.0, "latitude": 52.5, "longitude": 13.4},
+    )
+
+
+def _asn(asn: str, count: float) -> Point:
+    return Point("peer_asn", {"direction": "inbound", "asn": asn}, {"peer_count": count})
+
+
+def test_hyperloglog_estimates_distinct_values():
+    sketch = HyperLogLog()
+    for _ in range(3):
+        for index in range(20_000):
+            sketch.add(f"10.0.{index // 256}.{index % 256}")
+
+    assert abs(sketch.count() - 20_000) < 20_000 * 0.05
+
+    small = HyperLogLog()
+    for index in range(100):
+        small.add(str(index))
+    assert abs(small.count() - 100) < 2
+
+
+def test_governor_folds_values_beyond_budget_into_other():
+    governor = CardinalityGovernor({"peer_geo_coords.ip": 2})
+    untouched = Point("blockchain").field("blocks", 1.0)
+
+    output = governor.apply([_coords("1.1.1.1"), _coords("2.2.2.2"), untouched])
+    output += governor.apply([_coords("3.3.3.3"), _coords("4.4.4.4"), _coords("1.1.1.1")])
+
+    ips = sorted(point.tags["ip"] for point in output if point.measurement == "peer_geo_coords")
+    assert ips == ["1.1.1.1", "1.1.1.1", "2.2.2.2", "other"]
+    (other,) = [point for point in output if point.tags.get("ip") == "other"]
+    assert other.fields == {"peer_count": 2.0}
+    assert other.tags == {"direction": "inbound", "ip": "other", "country": "DE"}
+    assert untouched in output
+    status = governor.status()[("peer_geo_coords", "ip")]
+    assert status["admitted"] == 2.0
+    assert status["folded"] == 2.0
+    assert round(status["distinct"]) == 4
+
+
+def test_governor_admits_heaviest_values_first():
+    governor = CardinalityGovernor({"peer_asn.asn": 2})
+
+    output = governor.apply([_asn("AS1 Small", 1), _asn("AS2 Big", 9), _asn("AS3 Mid", 4)])
+
+    assert {point.tags["asn"]: point.fields["peer_count"] for point in output} == {
+        "AS2 Big": 9.0,
+        "AS3 Mid": 4.0,
+        "other": 1.0,
+    }
+
+
+def test_governor_frees_slots_of_values_not_seen_for_ttl(clock):
+    governor = CardinalityGovernor({"peer_geo_coords.ip": 1}, ttl=60, clock=clock)
+
+    governor.apply([_coords("1.1.1.1")])
+    clock.now += 30
+    (folded,) = governor.apply([_coords("2.2.2.2")])
+    clock.now += 70
+    (admitted,) = governor.apply([_coords("2.2.2.2")])
+
+    assert folded.tags["ip"] == "other"
+    assert admitted.tags["ip"] == "2.2.2.2"
+    assert admitted.fields["latitude"] == 52.5
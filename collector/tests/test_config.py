@@ -39,3 +39,103 @@ def test_influx_tls_verify_coercion(monkeypatch):
     monkeypatch.setenv("INFLUX_TLS_VERIFY", "1")
     config = CollectorConfig()
     assert config.influx_tls_verify is True
+
+
+def test_zmq_mirror_requires_zmq(monkeypatch):
+    monkeypatch.setenv("MEMPOOL_HIST_SOURCE", "zmq_mirror")
+    monkeypatch.setenv("ENABLE_ZMQ", "0")
+    try:
+        CollectorConfig()
+    except ValueError as exc:
+        assert "ENABLE_ZMQ" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("Config validation should have failed")
+
+    monkeypatch.setenv("ENABLE_ZMQ", "1")
+    assert CollectorConfig().mempool_hist_source == "zmq_mirror"
+
+
+def test_bitcoin_nodes_inherit_top_level_settings(monkeypatch):
+    monkeypatch.setenv("BITCOIN_RPC_USER", "monitor")
+    monkeypatch.setenv(
+        "BITCOIN_NODES",
+        '[{"name": "main"}, {"name": "signet", "bitcoin_rpc_port": 38332,'
+        ' "bitcoin_network": "signet"}]',
+    )
+
+    nodes = CollectorConfig().node_configs()
+
+    assert list(nodes) == ["main", "signet"]
+    assert nodes["main"].bitcoin_rpc_port == 8332
+    assert nodes["signet"].bitcoin_rpc_port == 38332
+    assert nodes["signet"].bitcoin_network == "signet"
+    assert nodes["signet"].bitcoin_rpc_user == "monitor"
+
+
+def test_bitcoin_nodes_default_to_single_node(monkeypatch):
+    monkeypatch.setenv("BITCOIN_NETWORK", "testnet")
+    config = CollectorConfig()
+
+    assert config.node_configs() == {"testnet": config}
+
+
+def test_bitcoin_nodes_require_unique_names(monkeypatch):
+    monkeypatch.setenv("BITCOIN_NODES", '[{"name": "a"}, {"name": "a"}]')
+    try:
+        CollectorConfig()
+    except ValueError as exc:
+        assert "unique" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("Config validation should have failed")
+
+
+def test_influx_destinations_inherit_top_level_settings(monkeypatch):
+    monkeypatch.setenv("INFLUX_BUCKET", "btc")
+    monkeypatch.setenv(
+        "INFLUX_DESTINATIONS",
+        '[{"name": "local"}, {"name": "central", "influx_url": "https://central:8086",'
+        ' "influx_token": "secret"}]',
+    )
+
+    destinations = CollectorConfig().destination_configs()
+
+    assert list(destinations) == ["local", "central"]
+    assert destinations["local"].influx_url == "http://influxdb:8086"
+    assert destinations["central"].influx_url == "https://central:8086"
+    assert destinations["central"].influx_token == "secret"
+    assert destinations["central"].influx_bucket == "btc"
+
+
+def test_aggregation_lists_parse_and_keep_raw_must_be_aggregated(monkeypatch):
+    monkeypatch.setenv("AGGREGATE_MEASUREMENTS", "tx_rate, block_latency")
+    monkeypatch.setenv("AGGREGATE_QUANTILES", "0.5,0.99")
+    config = CollectorConfig()
+
+    assert config.aggregate_measurements == ["tx_rate", "block_latency"]
+    assert config.aggregate_quantiles == [0.5, 0.99]
+
+    monkeypatch.setenv("AGGREGATE_KEEP_RAW", "mempool")
+    try:
+        CollectorConfig()
+    except ValueError as exc:
+        assert "AGGREGATE_KEEP_RAW" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("Config validation should have failed")
+
+
+def test_cardinality_budgets_are_opt_in_and_parse(monkeypatch):
+    assert CollectorConfig().cardinality_budgets == {}
+
+    monkeypatch.setenv("CARDINALITY_BUDGETS", "peer_geo_coords.ip=50, peer_asn.asn=20")
+    assert CollectorConfig().cardinality_budgets == {"peer_geo_coords.ip": 50, "peer_asn.asn": 20}
+
+    monkeypatch.setenv("CARDINALITY_BUDGETS", "")
+    assert CollectorConfig().cardinality_budgets == {}
+
+    monkeypatch.setenv("CARDINALITY_BUDGETS", "peer_asn=20")
+    try:
+        CollectorConfig()
+    except ValueError as exc:
+        assert "CARDINALITY_BUDGETS" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("Config validation should have failed")
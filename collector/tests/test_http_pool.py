@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from collector.http_pool import ConnectionPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        return
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_reuses_connections(server_url):
+    pool = ConnectionPool()
+
+    for _ in range(3):
+        pool.get(f"{server_url}/stats", timeout=5).raise_for_status()
+
+    stats = next(iter(pool.stats().values()))
+    assert stats["requests"] == 3
+    assert stats["connections"] == 1
+    assert stats["reused"] == 2
+    pool.close()
+
+
+def test_pool_evicts_idle_sessions(server_url, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("collector.http_pool.time.monotonic", lambda: now[0])
+    pool = ConnectionPool(idle_timeout=30)
+
+    pool.get(server_url, timeout=5)
+    now[0] = 100.0
+    pool.get(server_url, timeout=5)
+
+    stats = next(iter(pool.stats().values()))
+    assert stats["idle_evictions"] == 1
+    assert stats["connections"] == 2
+    pool.close()
+
+
+def test_pool_reuses_async_connections(server_url):
+    pool = ConnectionPool()
+
+    async def fetch_three() -> None:
+        for _ in range(3):
+            response = await pool.arequest("GET", f"{server_url}/stats", timeout=5)
+            response.raise_for_status()
+            assert response.json() == {}
+        await pool.aclose()
+
+    asyncio.run(fetch_three())
+
+    stats = next(iter(pool.stats().values()))
+    assert stats["requests"] == 3
+    assert stats["connections"] == 1
+
+
+def test_pool_evicts_idle_async_sessions(server_url, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("collector.http_pool.time.monotonic", lambda: now[0])
+    pool = ConnectionPool(idle_timeout=30)
+
+    async def fetch_twice() -> None:
+        await pool.arequest("GET", server_url, timeout=5)
+        first = pool._endpoints[next(iter(pool._endpoints))].async_session
+        now[0] = 100.0
+        await pool.arequest("GET", server_url, timeout=5)
+        assert first is not None and first.closed
+        await pool.aclose()
+
+    asyncio.run(fetch_twice())
+
+    stats = next(iter(pool.stats().values()))
+    assert stats["idle_evictions"] == 1
+    assert stats["connections"] == 2
+
+
+def test_pool_closes_sessions_of_other_loops(server_url):
+    pool = ConnectionPool()
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    sessions = []
+
+    async def fetch() -> None:
+        await pool.arequest("GET", server_url, timeout=5)
+        sessions.append(pool._endpoints[next(iter(pool._endpoints))].async_session)
+
+    asyncio.run_coroutine_threadsafe(fetch(), other).result(timeout=5)
+
+    async def fetch_and_close() -> None:
+        await fetch()
+        await pool.aclose()
+
+    asyncio.run(fetch_and_close())
+    other.call_soon_threadsafe(other.stop)
+    thread.join(timeout=5)
+    other.close()
+
+    assert sessions[0] is not sessions[1]
+    assert sessions[0].closed and sessions[1].closed
+
+
+class _FlakySession:
+    def __init__(self, fail: bool) -> None:
+        self.fail = fail
+        self.adapters: dict = {}
+
+    def request(self, method, url, **kwargs):
+        if self.fail:
+            raise requests.ConnectionError("connection reset")
+        return "ok"
+
+    def close(self) -> None:
+        return
+
+
+def test_pool_reconnects_after_stale_connection(monkeypatch):
+    sessions = iter([_FlakySession(False), _FlakySession(False)])
+    monkeypatch.setattr("collector.http_pool._new_session", lambda size: next(sessions))
+    pool = ConnectionPool()
+
+    assert pool.post("http://node:8332") == "ok"
+    pool._endpoints["http://node:8332"].session = _FlakySession(True)
+    assert pool.post("http://node:8332") == "ok"
+
+    assert pool.stats()["http://node:8332"]["reconnects"] == 1
+
+
+def test_pool_does_not_retry_fresh_connection(monkeypatch):
+    monkeypatch.setattr("collector.http_pool._new_session", lambda size: _FlakySession(True))
+    pool = ConnectionPool()
+
+    with pytest.raises(requests.ConnectionError):
+        pool.post("http://node:8332")
+
+    assert pool.stats()["http://node:8332"]["reconnects"] == 0
@@ -1,10 +1,14 @@
+import asyncio
+import gzip
 from typing import cast
 
+import aiohttp
 import pytest
 import requests
 from requests import Response
 
-from collector.influx import InfluxWriteError, InfluxWriter, Point
+from collector.influx import BatchWriter, Destination, InfluxWriteError, InfluxWriter, Point
+from collector.spool import WriteSpool
 
 
 class DummyResponse(Response):
@@ -24,24 +28,50 @@ def test_write_points_raises_on_http_error(monkeypatch):
     def _fake_post(*args, **kwargs):
         return DummyResponse(401, "unauthorized")
 
-    monkeypatch.setattr("collector.influx.requests.post", _fake_post)
+    monkeypatch.setattr(writer.pool, "post", _fake_post)
 
     with pytest.raises(InfluxWriteError):
         writer.write_points([Point("measurement").field("value", 1)])
 
 
+def test_write_errors_carry_the_http_status(monkeypatch):
+    writer = InfluxWriter("http://localhost:8086", "token", "org", "bucket")
+    monkeypatch.setattr(writer.pool, "post", lambda *args, **kwargs: DummyResponse(400, "bad"))
+
+    with pytest.raises(InfluxWriteError) as rejected:
+        writer.write_points([Point("measurement").field("value", 1)])
+
+    assert rejected.value.status == 400
+    assert not rejected.value.retryable
+    assert InfluxWriteError("throttled", 429).retryable
+    assert InfluxWriteError("unavailable", 503).retryable
+    assert InfluxWriteError("unreachable").retryable
+
+
 def test_write_points_raises_on_connection_error(monkeypatch):
     writer = InfluxWriter("http://localhost:8086", "token", "org", "bucket")
 
     def _fake_post(*args, **kwargs):
         raise requests.ConnectionError("connection failed")
 
-    monkeypatch.setattr("collector.influx.requests.post", _fake_post)
+    monkeypatch.setattr(writer.pool, "post", _fake_post)
 
     with pytest.raises(InfluxWriteError):
         writer.write_points([Point("measurement").field("value", 1)])
 
 
+def test_awrite_points_raises_on_connection_error(monkeypatch):
+    writer = InfluxWriter("http://localhost:8086", "token", "org", "bucket")
+
+    async def _fake_arequest(*args, **kwargs):
+        raise aiohttp.ClientConnectionError("connection failed")
+
+    monkeypatch.setattr(writer.pool, "arequest", _fake_arequest)
+
+    with pytest.raises(InfluxWriteError):
+        asyncio.run(writer.awrite_points([Point("measurement").field("value", 1)]))
+
+
 def test_write_points_noop_without_fields(monkeypatch):
     writer = InfluxWriter("http://localhost:8086", "token", "org", "bucket")
 
@@ -52,7 +82,7 @@ def test_write_points_noop_without_fields(monkeypatch):
         called = True
         return DummyResponse(204, "")
 
-    monkeypatch.setattr("collector.influx.requests.post", _fake_post)
+    monkeypatch.setattr(writer.pool, "post", _fake_post)
 
     writer.write_points([Point("measurement")])
 
@@ -71,7 +101,198 @@ def test_point_to_line_escapes_special_characters():
 
     expected = (
         "peer\\ stats,asn=AS64500\\ Example,path=/var/lib/bitcoin\\,mainnet "
-        "latency\\ ms=1.23,peers=8"
+        "latency\\ ms=1.23,peers=8i"
     )
 
     assert line == expected
+
+
+def test_point_to_line_types_field_values():
+    point = Point("types", tags={"a=b": "x\\y"}, fields={"f": 1.0, "i": -3, "b": True, "n": False})
+
+    assert point.to_line() == "types,a\\=b=x\\\\y f=1.0,i=-3i,b=true,n=false"
+
+
+def test_write_points_sends_gzip_body(monkeypatch):
+    writer = InfluxWriter("http://localhost:8086", "token", "org", "bucket")
+    sent = {}
+
+    def _fake_post(*args, **kwargs):
+        sent.update(kwargs)
+        return DummyResponse(204, "")
+
+    monkeypatch.setattr(writer.pool, "post", _fake_post)
+
+    writer.write_points([Point("measurement").field("value", 1.5)])
+
+    assert sent["headers"]["Content-Encoding"] == "gzip"
+    assert gzip.decompress(sent["data"]) == b"measurement value=1.5"
+
+
+def test_point_to_line_appends_timestamp_in_precision():
+    point = Point("blockchain", time=1_700_000_000_123_456_789).field("best_height", 1.0)
+
+    assert point.to_line() == "blockchain best_height=1.0 1700000000"
+    assert point.to_line("ms") == "blockchain best_height=1.0 1700000000123"
+
+
+class RecordingWriter:
+    precision = "ns"
+
+    def __init__(
+        self, failures: int = 0, delay: float = 0.0, rejected: frozenset[bytes] = frozenset()
+    ) -> None:
+        self.failures = failures
+        self.delay = delay
+        self.rejected = rejected
+        self.attempts = 0
+        self.bodies: list[bytes] = []
+
+    async def awrite_lines(self, body: bytes) -> None:
+        await asyncio.sleep(self.delay)
+        self.attempts += 1
+        if body in self.rejected:
+            raise InfluxWriteError("bad request", 400)
+        if self.failures:
+            self.failures -= 1
+            raise InfluxWriteError("down", 503)
+        self.bodies.append(body)
+
+
+def test_batch_writer_stamps_batches_and_drops_when_full():
+    sink = RecordingWriter()
+    writer = BatchWriter([Destination(sink)], batch_size=2, max_points=3)  # type: ignore[arg-type]
+    stamped = Point("event", time=5).field("value", 1.0)
+
+    writer.submit([Point("a").field("v", 1.0), Point("empty"), stamped], timestamp=42)
+    writer.submit([Point("b").field("v", 1.0), Point("c").field("v", 1.0)], timestamp=43)
+    asyncio.run(writer.flush())
+
+    assert sink.bodies == [b"a v=1.0 42\nevent value=1.0 5", b"b v=1.0 43"]
+    assert writer.status() == {
+        "default": {
+            "queue_depth": 0.0,
+            "dropped": 1.0,
+            "written": 3.0,
+            "failed": 0.0,
+            "batches": 2.0,
+        }
+    }
+
+
+def test_batch_writer_flushes_after_linger_and_retries():
+    sink = RecordingWriter(failures=1)
+    destination = Destination(sink, backoff=0.01)  # type: ignore[arg-type]
+    writer = BatchWriter([destination], batch_size=100, linger=0.01)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(writer.run())
+        writer.submit([Point("a").field("v", 1.0)])
+        for _ in range(100):
+            if sink.bodies:
+                break
+            await asyncio.sleep(0.01)
+        await writer.aclose(task)
+
+    asyncio.run(scenario())
+
+    assert len(sink.bodies) == 1
+    assert writer.status()["default"]["failed"] == 0
+
+
+def test_batch_writer_gives_up_after_attempts():
+    sink = RecordingWriter(failures=5)
+    writer = BatchWriter([Destination(sink, attempts=2, backoff=0)])  # type: ignore[arg-type]
+
+    writer.submit([Point("a").field("v", 1.0)])
+    asyncio.run(writer.flush())
+
+    assert writer.status()["default"]["failed"] == 1
+    assert not sink.bodies
+
+
+def test_batch_writer_fans_out_encoded_batches_independently():
+    local, central = RecordingWriter(), RecordingWriter(delay=0.5)
+    writer = BatchWriter(
+        [
+            Destination(local, name="local"),  # type: ignore[arg-type]
+            Destination(central, name="central", max_points=1),  # type: ignore[arg-type]
+        ],
+        batch_size=1,
+        linger=0.01,
+    )
+
+    async def scenario() -> None:
+        task = asyncio.create_task(writer.run())
+        writer.submit([Point("a", time=1).field("v", 1.0)])
+        writer.submit([Point("b", time=2).field("v", 1.0)])
+        for _ in range(20):
+            if len(local.bodies) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert not central.bodies  # the slow destination does not hold back the other
+        await writer.aclose(task)
+
+    asyncio.run(scenario())
+
+    assert local.bodies == [b"a v=1.0 1", b"b v=1.0 2"]
+    assert central.bodies == [b"a v=1.0 1"]
+    assert local.bodies[0] is central.bodies[0]  # encoded once, shared
+    assert writer.status()["central"]["dropped"] == 1
+
+
+def test_batch_writer_spools_failed_batches_and_replays_them(tmp_path):
+    sink = RecordingWriter(failures=2)
+    destination = Destination(
+        sink, attempts=2, backoff=0, idle=0.01, spool=WriteSpool(tmp_path)  # type: ignore[arg-type]
+    )
+    writer = BatchWriter([destination], linger=0.01)
+
+    writer.submit([Point("a", time=3).field("v", 1.0)])
+    asyncio.run(writer.flush())
+    assert writer.status()["default"]["spooled_points"] == 1
+    assert writer.status()["default"]["failed"] == 0
+
+    async def scenario() -> None:
+        task = asyncio.create_task(writer.run())
+        writer.submit([Point("b", time=4).field("v", 2.0)])  # replay waits for a live write
+        for _ in range(100):
+            if len(sink.bodies) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await writer.aclose(task)
+
+    # A fresh spool over the same directory picks the backlog up after a restart.
+    destination.spool = WriteSpool(tmp_path)
+    asyncio.run(scenario())
+
+    assert sink.bodies == [b"b v=2.0 4", b"a v=1.0 3"]
+    assert writer.status()["default"]["spool_bytes"] == 0
+
+
+def test_batch_writer_drops_rejected_batches_and_skips_them_on_replay(tmp_path):
+    spool = WriteSpool(tmp_path)
+    spool.append(b"poisoned v=1.0 1")
+    spool.append(b"a v=1.0 2")
+    sink = RecordingWriter(rejected=frozenset({b"poisoned v=1.0 1", b"b v=1i 3"}))
+    destination = Destination(sink, backoff=0, idle=0.01, spool=spool)  # type: ignore[arg-type]
+    writer = BatchWriter([destination], linger=0.01)
+
+    writer.submit([Point("b", time=3).field("v", 1)])  # e.g. a field type conflict
+    asyncio.run(writer.flush())
+    assert sink.attempts == 1  # a 4xx is not retried
+    assert writer.status()["default"]["failed"] == 1
+    assert writer.status()["default"]["spooled_points"] == 0
+
+    async def scenario() -> None:
+        task = asyncio.create_task(writer.run())
+        for _ in range(100):
+            if sink.bodies:
+                break
+            await asyncio.sleep(0.01)
+        await writer.aclose(task)
+
+    asyncio.run(scenario())
+
+    assert sink.bodies == [b"a v=1.0 2"]
+    assert writer.status()["default"]["spool_bytes"] == 0
@@ -1,28 +1,94 @@
+import asyncio
+import json
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from types import SimpleNamespace
 
 import pytest
 
+from collector.bitcoin_rpc import MempoolEntry, RPCError
+from collector.block_content import analyze_block
 from collector.config import CollectorConfig
-from collector.main import CollectorService, _build_rpc, _read_token_file, _resolve_log_level
+from collector.http_pool import HTTPResult
+from collector.influx import Point
+from collector.main import (
+    CollectorService,
+    _build_destinations,
+    _build_rpc,
+    _read_token_file,
+    _resolve_log_level,
+)
+from collector.metrics import BlockIntervalTracker
+from collector.rpc_stats import RPCStats
+from collector.spool import WriteSpool
 
 
 class DummyRPC:
+    cache = None
+
     def __init__(self, peers: list[dict]) -> None:
         self._peers = peers
         self.calls = 0
+        self.stats = RPCStats()
 
-    def get_peer_info(self) -> list[dict]:
+    async def abatch(self, calls) -> list:
+        if not calls:
+            return []
         self.calls += 1
-        return self._peers
+        responses = {"getpeerinfo": self._peers}
+        return [responses[method] for method, _ in calls]
 
 
 class DummyInflux:
+    precision = "ns"
+
     def __init__(self) -> None:
         self.writes: list[list] = []
 
-    def write_points(self, points) -> None:
-        self.writes.append(list(points))
+    async def awrite_lines(self, body: bytes) -> None:
+        self.writes.append([_parse_line(line) for line in body.decode().split("\n")])
+
+    def close(self) -> None:
+        pass
+
+
+def _split(text: str, separator: str) -> list[str]:
+    parts, current, escaped = [], "", False
+    for char in text:
+        if escaped:
+            current, escaped = current + char, False
+        elif char == "\\":
+            escaped = True
+        elif char == separator:
+            parts, current = parts + [current], ""
+        else:
+            current += char
+    return parts + [current]
+
+
+def _parse_line(line: str) -> Point:
+    """Turn a line written by the service back into a Point for assertions."""
+
+    series, fields, stamp = _split(line, " ")
+    measurement, *tags = _split(series, ",")
+    point = Point(measurement, time=int(stamp))
+    for tag in tags:
+        key, value = tag.split("=", 1)
+        point.tag(key, value)
+    for field in _split(fields, ","):
+        key, value = field.split("=", 1)
+        point.field(key, int(value[:-1]) if value.endswith("i") else float(value))
+    return point
+
+
+def _fulcrum(payload: dict) -> SimpleNamespace:
+    async def afetch() -> dict:
+        return payload
+
+    return SimpleNamespace(afetch=afetch)
 
 
 def test_build_rpc_prefers_explicit_cookie(tmp_path, monkeypatch):
@@ -78,8 +144,8 @@ def _build_service(
     ]
     fake_rpc = DummyRPC(peers)
     fake_influx = DummyInflux()
-    monkeypatch.setattr("collector.main._build_rpc", lambda config: fake_rpc)
-    monkeypatch.setattr("collector.main._build_influx", lambda config: fake_influx)
+    monkeypatch.setattr("collector.main._build_rpc", lambda config, pool=None: fake_rpc)
+    monkeypatch.setattr("collector.main._build_influx", lambda config, pool=None: fake_influx)
     config = CollectorConfig(
         enable_peer_quality=enable_peer_quality,
         enable_process_metrics=enable_process_metrics,
@@ -87,18 +153,131 @@ def _build_service(
         bitcoin_chainstate_dir=bitcoin_chainstate_dir,
     )
     service = CollectorService(config)
-    service.fulcrum = SimpleNamespace(fetch=lambda: {})  # type: ignore[assignment]
+    service.nodes[0].fulcrum = _fulcrum({})  # type: ignore[assignment]
     return service, fake_rpc, fake_influx
 
 
+def _scrape(service: CollectorService, loop: str) -> None:
+    async def scrape() -> None:
+        await getattr(service, f"collect_{loop}")()
+        await service.writer.flush()
+
+    asyncio.run(scrape())
+
+
+class FastRPC:
+    def __init__(self, responses: list) -> None:
+        self.responses = responses
+        self.batches: list[list] = []
+
+    async def abatch(self, calls) -> list:
+        self.batches.append(list(calls))
+        return self.responses
+
+
+def test_collect_fast_uses_single_batch(monkeypatch):
+    service, _, influx = _build_service(monkeypatch, enable_peer_quality=False)
+    rpc = FastRPC(
+        [
+            {"blocks": 100, "headers": 101},
+            {"size": 5, "bytes": 2_000_000},
+            {"feerate": 0.0002},
+            RPCError(code=-32603, message="Insufficient data or no feerate found"),
+        ]
+    )
+    service.nodes[0].rpc = rpc  # type: ignore[assignment]
+
+    _scrape(service, "fast")
+
+    assert len(rpc.batches) == 1
+    assert [method for method, _ in rpc.batches[0]] == [
+        "getblockchaininfo",
+        "getmempoolinfo",
+        "estimatesmartfee",
+        "estimatesmartfee",
+    ]
+    mempool = next(point for point in influx.writes[0] if point.measurement == "mempool")
+    assert mempool.fields["fee_fast"] == pytest.approx(20.0)
+    assert mempool.fields["fee_slow"] == 0.0
+
+
+def test_rawmempool_histogram_consumes_stream(monkeypatch):
+    service, _, _ = _build_service(monkeypatch, enable_peer_quality=False)
+    service.nodes[0].config.mempool_hist_source = "core_rawmempool"
+
+    class StreamRPC:
+        async def aiter_raw_mempool(self):
+            for fee, vsize in [(705, 141), (900, 100), (10_000, 250)]:
+                yield MempoolEntry("00" * 32, fee, vsize, 0)
+
+    service.nodes[0].rpc = StreamRPC()  # type: ignore[assignment]
+
+    service.nodes[0].hist_edges = [5.0, 10.0, 20.0]
+
+    points = asyncio.run(service.nodes[0]._collect_mempool_histogram())
+
+    by_name = {point.measurement: point.fields for point in points}
+    assert by_name["mempool_hist"] == {"0-5": 0.0, "5-10": 2.0, "10-20": 0.0, "20+": 1.0}
+    assert by_name["mempool_hist_vsize"]["5-10"] == 241.0
+
+
+def test_collect_slow_runs_independent_calls_concurrently(monkeypatch):
+    service, _, influx = _build_service(monkeypatch, enable_peer_quality=True)
+
+    class SlowRPC(DummyRPC):
+        async def abatch(self, calls) -> list:
+            await asyncio.sleep(0.2)
+            return await super().abatch(calls)
+
+    async def slow_fetch() -> dict:
+        await asyncio.sleep(0.2)
+        return {"tip_height": 1, "clients": 2}
+
+    service.nodes[0].rpc = SlowRPC([])  # type: ignore[assignment]
+    service.nodes[0].fulcrum = SimpleNamespace(afetch=slow_fetch)  # type: ignore[assignment]
+
+    start = time.perf_counter()
+    _scrape(service, "slow")
+
+    assert time.perf_counter() - start < 0.35
+    assert any(point.measurement == "fulcrum" for point in influx.writes[0])
+
+
 def test_collect_slow_writes_peers_when_enabled(monkeypatch):
     service, rpc, influx = _build_service(monkeypatch, enable_peer_quality=True)
 
-    service.collect_slow()
+    rpc.stats.observe("getpeerinfo", 0.02, size=512)
+
+    _scrape(service, "slow")
 
     assert rpc.calls == 1
     assert influx.writes
     assert any(point.measurement == "peers" for point in influx.writes[0])
+    rpc_points = [point for point in influx.writes[0] if point.measurement == "collector_rpc"]
+    assert [point.tags["method"] for point in rpc_points] == ["getpeerinfo"]
+    assert rpc.stats.snapshot() == {}
+
+
+def test_collect_slow_records_getpeerinfo_rpc_stats(monkeypatch):
+    fake_influx = DummyInflux()
+    monkeypatch.setattr("collector.main._build_influx", lambda config, pool=None: fake_influx)
+    service = CollectorService(CollectorConfig(enable_process_metrics=False))
+    node = service.nodes[0]
+    node.fulcrum = _fulcrum({})  # type: ignore[assignment]
+
+    async def fake_arequest(method, url, **kwargs):
+        calls = json.loads(kwargs["data"])
+        payload = [{"jsonrpc": "2.0", "id": call["id"], "result": []} for call in calls]
+        return HTTPResult(200, json.dumps(payload).encode(), None)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(node.rpc.pool, "arequest", fake_arequest)
+
+    _scrape(service, "slow")
+
+    (written,) = fake_influx.writes
+    rpc_points = [point for point in written if point.measurement == "collector_rpc"]
+    assert [point.tags["method"] for point in rpc_points] == ["getpeerinfo"]
+    assert rpc_points[0].fields["methods"] == 1
 
 
 def test_collect_slow_enriches_geoip_when_enabled(monkeypatch):
@@ -112,10 +291,10 @@ def test_collect_slow_enriches_geoip_when_enabled(monkeypatch):
         def lookup(self, ip):
             return {"country": "US", "asn": "AS64500 Example"}
 
-    service.geoip = DummyGeoIP()  # type: ignore[assignment]
+    service.nodes[0].geoip = DummyGeoIP()  # type: ignore[assignment]
     service.config.enable_asn_stats = True
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert any(point.measurement == "peer_geo" for point in influx.writes[0])
     assert any(point.measurement == "peer_asn" for point in influx.writes[0])
@@ -124,7 +303,7 @@ def test_collect_slow_enriches_geoip_when_enabled(monkeypatch):
 def test_collect_slow_skips_peers_when_disabled(monkeypatch):
     service, rpc, influx = _build_service(monkeypatch, enable_peer_quality=False)
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert rpc.calls == 0
     assert influx.writes
@@ -144,7 +323,7 @@ def test_collect_slow_skips_filesystem_when_path_missing(monkeypatch):
         bitcoin_chainstate_dir="/nonexistent/path",
     )
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert rpc.calls == 0
     assert influx.writes
@@ -159,7 +338,7 @@ def test_collect_slow_skips_filesystem_when_path_disabled(monkeypatch):
         bitcoin_chainstate_dir=None,
     )
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert rpc.calls == 0
     assert influx.writes
@@ -175,7 +354,7 @@ def test_collect_slow_skips_process_metrics_when_process_missing(monkeypatch):
         enable_process_metrics=True,
     )
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert rpc.calls == 0
     assert influx.writes
@@ -184,9 +363,9 @@ def test_collect_slow_skips_process_metrics_when_process_missing(monkeypatch):
 
 def test_collect_slow_skips_fulcrum_when_url_blank(monkeypatch):
     service, rpc, influx = _build_service(monkeypatch, enable_peer_quality=False)
-    service.fulcrum = None  # type: ignore[assignment]
+    service.nodes[0].fulcrum = None  # type: ignore[assignment]
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert rpc.calls == 0
     assert influx.writes
@@ -194,14 +373,14 @@ def test_collect_slow_skips_fulcrum_when_url_blank(monkeypatch):
 
 def test_collect_slow_handles_nested_fulcrum_payload(monkeypatch):
     service, rpc, influx = _build_service(monkeypatch, enable_peer_quality=False)
-    service.fulcrum = SimpleNamespace(
-        fetch=lambda: {
+    service.nodes[0].fulcrum = _fulcrum(
+        {
             "daemon_height": 123,
             "clients": {"tcp": 2, "ssl": 3, "ws": "ignored"},
         }
     )
 
-    service.collect_slow()
+    _scrape(service, "slow")
 
     assert rpc.calls == 0
     assert influx.writes
@@ -244,3 +423,160 @@ def test_read_token_file_uses_bootstrap_path(monkeypatch, tmp_path):
     monkeypatch.setattr("builtins.open", fake_open)
 
     assert _read_token_file() == "abc123"
+
+
+def test_prometheus_only_service_feeds_registry_without_influx(monkeypatch):
+    fake_influx = DummyInflux()
+    monkeypatch.setattr("collector.main._build_rpc", lambda config, pool=None: DummyRPC([]))
+    monkeypatch.setattr("collector.main._build_influx", lambda config, pool=None: fake_influx)
+    service = CollectorService(
+        CollectorConfig(
+            enable_influx=False,
+            enable_prometheus=True,
+            enable_peer_quality=False,
+            enable_process_metrics=False,
+        )
+    )
+    service.nodes[0].fulcrum = _fulcrum({})  # type: ignore[assignment]
+
+    _scrape(service, "slow")
+
+    body = service.registry.render().decode() if service.registry else ""
+    assert "bitcoin_collector_prometheus_series" in body
+    assert "bitcoin_fulcrum_tip_height 0.0" in body
+    assert not fake_influx.writes
+
+
+def test_collect_fast_tags_nodes_and_isolates_failures(monkeypatch):
+    fake_influx = DummyInflux()
+    monkeypatch.setattr("collector.main._build_influx", lambda config, pool=None: fake_influx)
+    monkeypatch.setenv(
+        "BITCOIN_NODES",
+        '[{"name": "main"}, {"name": "signet", "bitcoin_network": "signet"}]',
+    )
+    service = CollectorService(CollectorConfig(enable_peer_quality=False))
+    main, signet = service.nodes
+    main.rpc = FastRPC(  # type: ignore[assignment]
+        [{"blocks": 100, "headers": 100}, {"size": 1, "bytes": 250}, {}, {}]
+    )
+
+    async def unreachable() -> list:
+        raise ConnectionError("node down")
+
+    monkeypatch.setattr(signet, "collect_fast", unreachable)
+
+    _scrape(service, "fast")
+
+    (written,) = fake_influx.writes
+    assert {point.tags["node"] for point in written} == {"main"}
+    blockchain = next(point for point in written if point.measurement == "blockchain")
+    assert blockchain.tags["network"] == "mainnet"
+    assert service.http is main.http is signet.http
+
+
+def test_rawblock_notification_publishes_block_point(monkeypatch, genesis_block):
+    service, _, _ = _build_service(monkeypatch, enable_peer_quality=False)
+    node = service.nodes[0]
+    node.block_intervals = BlockIntervalTracker()
+    published: list[list] = []
+    node.publish = published.append
+
+    node._on_zmq_message("rawblock", memoryview(genesis_block))
+
+    (points,) = published
+    assert points[0].measurement == "block"
+    assert points[0].tags == {"network": "mainnet"}
+    assert points[0].fields["weight"] == 1140.0
+    assert points[0].fields["header_time"] == 1231006505.0
+    assert "time" not in points[0].fields  # reserved by InfluxDB
+
+
+def test_block_notification_triggers_fast_scrape(monkeypatch, genesis_block):
+    service, fake_rpc, _ = _build_service(monkeypatch, enable_peer_quality=False)
+    service.config.enable_event_scrape = True
+    service.config.scrape_interval_fast = 0
+    service.config.scrape_interval_heartbeat = 60
+    node = service.nodes[0]
+    node.on_block = service.notify_block
+    tips: list[str] = []
+    fake_rpc.cache = SimpleNamespace(note_best_block=tips.append)
+    scrapes: list[float] = []
+
+    async def collect_fast() -> None:
+        scrapes.append(time.monotonic())
+
+    monkeypatch.setattr(service, "collect_fast", collect_fast)
+
+    async def scenario() -> None:
+        service._loop = asyncio.get_running_loop()
+        loop_task = asyncio.create_task(service._fast_loop())
+        await asyncio.sleep(0.05)
+        assert len(scrapes) == 1  # waiting for the heartbeat
+        node._on_zmq_message("rawblock", memoryview(genesis_block))
+        await asyncio.sleep(0.05)
+        loop_task.cancel()
+
+    asyncio.run(scenario())
+
+    assert len(scrapes) == 2
+    assert tips == ["000000000019d6689c085ae165831e934ff763ae46a2a6c172b3f1b60a8ce26f"]
+
+
+def test_rawblock_content_is_analysed_in_worker_process(monkeypatch, genesis_block):
+    service, _, _ = _build_service(monkeypatch, enable_peer_quality=False)
+    node = service.nodes[0]
+    published: list[list] = []
+    node.publish = published.append
+    node.executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+
+    node._on_zmq_message("rawblock", memoryview(genesis_block))
+    node.executor.shutdown(wait=True)
+
+    ((point,),) = published
+    assert point.measurement == "block_content"
+    assert "node" not in point.tags
+    assert point.fields["outputs_p2pk"] == 1.0
+    assert point.fields["size"] == float(len(genesis_block))
+
+
+def test_rawblock_content_analyses_are_bounded(monkeypatch, genesis_block):
+    service, _, _ = _build_service(monkeypatch, enable_peer_quality=False)
+    node = service.nodes[0]
+    published: list[list] = []
+    node.publish = published.append
+    pending: list[Future] = []
+
+    class HeldExecutor:
+        def submit(self, fn, *args):
+            future: Future = Future()
+            pending.append(future)
+            return future
+
+    node.executor = HeldExecutor()  # type: ignore[assignment]
+    node.analysis_slots = threading.BoundedSemaphore(1)
+
+    node._on_zmq_message("rawblock", memoryview(genesis_block))
+    node._on_zmq_message("rawblock", memoryview(genesis_block))
+    assert len(pending) == 1
+    assert node.block_content_dropped == 1
+
+    pending[0].set_result(analyze_block(genesis_block))
+    node._on_zmq_message("rawblock", memoryview(genesis_block))
+
+    ((point,),) = published
+    assert point.fields["dropped"] == 1.0
+    assert len(pending) == 2
+
+
+def test_build_destinations_adopts_a_flat_spool(tmp_path, monkeypatch):
+    WriteSpool(tmp_path).append(b"m v=1.0 1")
+    monkeypatch.setenv(
+        "INFLUX_DESTINATIONS",
+        '[{"name": "local"}, {"name": "central", "influx_url": "https://central:8086"}]',
+    )
+
+    local, central = _build_destinations(CollectorConfig(influx_spool_dir=str(tmp_path)))
+
+    assert local.spool is not None and local.spool.peek() == b"m v=1.0 1"
+    assert central.spool is not None and central.spool.peek() is None
+    assert not list(tmp_path.glob("*.spool"))
@@ -0,0 +1,100 @@
+import asyncio
+import struct
+
+from collector.bitcoin_rpc import MempoolEntry, RPCError
+from collector.mempool_mirror import MempoolMirror
+
+EDGES = [5.0, 10.0, 20.0]
+
+
+def _nonzero(mirror: MempoolMirror) -> dict[str, float]:
+    return {entry["bucket"]: entry["count"] for entry in mirror.histogram() if entry["count"]}
+
+
+def _txid(n: int) -> str:
+    return f"{n:064x}"
+
+
+def _notification(txid: str, label: bytes, sequence: int | None = None) -> bytes:
+    body = bytes.fromhex(txid) + label
+    if sequence is not None:
+        body += struct.pack("<Q", sequence)
+    return body
+
+
+class FakeRPC:
+    def __init__(self) -> None:
+        self.mempool: dict[str, tuple[int, int]] = {}
+        self.blocks: dict[str, list[str]] = {}
+        self.streams = 0
+        self.batches: list[list] = []
+
+    async def aiter_raw_mempool(self):
+        self.streams += 1
+        for txid, (fee, vsize) in self.mempool.items():
+            yield MempoolEntry(txid, fee, vsize, 0)
+
+    async def abatch(self, calls) -> list:
+        self.batches.append(list(calls))
+        results = []
+        for method, params in calls:
+            if method == "getblock":
+                results.append({"tx": self.blocks[params[0]]})
+            elif params[0] in self.mempool:
+                fee, vsize = self.mempool[params[0]]
+                results.append({"vsize": vsize, "fees": {"base": fee / 1e8}})
+            else:
+                results.append(RPCError(code=-5, message="Transaction not in mempool"))
+        return results
+
+
+def test_mirror_applies_incremental_changes():
+    rpc = FakeRPC()
+    rpc.mempool = {_txid(1): (1000, 100), _txid(2): (600, 200)}
+    mirror = MempoolMirror(EDGES)
+
+    asyncio.run(mirror.refresh(rpc))
+    assert rpc.streams == 1
+    assert _nonzero(mirror) == {"0-5": 1, "10-20": 1}
+
+    rpc.mempool[_txid(3)] = (5000, 250)
+    mirror.handle_notification(_notification(_txid(3), b"A", 10))
+    mirror.handle_notification(_notification(_txid(2), b"R", 11))
+    asyncio.run(mirror.refresh(rpc))
+
+    assert rpc.streams == 1
+    assert rpc.batches[-1] == [("getmempoolentry", [_txid(3)])]
+    assert _nonzero(mirror) == {"10-20": 1, "20+": 1}
+    assert mirror.status()["tx_count"] == 2
+    rates = mirror.fee_rates([bytes.fromhex(_txid(n)) for n in (1, 2, 3)])
+    assert rates == [10.0, None, 20.0]
+
+
+def test_mirror_removes_block_transactions():
+    rpc = FakeRPC()
+    rpc.mempool = {_txid(1): (1000, 100), _txid(2): (600, 200)}
+    mirror = MempoolMirror(EDGES)
+    asyncio.run(mirror.refresh(rpc))
+
+    rpc.blocks[_txid(99)] = [_txid(1)]
+    mirror.handle_notification(_notification(_txid(99), b"C"))
+    asyncio.run(mirror.refresh(rpc))
+
+    assert _nonzero(mirror) == {"0-5": 1}
+    assert rpc.streams == 1
+
+
+def test_mirror_resyncs_after_sequence_gap():
+    rpc = FakeRPC()
+    rpc.mempool = {_txid(1): (1000, 100)}
+    mirror = MempoolMirror(EDGES)
+    asyncio.run(mirror.refresh(rpc))
+
+    mirror.handle_notification(_notification(_txid(2), b"A", 5))
+    mirror.handle_notification(_notification(_txid(3), b"A", 8))
+    rpc.mempool[_txid(3)] = (2000, 100)
+    asyncio.run(mirror.refresh(rpc))
+
+    assert rpc.streams == 2
+    assert mirror.status()["gaps"] == 1
+    assert _nonzero(mirror) == {"10-20": 1, "20+": 1}
@@ -1,11 +1,19 @@
 from decimal import Decimal
 
+import pytest
+
+from collector import metrics
+from collector.block_decoder import BlockSummary
 from collector.config import CollectorConfig
 from collector.metrics import (
+    BlockIntervalTracker,
+    BlockLatencyTracker,
+    FeeHistogram,
     ReorgTracker,
     _extract_ip,
     bucket_mempool_histogram,
     create_peer_geo_points,
+    log_spaced_edges,
     peers_metrics,
     percentile,
 )
@@ -29,6 +37,38 @@ def test_bucket_histogram():
     assert any(bucket["bucket"] == "0-5" for bucket in buckets)
 
 
+def test_log_spaced_edges():
+    assert log_spaced_edges(1, 1000, 1) == [1.0, 10.0, 100.0, 1000.0]
+    edges = log_spaced_edges(1, 100, 5)
+    assert edges[0] == 1.0 and edges[-1] == 100.0
+    assert len(edges) == 11
+    with pytest.raises(ValueError):
+        log_spaced_edges(10, 1, 5)
+
+
+@pytest.mark.parametrize("vectorised", [True, False])
+def test_fee_histogram_counts_and_weights_vsize(monkeypatch, vectorised):
+    if not vectorised:
+        monkeypatch.setattr(metrics, "np", None)
+    elif metrics.np is None:  # pragma: no cover - optional dependency
+        pytest.skip("numpy not installed")
+    histogram = FeeHistogram([1.0, 10.0, 100.0])
+
+    histogram.add_batch([50, 500, 1500, 200_000, 10], [100, 100, 100, 1000, 0])
+
+    buckets = bucket_mempool_histogram(histogram)
+    assert [entry["bucket"] for entry in buckets] == ["0-1", "1-10", "10-100", "100+"]
+    assert [entry["count"] for entry in buckets] == [1.0, 1.0, 2.0, 1.0]
+    assert [entry["vsize"] for entry in buckets] == [100.0, 100.0, 100.0, 1000.0]
+
+
+def test_fee_histogram_remove_reverses_add():
+    histogram = FeeHistogram([1.0, 10.0])
+    histogram.add(500, 100)
+    histogram.remove(500, 100)
+    assert all(entry["count"] == 0 for entry in histogram.buckets())
+
+
 def test_peer_metrics():
     peers = [
         {"inbound": True, "pingtime": 0.1},
@@ -163,3 +203,50 @@ def test_create_peer_geo_points_accepts_decimal_coordinates():
     assert isinstance(coord_point.fields["longitude"], float)
     assert coord_point.fields["latitude"] == float(Decimal("37.7749"))
     assert coord_point.fields["longitude"] == float(Decimal("-122.4194"))
+
+
+def _block(block_hash: str, prev_hash: str, block_time: int) -> BlockSummary:
+    return BlockSummary(block_hash, prev_hash, 0x20000000, block_time, 0, 0, 1, 1, 300, 200, 900)
+
+
+def test_block_interval_tracker_only_reports_connected_intervals():
+    tracker = BlockIntervalTracker()
+
+    first = tracker.update(_block("a", "0", 1_000), arrival=1_004.0)
+    second = tracker.update(_block("b", "a", 1_600), arrival=1_601.5)
+    orphan = tracker.update(_block("d", "c", 1_700), arrival=1_702.0)
+
+    assert first == {"arrival_delay_s": 4.0}
+    assert second == {"arrival_delay_s": 1.5, "interval_s": 600.0, "arrival_interval_s": 597.5}
+    assert "interval_s" not in orphan
+    assert orphan["arrival_interval_s"] == 100.5
+
+
+def test_block_latency_tracker_matches_zmq_arrival_to_rpc_tip():
+    now = {"wall": 1_010.0, "mono": 50.0}
+    tracker = BlockLatencyTracker(
+        max_pending=2, clock=lambda: now["wall"], monotonic=lambda: now["mono"]
+    )
+
+    tracker.record_arrival("a", header_time=1_000)
+    now["mono"] = 50.25
+    tracker.observe_tip("a")
+    tracker.observe_tip("a")  # later scrapes of the same tip are ignored
+
+    now["wall"], now["mono"] = 1_620.0, 100.0
+    tracker.record_arrival("b", header_time=1_600)
+    tracker.record_arrival("c", header_time=1_602)
+    now["mono"] = 101.0
+    tracker.observe_tip("c")  # b was replaced before a scrape saw it
+
+    summary = tracker.summary()
+    assert summary["blocks"] == 3
+    assert summary["superseded"] == 1
+    assert summary["pending"] == 0
+    assert summary["propagation_s_max"] == 20.0
+    assert summary["tip_delay_s_p50"] == 0.625
+    assert summary["tip_delay_s_max"] == 1.0
+
+    for block_hash in ("d", "e", "f"):
+        tracker.record_arrival(block_hash, header_time=1_700)
+    assert tracker.summary()["pending"] == 2
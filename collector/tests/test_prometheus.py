@@ -0,0 +1,68 @@
+import asyncio
+
+import aiohttp
+
+from collector.influx import Point
+from collector.prometheus import MetricRegistry, PrometheusExporter
+
+
+def test_registry_renders_latest_values_as_gauges():
+    registry = MetricRegistry()
+    registry.update([Point("blockchain").tag("network", "main").field("blocks", 1.0)])
+    registry.update(
+        [
+            Point("blockchain").tag("network", "main").field("blocks", 2.0),
+            Point("peer geo").tag("asn", 'AS1 "x"\\y').field("0-1", float("nan")),
+        ]
+    )
+
+    assert registry.render().decode() == (
+        "# TYPE bitcoin_blockchain_blocks gauge\n"
+        'bitcoin_blockchain_blocks{network="main"} 2.0\n'
+        "# TYPE bitcoin_peer_geo_0_1 gauge\n"
+        'bitcoin_peer_geo_0_1{asn="AS1 \\"x\\"\\\\y"} NaN\n'
+    )
+    assert registry.render(openmetrics=True).decode().endswith("NaN\n# EOF\n")
+
+
+def test_registry_caches_rendering_and_expires_stale_series(clock):
+    registry = MetricRegistry(stale_after=60, clock=clock)
+    registry.update([Point("peers").tag("peer", "a").field("ping", 1.0)])
+    first = registry.render()
+
+    assert registry.render() is first
+    assert registry.status() == {"series": 1.0, "scrapes": 2.0, "renders": 1.0}
+
+    clock.now += 90
+    registry.update([Point("peers").tag("peer", "b").field("ping", 2.0)])
+
+    assert registry.render().decode() == (
+        '# TYPE bitcoin_peers_ping gauge\nbitcoin_peers_ping{peer="b"} 2.0\n'
+    )
+
+
+def test_exporter_serves_metrics_and_negotiates_openmetrics():
+    registry = MetricRegistry()
+    registry.update([Point("mempool").field("size", 3.0)])
+    exporter = PrometheusExporter(registry, "127.0.0.1", 0)
+
+    async def scenario() -> tuple[str, str, str]:
+        await exporter.start()
+        assert exporter._runner is not None
+        port = exporter._runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}/metrics"
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    text = await response.text()
+                headers = {"Accept": "application/openmetrics-text; version=1.0.0"}
+                async with session.get(url, headers=headers) as response:
+                    return text, response.headers["Content-Type"], await response.text()
+        finally:
+            await exporter.aclose()
+
+    text, content_type, openmetrics = asyncio.run(scenario())
+
+    assert text == "# TYPE bitcoin_mempool_size gauge\nbitcoin_mempool_size 3.0\n"
+    assert content_type.startswith("application/openmetrics-text")
+    assert openmetrics.endswith("# EOF\n")
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from collector.bitcoin_rpc import RPCError
+from collector.rpc_cache import RPCCache
+
+
+class Loader:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.batches: list[list] = []
+        self.best_block = "aa"
+
+    async def __call__(self, calls) -> list:
+        self.batches.append([method for method, _ in calls])
+        await asyncio.sleep(self.delay)
+        results = []
+        for method, params in calls:
+            if method == "getblockchaininfo":
+                results.append({"bestblockhash": self.best_block})
+            elif method == "getfoo":
+                results.append(RPCError(code=-32601, message="Method not found"))
+            else:
+                results.append({"method": method, "params": list(params)})
+        return results
+
+
+def test_cache_serves_fresh_entries_until_ttl_expires(clock):
+    cache = RPCCache(ttl=5, clock=clock)
+    loader = Loader()
+
+    async def scenario() -> None:
+        await cache.fetch([("getmempoolinfo", [])], loader)
+        await cache.fetch([("getmempoolinfo", []), ("estimatesmartfee", [3])], loader)
+        clock.now += 10
+        await cache.fetch([("getmempoolinfo", [])], loader)
+
+    asyncio.run(scenario())
+
+    assert loader.batches == [["getmempoolinfo"], ["estimatesmartfee"], ["getmempoolinfo"]]
+    assert cache.hits == 1
+
+
+def test_cache_coalesces_concurrent_callers():
+    cache = RPCCache(ttl=5)
+    loader = Loader(delay=0.05)
+
+    async def scenario() -> list:
+        return await asyncio.gather(
+            cache.fetch([("getpeerinfo", [])], loader),
+            cache.fetch([("getpeerinfo", []), ("getnetworkinfo", [])], loader),
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert loader.batches == [["getpeerinfo"], ["getnetworkinfo"]]
+    assert first[0] == second[0]
+    assert cache.coalesced == 1
+
+
+def test_cache_invalidates_chain_state_on_new_tip():
+    cache = RPCCache(ttl=60)
+    loader = Loader()
+
+    async def scenario() -> None:
+        await cache.fetch([("getblockchaininfo", []), ("estimatesmartfee", [3])], loader)
+        await cache.fetch([("getnetworkinfo", [])], loader)
+        loader.best_block = "bb"
+        cache.note_best_block("bb")
+        await cache.fetch(
+            [("getblockchaininfo", []), ("estimatesmartfee", [3]), ("getnetworkinfo", [])],
+            loader,
+        )
+
+    asyncio.run(scenario())
+
+    assert loader.batches[-1] == ["getblockchaininfo", "estimatesmartfee"]
+    assert cache.invalidations == 1
+
+
+def test_cache_does_not_store_errors_or_uncacheable_methods():
+    cache = RPCCache(ttl=60)
+    loader = Loader()
+
+    async def scenario() -> list:
+        await cache.fetch([("getfoo", []), ("getrawmempool", [True])], loader)
+        return await cache.fetch([("getfoo", []), ("getrawmempool", [True])], loader)
+
+    results = asyncio.run(scenario())
+
+    assert len(loader.batches) == 2
+    assert isinstance(results[0], RPCError)
+
+
+def test_cache_propagates_loader_failure_to_waiters():
+    cache = RPCCache(ttl=60)
+
+    async def failing(calls) -> list:
+        await asyncio.sleep(0.01)
+        raise ConnectionError("node down")
+
+    async def scenario() -> list:
+        return await asyncio.gather(
+            cache.fetch([("getpeerinfo", [])], failing),
+            cache.fetch([("getpeerinfo", [])], failing),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    with pytest.raises(ConnectionError):
+        asyncio.run(cache.fetch([("getpeerinfo", [])], failing))
@@ -0,0 +1,62 @@
+import aiohttp
+import requests
+
+from collector.rpc_stats import RPCStats, error_class, method_label
+
+
+def test_snapshot_summarises_latency_histogram():
+    stats = RPCStats()
+    for latency_ms in (3, 4, 4, 8, 9, 15, 40, 45, 90, 400):
+        stats.observe("getpeerinfo", latency_ms / 1000, size=1_000, decode=0.001)
+
+    summary = stats.snapshot()["getpeerinfo"]
+
+    assert summary["calls"] == 10
+    assert summary["latency_ms_p50"] == 10
+    assert summary["latency_ms_p95"] == 400
+    assert summary["latency_ms_max"] == 400
+    assert summary["bytes_total"] == 10_000
+    assert round(summary["decode_ms_avg"], 6) == 1.0
+    assert summary["errors"] == 0
+
+
+def test_snapshot_keeps_stats_until_reset():
+    stats = RPCStats()
+    stats.observe("getpeerinfo", 0.01, size=100)
+    assert stats.snapshot()["getpeerinfo"]["calls"] == 1
+
+    # The first snapshot was never submitted, so the next one reports both calls.
+    stats.observe("getpeerinfo", 0.03, size=300)
+    summary = stats.snapshot()["getpeerinfo"]
+    assert summary["calls"] == 2
+    assert summary["bytes_total"] == 400
+    assert summary["latency_ms_max"] == 30
+
+    stats.reset()
+    stats.observe("getpeerinfo", 0.02)
+    assert stats.snapshot()["getpeerinfo"]["calls"] == 1
+
+
+def test_failures_are_counted_by_class():
+    stats = RPCStats()
+    stats.observe_failure("getblock", 0.01, requests.ReadTimeout("slow"))
+    stats.observe_failure("getblock", 0.01, aiohttp.ServerDisconnectedError())
+    stats.observe("getblock", 0.01, rpc_errors=2)
+
+    summary = stats.snapshot()["getblock"]
+
+    assert summary["calls"] == 3
+    assert summary["errors"] == 4
+    assert summary["errors_timeout"] == 1
+    assert summary["errors_connection"] == 1
+    assert summary["errors_rpc"] == 2
+
+
+def test_error_class_and_method_label():
+    assert error_class(requests.HTTPError("500")) == "http"
+    assert error_class(ValueError("bad json")) == "decode"
+    assert error_class(RuntimeError("boom")) == "other"
+    assert method_label({"method": "getpeerinfo"}) == "getpeerinfo"
+    assert method_label([{"method": "getmempoolentry"}] * 3) == "batch"
+    assert method_label([{"method": "getpeerinfo"}]) == "getpeerinfo"
+    assert method_label([{"method": "getblock"}, {"method": "getmempoolentry"}]) == "batch"
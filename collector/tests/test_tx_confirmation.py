@@ -0,0 +1,47 @@
+from test_block_decoder import _tx, _varint
+
+from collector.block_decoder import decode_txid
+from collector.tx_confirmation import ConfirmationTracker
+
+
+def _block(header: bytes, *txs: bytes) -> bytes:
+    coinbase = _tx(b"\x03\x01\x00\x00")
+    return header[:80] + _varint(len(txs) + 1) + coinbase + b"".join(txs)
+
+
+def test_confirm_reports_latency_per_fee_band(genesis_block, clock):
+    tracker = ConfirmationTracker(clock=clock)
+    cheap, rich, unknown, unseen = (_tx(bytes([n])) for n in (1, 2, 3, 4))
+    segwit = _tx(b"", witness=[b"\x30" * 72])
+    rates = {decode_txid(cheap): 1.5, decode_txid(rich): 150.0, decode_txid(segwit): 1.2}
+
+    for tx in (cheap, rich, unknown):
+        tracker.record(tx)
+        clock.now += 10
+    tracker.record(memoryview(segwit))
+    tracker.record(cheap)  # re-announcements keep the first sighting
+    clock.now += 30
+
+    bands = tracker.confirm(
+        _block(genesis_block, cheap, rich, unknown, unseen, segwit),
+        fee_rates=lambda txids: [rates.get(txid) for txid in txids],
+    )
+
+    assert bands["1-2"]["confirmed"] == 2
+    assert bands["1-2"]["latency_s_max"] == 60.0
+    assert bands["100+"]["latency_s_p50"] == 50.0
+    assert bands["unknown"]["confirmed"] == 1
+    assert bands["all"]["confirmed"] == 4
+    assert bands["all"]["unseen"] == 1
+    assert tracker.status()["entries"] == 0
+
+
+def test_index_evicts_oldest_sighting_at_cap(genesis_block, clock):
+    tracker = ConfirmationTracker(max_entries=2, clock=clock)
+    first, second, third = (_tx(bytes([n])) for n in (1, 2, 3))
+
+    for tx in (first, second, third, b"\x02\x00"):
+        tracker.record(tx)
+
+    assert tracker.status() == {"entries": 2.0, "evictions": 1.0, "parse_errors": 1.0}
+    assert tracker.confirm(_block(genesis_block, first))["all"] == {"confirmed": 0.0, "unseen": 1.0}
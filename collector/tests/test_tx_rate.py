@@ -0,0 +1,52 @@
+import struct
+
+from collector.tx_rate import TxRateEngine
+
+
+def _tx(outputs: int) -> bytes:
+    body = b"\x01" + b"\x11" * 36 + b"\x00" + b"\xff" * 4
+    body += bytes([outputs]) + (b"\x00" * 8 + b"\x16\x00\x14" + b"\x22" * 20) * outputs
+    return struct.pack("<i", 2) + body + b"\x00" * 4
+
+
+def test_windows_report_complete_seconds_only(clock):
+    engine = TxRateEngine(windows={"1s": 1, "1m": 60}, clock=clock)
+    small, large = _tx(1), _tx(40)
+
+    for _ in range(9):
+        engine.record(small)
+    engine.record(large)
+    clock.now += 1
+    for _ in range(4):
+        engine.record(memoryview(small))
+
+    snapshot = engine.snapshot()
+
+    assert snapshot["1s"]["tx_per_s"] == 10
+    assert snapshot["1s"]["vbytes_per_s"] == 9 * len(small) + len(large)
+    assert snapshot["1s"]["weight_per_s"] == 4 * snapshot["1s"]["vbytes_per_s"]
+    assert snapshot["1m"]["tx_per_s"] == 10 / 60
+    assert 80 <= snapshot["1s"]["vsize_p50"] <= 100
+    assert snapshot["1s"]["vsize_p99"] >= len(large)
+
+
+def test_ring_buffer_expires_old_seconds(clock):
+    engine = TxRateEngine(windows={"1m": 60}, clock=clock)
+    engine.record(_tx(1))
+
+    clock.now += 61
+    assert engine.snapshot()["1m"]["tx_per_s"] == 0
+
+    clock.now += 60  # the same ring slot is reused for a later second
+    engine.record(_tx(2))
+    clock.now += 1
+    assert engine.snapshot()["1m"]["tx_per_s"] == 1 / 60
+
+
+def test_unparseable_transactions_are_counted():
+    engine = TxRateEngine()
+
+    engine.record(b"\x02\x00\x00")
+
+    assert engine.parse_errors == 1
+    assert engine.snapshot()["1s"]["tx_per_s"] == 0
@@ -0,0 +1,106 @@
+import asyncio
+import struct
+import threading
+import time
+
+import zmq
+
+from collector.zmq_listener import AsyncZMQListener, ZMQListener, ZMQMetric
+
+
+def test_sequence_gaps_count_missed_notifications():
+    metric = ZMQMetric(endpoint="tcp://127.0.0.1:28333", topic=b"rawtx")
+
+    for sequence in (5, 6, 9, 10):
+        metric.observe_sequence(sequence)
+    assert (metric.sequence_gaps, metric.missed) == (1, 2)
+
+    metric.sequence = 2**32 - 2
+    for sequence in (2**32 - 1, 1):  # 0 is lost while the counter wraps
+        metric.observe_sequence(sequence)
+    assert (metric.sequence_gaps, metric.missed) == (2, 3)
+
+    metric.observe_sequence(0)  # bitcoind restarted
+    metric.observe_sequence(1)
+    assert (metric.sequence_gaps, metric.missed) == (2, 3)
+
+
+def test_thread_listener_drops_when_decoder_falls_behind():
+    # The listener terminates the shared context on stop, so publish from a private one.
+    context = zmq.Context()
+    publisher = context.socket(zmq.PUB)
+    port = publisher.bind_to_random_port("tcp://127.0.0.1")
+    release = threading.Event()
+    seen = threading.Event()
+
+    def callback(topic: str, body: memoryview) -> None:
+        seen.set()
+        release.wait(timeout=5)
+
+    listener = ZMQListener(
+        {"rawtx": f"tcp://127.0.0.1:{port}"}, callback=callback, queue_size=1
+    )
+    listener.start()
+    try:
+        sequence = 0
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            publisher.send_multipart([b"rawtx", b"tx", struct.pack("<I", sequence)])
+            sequence += 1
+            if seen.is_set() and listener.metrics["rawtx"].queue_drops:
+                break
+            time.sleep(0.01)
+        status = listener.status()
+    finally:
+        release.set()
+        publisher.close(linger=0)
+        context.term()
+        listener.stop()
+
+    assert status["rawtx"]["queue_drops"] >= 1
+    assert status["rawtx"]["queue_depth"] == 1
+    assert status["rawtx"]["sequence_gaps"] == 0
+
+
+def test_async_listener_shares_socket_and_dispatches_topics():
+    async def scenario() -> tuple[list, dict]:
+        publisher = zmq.Context.instance().socket(zmq.PUB)
+        port = publisher.bind_to_random_port("tcp://127.0.0.1")
+        endpoint = f"tcp://127.0.0.1:{port}"
+        received: list = []
+        done = asyncio.Event()
+
+        def callback(topic: str, body: memoryview) -> None:
+            received.append((topic, bytes(body)))
+            if len({topic for topic, _ in received}) == 2:
+                done.set()
+
+        listener = AsyncZMQListener(
+            {"rawtx": endpoint, "hashblock": endpoint},
+            callback=callback,
+            blocking_topics={"hashblock"},
+        )
+        listener.start()
+        try:
+            for sequence in range(200):
+                # Republish until the subscription has propagated (ZMQ slow joiner).
+                publisher.send_multipart([b"rawtx", b"tx", struct.pack("<I", sequence)])
+                publisher.send_multipart([b"hashblock", b"\x01" * 32, struct.pack("<I", sequence)])
+                try:
+                    await asyncio.wait_for(done.wait(), timeout=0.05)
+                    break
+                except asyncio.TimeoutError:
+                    continue
+            status = listener.status()
+        finally:
+            await listener.aclose()
+            publisher.close(linger=0)
+        return received, status
+
+    received, status = asyncio.run(scenario())
+
+    assert ("rawtx", b"tx") in received
+    assert ("hashblock", b"\x01" * 32) in received
+    assert status["rawtx"]["messages"] >= 1
+    assert status["hashblock"]["endpoint"] == status["rawtx"]["endpoint"]
+    assert status["rawtx"]["queue_drops"] == 0